@@ -43,7 +43,28 @@ class MeasurementCreator(ObjectCreator):
 		# The maximum number of measurements per device that are considered for moving average.
 		self.per_device_window_size = self.window_duration * self.per_device_rate
 	
-	def createObject(self, device, time):
+	def getTemplate(self):
+		return {
+			'time': '@time@',
+			"type": self.measurement_type,
+			"source": {
+				"id": '@device@'
+			},
+			self.measurement_fragment: {
+				self.measurement_series: {
+					"value": '@value@'
+				}
+			}
+		}
+
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': self.nextValue(device)}
+
+	def createFieldColumns(self, devices, times):
+		# Values depend on the previous values of the same device, so create them in the order of the batch
+		return {'time': times, 'device': devices, 'value': [self.nextValue(device) for device in devices]}
+
+	def nextValue(self, device):
 		count = self.counts.get(device, 0)
 		self.counts[device] = count + 1
 
@@ -78,15 +99,4 @@ class MeasurementCreator(ObjectCreator):
 				# Generate a value very close to the DESIRED_MEAN.
 				value = DESIRED_MEAN + (random.random() - 0.5) / 10
 		self.last[device] = value
-		return {
-			'time': time,
-			"type": self.measurement_type,
-			"source": {
-				"id": device
-			},
-			self.measurement_fragment: {
-				self.measurement_series: {
-					"value": value
-				}
-			}
-		}
\ No newline at end of file
+		return value
@@ -19,17 +19,23 @@ class MeasurementCreator(ObjectCreator):
 		self.measurement_series = measurement_series
 		self.upperBound = float(upperBound)
 	
-	def createObject(self, device, time):
-		value = random.uniform(0, self.upperBound)
+	def getTemplate(self):
 		return {
-			'time': time,
+			'time': '@time@',
 			"type": self.measurement_type,
 			"source": {
-				"id": device
+				"id": '@device@'
 			},
 			self.measurement_fragment: {
 				self.measurement_series: {
-					"value": value
+					"value": '@value@'
 				}
 			}
-		}
\ No newline at end of file
+		}
+
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': random.uniform(0, self.upperBound)}
+
+	def createFieldColumns(self, devices, times):
+		rand, upperBound = random.random, self.upperBound
+		return {'time': times, 'device': devices, 'value': [rand() * upperBound for _ in devices]}
\ No newline at end of file
@@ -82,7 +82,7 @@ class PySysTest(EPLAppsPerfTest):
 		if self.useSimulatedData:
 			for tenant in self.tenants:
 				# Create devices.
-				devices = [self.createTestDevice(f'device{i+1}',tenant=tenant) for i in range(self.numDevices)]
+				devices = self.getTestDevicePool(tenant=tenant).acquire(self.numDevices)
 				
 				# Start simulators.
 				self.startSimulators(devices,tenant)
@@ -164,14 +164,12 @@ class PySysTest(EPLAppsPerfTest):
 
 	def getExtraPerformanceMetrics(self):
 		""" Get count of alarms raised and alarms cleared during test run. """
-		alarms = []
-		for tenant in self.tenants:
-			alarms = self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime,connetion = tenant.getConnection())
-		raised = len(alarms)
+		raised = 0
 		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		for tenant in self.tenants:
+			counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime, tenant=tenant)
+			raised += sum(counts.values())
+			cleared += counts['CLEARED']
 		
 		return {
 			'Alarms Raised': raised,
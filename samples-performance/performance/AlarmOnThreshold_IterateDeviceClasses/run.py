@@ -79,7 +79,7 @@ class PySysTest(EPLAppsPerfTest):
 				self.deploySampleApp(n)
 
 				# Create devices.
-				devices = [self.createTestDevice(f'device{i+1}') for i in range(numOfDevices)]
+				devices = self.getTestDevicePool().acquire(numOfDevices)
 
 				# Start simulators.
 				self.startSimulators(devices, inputRatePerDevice)
@@ -168,12 +168,9 @@ class PySysTest(EPLAppsPerfTest):
 	def getExtraPerformanceMetrics(self):
 		""" Get count of alarms raised and alarms cleared during test run. """
 		
-		alarms = self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
-		raised = len(alarms)
-		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
+		raised = sum(counts.values())
+		cleared = counts['CLEARED']
 		
 		return {
 			'Alarms Raised': raised,
@@ -98,7 +98,7 @@ class PySysTest(EPLAppsPerfTest):
 			# deployed as they look up devices at the start.
 			self.buildings = {}
 			for i in range(self.numOfBuildings):
-				accessPoints = [self.createTestDevice(f'accesspoint_{i}_{j}', type=self.accessPointType) for j in range(self.numOfAccessPointsPerBuilding)]
+				accessPoints = self.createTestDevices(self.numOfAccessPointsPerBuilding, namePattern=f'accesspoint_{i}_{{index}}', type=self.accessPointType, startIndex=0)
 				building = self.createTestDevice(f'building_{i}', type=self.buildingType, children=accessPoints)
 				self.buildings[building] = accessPoints
 		
@@ -195,17 +195,14 @@ class PySysTest(EPLAppsPerfTest):
 
 	def getAlarmsCount(self):
 		""" Get count of alarms raised and alarms cleared during test run. """
-		alarms = self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
-		raised = len(alarms)
-		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
+		raised = sum(counts.values())
+		cleared = counts['CLEARED']
 		return (raised, cleared)
 
 	def getOperationsCount(self):
 		""" Get count of operations created during test run. """
-		return len(self.getOperations(fragmentType=self.operationFragment, dateFrom=self.startTime, dateTo=self.endTime))
+		return self.countOperations(fragmentType=self.operationFragment, dateFrom=self.startTime, dateTo=self.endTime)
 
 	def getExtraPerformanceMetrics(self):
 		""" Get details on alarms and operations. """
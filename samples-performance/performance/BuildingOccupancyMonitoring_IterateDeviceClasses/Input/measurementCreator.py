@@ -104,9 +104,35 @@ class MeasurementCreator(ObjectCreator):
 		# Maximum occupancy value to reach for guaranteed generation an operation.
 		self.MAX_VAL_OPS_GEN = (timeToBreachThreshold + durationAboveThresholdForOperation / 2) * changeRatePerBuilding
 
-	def createObject(self, device, sendTime):
+	def getTemplate(self):
+		return {
+			'time': '@time@',
+			"type": self.MEASUREMENT_TYPE,
+			"source": {
+				"id": '@device@'
+			},
+			self.FRAGMENT: {
+				self.SERIES_ENTERED: {
+					"value": '@entered@'
+				},
+				self.SERIES_EXITED: {
+					"value": '@exited@'
+				}
+			}
+		}
+
+	def createFields(self, device, sendTime):
+		(entered, exited) = self.nextCounts(device)
+		return {'time': sendTime, 'device': device, 'entered': entered, 'exited': exited}
+
+	def createFieldColumns(self, devices, times):
+		# Counts depend on the occupancy after the previous measurement, so create them in the order of the batch
+		counts = [self.nextCounts(device) for device in devices]
+		return {'time': times, 'device': devices, 'entered': [c[0] for c in counts], 'exited': [c[1] for c in counts]}
+
+	def nextCounts(self, device):
 		"""
-		Create a new measurement value.
+		Create the next entered and exited counts of an access point.
 
 		Generate a value that increases or decreases the total occupancy count of the building by `self.AP_VAL_CHANGE`.
 		Reverse the direction of the change for the next value, if reached to the top or bottom.
@@ -138,23 +164,6 @@ class MeasurementCreator(ObjectCreator):
 
 		self.accessPointCounts[device] = (entered, exited)
 
-		# create measurement to send
-		measurement = {
-			'time': sendTime,
-			"type": self.MEASUREMENT_TYPE,
-			"source": {
-				"id": device
-			},
-			self.FRAGMENT: {
-				self.SERIES_ENTERED: {
-					"value": entered
-				},
-				self.SERIES_EXITED: {
-					"value": exited
-				}
-			}
-		}
-
 		# Check if reached top or bottom
 		if self.currentOccupancy <= 0:
 			self.currentOccupancy = 0
@@ -173,5 +182,5 @@ class MeasurementCreator(ObjectCreator):
 			else:
 				self.increaseOccupancy = True
 
-		return measurement
+		return (entered, exited)
 		
@@ -30,25 +30,35 @@ class MeasurementCreator(ObjectCreator):
 		print(f"final self.measurements_per_alarm - {self.measurements_per_alarm}")
 		self.count = {} # number of measurements sent for each device
 
-	def createObject(self, device, time):
-		count = self.count.get(device, random.randint(0, self.measurements_per_alarm))
-		self.count[device] = count + 1
-
-		if count % self.measurements_per_alarm == 0:
-			# Generate an alarm -> for Rule
-			value = random.uniform(self.range_min, self.range_max)
-		else:
-			value = random.uniform(self.range_min - 100, self.range_min - 1)
-
+	def getTemplate(self):
 		return {
-			'time': time,
+			'time': '@time@',
 			"type": self.measurement_type,
 			"source": {
-				"id": device
+				"id": '@device@'
 			},
 			self.measurement_fragment: {
 				self.measurement_series: {
-					"value": value
+					"value": '@value@'
 				}
 			}
 		}
+
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': self.nextValue(device)}
+
+	def createFieldColumns(self, devices, times):
+		# Values depend on the number of measurements already sent for the device, so create them in the order of the batch
+		return {'time': times, 'device': devices, 'value': [self.nextValue(device) for device in devices]}
+
+	def nextValue(self, device):
+		count = self.count.get(device, random.randint(0, self.measurements_per_alarm))
+		self.count[device] = count + 1
+
+		if count % self.measurements_per_alarm == 0:
+			# Generate an alarm -> for Rule
+			value = random.uniform(self.range_min, self.range_max)
+		else:
+			value = random.uniform(self.range_min - 100, self.range_min - 1)
+
+		return value
@@ -66,6 +66,9 @@ class PySysTest(ApamaC8YPerfBaseTest):
 	# The number of child tenants.
 	numTenants = 50
 
+	# The maximum number of smart rules to deploy concurrently across all tenants.
+	ruleDeploymentConcurrency = 10
+
 	def execute(self):
 		self.log.info(f'Testing Resource Consumption for multi-tenant microservice: useSimulatedData={self.useSimulatedData},'
 					  f' inputRate={self.inputRate}, testDuration={self.testDuration}')
@@ -96,20 +99,19 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		else:
 			self.requiredChildTenants.append(parentTenant)
 		self.log.info(f"Requested teants {len(self.requiredChildTenants)}")
-		# Prepare the tenant for the test run.
-		for tenant in self.requiredChildTenants:
-			try:
-				self.prepareTenant(tenant=tenant)
-			except:
-				self.log.info(f'Not able to prepare tenant id {tenant.id()}')
+		# Prepare the tenants for the test run.
+		preparation = self.prepareTenants(self.requiredChildTenants, raiseOnFailure=False)
+		for failed in preparation.getFailed():
+			self.log.info(f'Not able to prepare tenant id {failed.item.getTenantId()}: {failed.error}')
 
 		self.tenantToDevices = {}
-        # Create and deploy smart rule and device to tenants.
+		rulesPerTenant = {}
+        # Create smart rule and device for tenants.
 		self.log.info('Rule creation started....')
 		for tenant in self.requiredChildTenants:
 			smartRulesManager = SmartRulesManager(tenant,self.log)
-			# Deploy the rule.
 			devices=[]
+			rules=[]
 			i = 0
 			while i < self.numRules:
 				i+=1
@@ -126,8 +128,12 @@ class PySysTest(ApamaC8YPerfBaseTest):
 				devices.append(device)
 				#Enable rule only for these devices
 				rule.setEnabledSources(device)
-				rule.deploy()
+				rules.append(rule)
 			self.tenantToDevices[tenant.getTenantId()] = devices
+			rulesPerTenant[tenant.getTenantId()] = rules
+
+		# Deploy the rules of all tenants concurrently.
+		self.ruleDeployment = SmartRulesManager.deployAllForTenants(rulesPerTenant, log=self.log, maxWorkers=self.ruleDeploymentConcurrency)
    
 		self.wait(5)
 
@@ -220,30 +226,28 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		"""
 			Get count of alarms raised and alarms cleared during test run.
 		"""
-		alarms = []
+		alarmsCount = 0
 		eplalarmsCount = 0
-		tenantCount = 0
+		cleared = 0
 		for t in self.requiredChildTenants:
-			#if tenantCount == self.numTenants + 1:
-			#	break
-			#tenantCount +=1
-			alarms = alarms + self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime, connection=t.getConnection(), tenant=t)
-			eplalarms = self.getAlarms(type=self.eplAlarmType, dateFrom=self.startTime, dateTo=self.endTime, connection=t.getConnection(), tenant=t)
+			counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime, tenant=t)
+			alarmsCount += sum(counts.values())
+			cleared += counts['CLEARED']
+			# EPL app alarms are de-duplicated, so their count field is needed
+			eplalarms = self.getAlarms(type=self.eplAlarmType, dateFrom=self.startTime, dateTo=self.endTime, tenant=t)
 			for alarm in eplalarms:
 				eplalarmsCount += alarm.get('count', 0)
     
-		self.log.info(f"alarms -> {len(alarms)}")
+		self.log.info(f"alarms -> {alarmsCount}")
 		self.log.info(f"eplalarmsCount -> {eplalarmsCount}")
   		
-		raised = len(alarms) + eplalarmsCount  
-		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		raised = alarmsCount + eplalarmsCount  
 
 		return {
 			'Alarms Raised': raised,
 			'Alarms Cleared': cleared,
+			'Smart Rules Deployed': len(self.ruleDeployment.getSucceeded()),
+			'Smart Rule Deployment Rate (rules/sec)': round(self.ruleDeployment.getThroughput(), 2),
 		}
 
 	def validate(self):
@@ -257,6 +261,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 			test_name = f'Explicit threshold 10 eplapps on parent tenant and 5 rules, each rule of one devices per child tenant with external input measurement streams for {self.numTenants} tenants'
 
 		perf_stats = self.read_json('perf_statistics.json')
+		self.reportPerformanceResult(self.ruleDeployment.getThroughput(), f'{test_name} - smart rule deployment rate', PerformanceUnit('rules/s', biggerIsBetter=True))
 		self.reportPerformanceResult(perf_stats['total_memory_usage']['mean'], f'{test_name} - avg memory usage', PerformanceUnit('MB', biggerIsBetter=False))
 		self.reportPerformanceResult(perf_stats['total_memory_usage']['max'], f'{test_name} - max memory usage', PerformanceUnit('MB', biggerIsBetter=False))
 		self.reportPerformanceResult(perf_stats['cpu_usage_milli']['mean']/1000.0, f'{test_name} - avg cpu usage', PerformanceUnit('core', biggerIsBetter=False))
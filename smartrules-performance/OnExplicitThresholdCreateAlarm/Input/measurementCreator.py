@@ -26,7 +26,28 @@ class MeasurementCreator(ObjectCreator):
 		self.measurements_per_alarm = int((measurement_input_rate * total_devices) / TARGET_ALARM_RATE)
 		self.count = {} # number of measurements sent for each device
 
-	def createObject(self, device, time):
+	def getTemplate(self):
+		return {
+			'time': '@time@',
+			"type": self.measurement_type,
+			"source": {
+				"id": '@device@'
+			},
+			self.measurement_fragment: {
+				self.measurement_series: {
+					"value": '@value@'
+				}
+			}
+		}
+
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': self.nextValue(device)}
+
+	def createFieldColumns(self, devices, times):
+		# Values depend on the number of measurements already sent for the device, so create them in the order of the batch
+		return {'time': times, 'device': devices, 'value': [self.nextValue(device) for device in devices]}
+
+	def nextValue(self, device):
 		count = self.count.get(device, random.randint(0, self.measurements_per_alarm))
 		self.count[device] = count + 1
 
@@ -42,15 +63,4 @@ class MeasurementCreator(ObjectCreator):
 			else:
 				value = random.uniform(self.range_min - 100, self.range_min - 1)
 
-		return {
-			'time': time,
-			"type": self.measurement_type,
-			"source": {
-				"id": device
-			},
-			self.measurement_fragment: {
-				self.measurement_series: {
-					"value": value
-				}
-			}
-		}
+		return value
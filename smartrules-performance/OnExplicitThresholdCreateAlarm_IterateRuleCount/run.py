@@ -0,0 +1,177 @@
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import os
+from pysys.utils.perfreporter import PerformanceUnit
+from apamax.eplapplications.perf.basetest import ApamaC8YPerfBaseTest
+
+class PySysTest(ApamaC8YPerfBaseTest):
+	"""
+		Configuration defined below can be changed when running the test using -XconfigName=configValue.
+		For example:
+		```
+		pysys run -XnumDevices=50 -XlocalRules=false TestName
+		```
+	"""
+	# Restart the Apama microservice while preparing the tenant for running the performance test.
+	restartMicroservice = True
+
+	# The duration (in seconds) for the rules to run for measuring the performance for each rule count.
+	testDuration = 300.0
+
+	# The processing mode to use when publishing simulated measurements to Cumulocity.
+	cumulocityProcessingMode = 'CEP'
+
+	# The type of measurements, the rules listen for.
+	measurementType = 'type_device_temperature'
+
+	##### Smartrule Configuration #####
+	# The measurement fragments, the rules listen for.
+	measurementFragment = 'fragment_device_temperature'
+
+	# The measurement series, the rules listen for.
+	measurementSeries = 'series_device_temperature'
+
+	# The type of the raised alarm.
+	alarmType = 'DeviceTemperatureMonitoring'
+
+	# The text of the raised alarm.
+	alarmText = "Explicit threshold smartrule triggered for #{id}"
+
+	# Range of values for which Alarm is generated. The lower bound of each rule is swept over the range in steps.
+	rangeMin = 50
+	rangeMax = 100
+	rangeMinSteps = 5
+
+	# If true, create rules local to the test devices, otherwise create global rules enabled for a single device.
+	localRules = True
+
+	# The number of devices the rules are spread across.
+	numDevices = 100
+
+	# The number of the input measurements per second per device to generate.
+	inputRatePerDevice = 0.1
+
+	# The maximum number of smart rules to deploy concurrently.
+	ruleDeploymentConcurrency = 10
+
+	# The total number of smart rules to test, in increasing order. Rules are added to the previous population for each count.
+	ruleCounts = [100, 500, 1000, 2000, 5000]
+
+	def execute(self):
+		# Prepare the tenant for the test run.
+		self.prepareTenant(restartMicroservice=self.restartMicroservice)
+
+		# Create devices.
+		devices = self.getTestDevicePool().acquire(self.numDevices)
+
+		step = float(self.rangeMax - self.rangeMin) / self.rangeMinSteps
+		deployedRules = 0
+		self.ruleDeployments = []
+		for ruleCount in self.ruleCounts:
+			description = f'{ruleCount} {"local" if self.localRules else "global"} explicit threshold smartrules with {self.numDevices} devices and input rate of {self.inputRatePerDevice} eps/device'
+			self.log.info(f'Testing {description}')
+
+			# Generate and deploy the rules missing from the population.
+			rules = self.smartRulesManager.generateSmartRules(ruleCount - deployedRules, 'onMeasurementExplicitThresholdCreateAlarm',
+				parameterSweeps={
+					'fragment': [self.measurementFragment],
+					'series': [self.measurementSeries],
+					'rangeMin': [self.rangeMin + i * step for i in range(self.rangeMinSteps)],
+					'rangeMax': [self.rangeMax],
+					'alarmType': [self.alarmType],
+					'alarmText': lambda i: f'{i}-{self.alarmText}',
+				},
+				localTo=devices if self.localRules else None,
+				enabledSources=None if self.localRules else devices,
+				startIndex=deployedRules)
+			deployment = self.smartRulesManager.deployAll(rules, maxWorkers=self.ruleDeploymentConcurrency)
+			self.ruleDeployments.append(deployment)
+			deployedRules = ruleCount
+
+			# Start performance monitoring.
+			perfMonitor = self.startPerformanceMonitoring()
+
+			# Save the start time for querying generated alarms.
+			self.startTime = self.getUTCTime()
+
+			# Start simulators.
+			self.startSimulators(devices)
+
+			# Wait for enough performance data to be gathered.
+			self.wait(self.testDuration)
+
+			# Stop performance monitoring.
+			perfMonitor.stop()
+
+			# Save the end time.
+			self.endTime = self.getUTCTime()
+
+			# Generate the HTML report.
+			self.generateHTMLReport(description, testConfigurationDetails=self.getTestConfigurationDetails(ruleCount),
+				extraPerformanceMetrics=self.getExtraPerformanceMetrics(deployment))
+
+	def startSimulators(self, devices):
+		"""Start Measurement simulators for the rules."""
+		# Share the measurement creator of the device class test, which publishes the same measurements.
+		creatorFile = os.path.normpath(f'{self.input}/../../OnExplicitThresholdCreateAlarm_IterateDeviceClasses/Input/measurementCreator.py')
+		simulatorCount = min(10, len(devices))	# Create a maximum of 10 simulators.
+		# Distribute the devices across simulators.
+		simulatorsDevicesShare = [devices[i::simulatorCount] for i in range(simulatorCount)] # Devices split into simulatorCount parts.
+		for simulatorDevices in simulatorsDevicesShare:
+			self.startMeasurementSimulator(simulatorDevices, self.inputRatePerDevice, creatorFile,
+						'MeasurementCreator', [self.measurementType, self.measurementFragment, self.measurementSeries, self.rangeMin,
+						self.rangeMax, self.inputRatePerDevice, len(devices)], self.testDuration, processingMode=self.cumulocityProcessingMode)
+
+	def getTestConfigurationDetails(self, ruleCount):
+		"""Get description of the test configurations to include in the report."""
+
+		return {
+			'Test duration (secs)': self.testDuration,
+			'Restart Apama MicroService': self.restartMicroservice,
+			'Cumulocity Processing Mode': self.cumulocityProcessingMode,
+			'Measurement type': self.measurementType,
+			'Measurement fragment': self.measurementFragment,
+			'Measurement series': self.measurementSeries,
+			'Alarm type': self.alarmType,
+			'Range start': f'{self.rangeMin} (in {self.rangeMinSteps} steps)',
+			'Range end': self.rangeMax,
+			'Number of smart rules': ruleCount,
+			'Local smart rules': self.localRules,
+			'Number of devices': self.numDevices,
+			'Input rate per device': self.inputRatePerDevice,
+		}
+
+	def getExtraPerformanceMetrics(self, deployment):
+		"""
+			Get count of alarms raised during test run and the smart rule deployment rate.
+		"""
+		return {
+			'Alarms Raised': self.countAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime),
+			'Smart Rules Deployed': len(deployment.getSucceeded()),
+			'Smart Rule Deployment Rate (rules/sec)': round(deployment.getThroughput(), 2),
+		}
+
+	def validate(self):
+		# Validate the test run and performance results.
+		super(PySysTest, self).validate()
+
+		# Report performance results for each rule count
+		for i, ruleCount in enumerate(self.ruleCounts[:len(self.ruleDeployments)]):
+			test_name = f'{ruleCount} {"local" if self.localRules else "global"} explicit threshold smartrules with {self.numDevices} devices and input rate of {self.inputRatePerDevice} eps/device'
+			suffix = '' if i == 0 else '.' + str(i).rjust(2, '0')
+			perf_stats = self.read_json(f'perf_statistics{suffix}.json')
+			self.reportPerformanceResult(perf_stats['total_memory_usage']['mean'], f'{test_name} - avg memory usage', PerformanceUnit('MB', biggerIsBetter=False))
+			self.reportPerformanceResult(perf_stats['total_memory_usage']['max'], f'{test_name} - max memory usage', PerformanceUnit('MB', biggerIsBetter=False))
+			self.reportPerformanceResult(perf_stats['total_memory_usage']['mean'] * 1024.0 / ruleCount, f'{test_name} - avg memory usage per rule', PerformanceUnit('KB', biggerIsBetter=False))
+			if 'cpu_usage_milli' in perf_stats:
+				self.reportPerformanceResult(perf_stats['cpu_usage_milli']['mean']/1000.0, f'{test_name} - avg cpu usage', PerformanceUnit('core', biggerIsBetter=False))
+				self.reportPerformanceResult(perf_stats['cpu_usage_milli']['max']/1000.0, f'{test_name} - max cpu usage', PerformanceUnit('core', biggerIsBetter=False))
+			self.reportPerformanceResult(self.ruleDeployments[i].getThroughput(), f'{test_name} - smart rule deployment rate', PerformanceUnit('rules/s', biggerIsBetter=True))
@@ -30,10 +30,30 @@ class MeasurementCreator(ObjectCreator):
 		self.measurements_per_alarm = max(self.measurements_per_alarm,target_alarm_rate)
 		
 		
-	def createObject(self, device, time):
+	def getTemplate(self):
+		return {
+			'time': '@time@',
+			"type": self.measurement_type,
+			"source": {
+				"id": '@device@'
+			},
+			self.measurement_fragment: {
+				self.measurement_series: {
+					"value": '@value@'
+				}
+			}
+		}
+
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': self.nextValue(device)}
+
+	def createFieldColumns(self, devices, times):
+		# Values depend on the number of measurements already sent for the device, so create them in the order of the batch
+		return {'time': times, 'device': devices, 'value': [self.nextValue(device) for device in devices]}
+
+	def nextValue(self, device):
 		count = self.count.get(device, random.randint(0, self.measurements_per_alarm))
 		self.count[device] = count + 1
-		# print(time)
 		# print(self.measurements_per_alarm)
 		if count % self.measurements_per_alarm == 0:
 			# Generate an alarm
@@ -49,15 +69,4 @@ class MeasurementCreator(ObjectCreator):
 			else:
 				value = random.uniform(self.range_min - 100, self.range_min - 1)
 
-		return {
-			'time': time,
-			"type": self.measurement_type,
-			"source": {
-				"id": device
-			},
-			self.measurement_fragment: {
-				self.measurement_series: {
-					"value": value
-				}
-			}
-		}
+		return value
@@ -12,7 +12,6 @@ from pysys.constants import *
 from pysys.utils.perfreporter import PerformanceUnit
 from apamax.eplapplications.perf.basetest import ApamaC8YPerfBaseTest
 from apamax.eplapplications.smartrules import SmartRulesManager
-import concurrent.futures
 import json, time, urllib
 
 class PySysTest(ApamaC8YPerfBaseTest):
@@ -134,7 +133,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 						)
 
 					# Create devices.
-					devices = [self.createTestDevice(f'device{i + 1}', tenant=tenant) for i in range(numDevices)]
+					devices = self.getTestDevicePool(tenant=tenant).acquire(numDevices)
 					self.tenantToDevices[tenant.getTenantId()] = devices
 					
 					# deploy rules
@@ -218,27 +217,10 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		
 	def _prepareTenant(self):
 		''' Cleaning tenants in parallel '''
-		def parallelly_prepareTenant(self, tenantList):
-			# Prepare the tenant for the test run.
-			for tenant in tenantList:
-				self.prepareTenant(tenant=tenant)
-			self.log.info("Completed Thread !!")
-		
-		# Create configured number of threads and clean the tenants parallelly
-		with concurrent.futures.ThreadPoolExecutor(max_workers=self.ThreadCount) as executor:
-			tenantsInEachBatch = int(len(self.tenantsToTest) / self.ThreadCount)
-			# Make the tenants into batches bases on the thread count.
-			tenantsBatch = [self.tenantsToTest[x:x+tenantsInEachBatch] for x in range(0, len(self.tenantsToTest), tenantsInEachBatch)]
-			try:
-				threads = []
-				for tenantList in enumerate(tenantsBatch):
-					threads.append(executor.submit(parallelly_prepareTenant,self,tenantList))
-						
-				concurrent.futures.wait(threads)
-			except Exception as err:
-				self.log.error(f"Exception while cleaning tenant: {err}" )
-				pass
-			
+		preparation = self.prepareTenants(self.tenantsToTest, maxWorkers=self.ThreadCount, raiseOnFailure=False)
+		for failed in preparation.getFailed():
+			self.log.error(f"Exception while cleaning tenant {failed.item.getTenantId()}: {failed.error}")
+
 	def startSimulator(self, devices, tenant, numDevices, inputRatePerDevice):
 		"""Start Measurement simulators for the sample app."""
 		# Create one simulator process per device, unless testing for a large number of devices and tenants.
@@ -281,15 +263,12 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		"""
 			Get count of alarms raised and alarms cleared during test run.
 		"""
-		alarms = []
-		for t in self.tenantsToTest:
-			alarms = alarms + self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime,
-												connection=t.getConnection())
-		raised = len(alarms)
+		raised = 0
 		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		for t in self.tenantsToTest:
+			counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime, tenant=t)
+			raised += sum(counts.values())
+			cleared += counts['CLEARED']
 
 		return {
 			'Alarms Raised': raised,
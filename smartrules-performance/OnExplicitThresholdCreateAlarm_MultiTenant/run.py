@@ -91,7 +91,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 			# Create devices and start simulators if using simulated data.
 			if self.useSimulatedData:
 				# Create devices.
-				devices = [self.createTestDevice(f'device{i+1}', tenant=tenant) for i in range(self.numDevices)]
+				devices = self.getTestDevicePool(tenant=tenant).acquire(self.numDevices)
 				# Enable rule only for these devices
 				rule.setEnabledSources(devices)
 				rule.deploy()
@@ -139,14 +139,12 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		"""
 			Get count of alarms raised and alarms cleared during test run.
 		"""
-		alarms = []
-		for t in self.tenants:
-			alarms = alarms + self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime,connection=t.getConnection())
-		raised = len(alarms)
+		raised = 0
 		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		for t in self.tenants:
+			counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime, tenant=t)
+			raised += sum(counts.values())
+			cleared += counts['CLEARED']
 		
 		return {
 			'Alarms Raised': raised,
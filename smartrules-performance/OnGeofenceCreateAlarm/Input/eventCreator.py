@@ -71,7 +71,30 @@ class EventCreator(ObjectCreator):
 
 		self.count = {} # number of measurements send for devices
 
-	def createObject(self, device, time):
+	def getTemplate(self):
+		return {
+			"time": '@time@',
+			"type": self.event_type,
+			"text": self.eventText,
+			"source": {
+				"id": '@device@'
+			},
+			"c8y_Position": {
+				'lng': '@lng@',
+				'lat': '@lat@'
+			}
+		}
+
+	def createFields(self, device, time):
+		lng, lat = self.nextPosition(device, time)
+		return {'time': time, 'device': device, 'lng': lng, 'lat': lat}
+
+	def createFieldColumns(self, devices, times):
+		# Positions toggle after a number of events for each device, so create them in the order of the batch
+		positions = [self.nextPosition(device, time) for device, time in zip(devices, times)]
+		return {'time': times, 'device': devices, 'lng': [p[0] for p in positions], 'lat': [p[1] for p in positions]}
+
+	def nextPosition(self, device, time):
 		count = self.count.get(device, random.randint(0, self.alarm_frequency))
 		self.count[device] = count + 1
 
@@ -82,18 +105,7 @@ class EventCreator(ObjectCreator):
 			lng, lat = self.getIndices(Inside_GeoFence)
 			print(f'{time}, {device}, Inside')
 
-		return {
-			"time": time,
-			"type": self.event_type,
-			"text": self.eventText,
-			"source": {
-				"id": device
-			},
-			"c8y_Position": {
-				'lng':lng,
-				'lat': lat
-			}
-		}
+		return lng, lat
 		
 	def getIndices(self,GeofenceList):
 		lng = random.choice(GeofenceList)['lng']
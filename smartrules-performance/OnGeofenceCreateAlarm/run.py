@@ -83,7 +83,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		# Create devices and start simulators if using simulated data.
 		if self.useSimulatedData:
 			# Create devices.
-			devices = [self.createTestDevice(f'device{i+1}') for i in range(self.numDevices)]
+			devices = self.getTestDevicePool().acquire(self.numDevices)
 
 			# Enable rule only for these devices
 			rule.setEnabledSources(devices)
@@ -137,12 +137,9 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		"""
 			Get count of alarms raised and alarms cleared during test run.
 		"""
-		alarms = self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
-		raised = len(alarms)
-		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
+		raised = sum(counts.values())
+		cleared = counts['CLEARED']
 		
 		return {
 			'Alarms Raised': raised,
@@ -69,27 +69,39 @@ class EventCreator(ObjectCreator):
 
 		self.count = {} # number of measurements send for devices
 
-	def createObject(self, device, time):
-		count = self.count.get(device, random.randint(0, self.alarm_frequency))
-		self.count[device] = count + 1
-
-		if count % self.alarm_frequency < (self.alarm_frequency / 2):
-			lng, lat = self.getIndices(Outside_GeoFence)
-		else:
-			lng, lat = self.getIndices(Inside_GeoFence)
-
+	def getTemplate(self):
 		return {
-			"time": time,
+			"time": '@time@',
 			"type": self.event_type,
 			"text": self.eventText,
 			"source": {
-				"id": device
+				"id": '@device@'
 			},
 			"c8y_Position": {
-				'lng':lng,
-				'lat': lat
+				'lng': '@lng@',
+				'lat': '@lat@'
 			}
 		}
+
+	def createFields(self, device, time):
+		lng, lat = self.nextPosition(device)
+		return {'time': time, 'device': device, 'lng': lng, 'lat': lat}
+
+	def createFieldColumns(self, devices, times):
+		# Positions toggle after a number of events for each device, so create them in the order of the batch
+		positions = [self.nextPosition(device) for device in devices]
+		return {'time': times, 'device': devices, 'lng': [p[0] for p in positions], 'lat': [p[1] for p in positions]}
+
+	def nextPosition(self, device):
+		count = self.count.get(device, random.randint(0, self.alarm_frequency))
+		self.count[device] = count + 1
+
+		if count % self.alarm_frequency < (self.alarm_frequency / 2):
+			lng, lat = self.getIndices(Outside_GeoFence)
+		else:
+			lng, lat = self.getIndices(Inside_GeoFence)
+
+		return lng, lat
 		
 	def getIndices(self,GeofenceList):
 		lng = random.choice(GeofenceList)['lng']
@@ -67,7 +67,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 				self.startTime = self.getUTCTime()
 
 				# Create devices.
-				devices = [self.createTestDevice(f'device{i+1}') for i in range(numOfDevices)]
+				devices = self.getTestDevicePool().acquire(numOfDevices)
 
 				# Deploy the rule
 				geofence = json.loads(self.geofence)
@@ -128,12 +128,9 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		"""
 			Get count of alarms raised and alarms cleared during test run.
 		"""
-		alarms = self.getAlarms(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
-		raised = len(alarms)
-		cleared = 0
-		for alarm in alarms:
-			if alarm.get('status', '') == 'CLEARED':
-				cleared += 1
+		counts = self.countAlarmsByStatus(type=self.alarmType, dateFrom=self.startTime, dateTo=self.endTime)
+		raised = sum(counts.values())
+		cleared = counts['CLEARED']
 		
 		return {
 			'Alarms Raised': raised,
@@ -83,7 +83,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 		# Create devices and start simulators if using simulated data.
 		if self.useSimulatedData:
 			# Create devices.
-			devices = [self.createTestDevice(f'device{i + 1}') for i in range(self.numDevices)]
+			devices = self.getTestDevicePool().acquire(self.numDevices)
 
 			# Enable rule only for these devices
 			rule.setEnabledSources(devices)
@@ -28,25 +28,37 @@ class MeasurementCreator(ObjectCreator):
 		self.count = {}  # number of measurements send for devices
 
 	def createObject(self, device, time):
+		return self.createObjects([device], [time])[0]
+
+	def createObjects(self, devices, times):
+		# Measurements are not sent for some of the time, which a template cannot express, so create the whole batch here.
+		# Whether a measurement is sent depends on the number of measurements already created for the device, so create
+		# them in the order of the batch.
+		measurements = []
+		for device, time in zip(devices, times):
+			if self.isSending(device):
+				# Send a measurement
+				measurements.append({
+					'time': time,
+					"type": self.measurement_type,
+					"source": {
+						"id": device
+					},
+					'measurement_frag': {
+						'measurement_series': {
+							"value": random.uniform(0, 100)
+						}
+					}
+				})
+			else:
+				# Do not send a measurement
+				measurements.append(None)
+		return measurements
+
+	def isSending(self, device):
 		# Send measurements 2/3rd of the time. Don't send measurement for 1/3rd of the time to raise alarm
 		count = self.count.get(device, random.randint(0, 3 * self.toggle_count))
 		self.count[device] = count + 1
 
 		cycle_count = math.floor(count/self.toggle_count)
-		if cycle_count % 3 != 1:
-			# Send a measurement
-			return {
-				'time': time,
-				"type": self.measurement_type,
-				"source": {
-					"id": device
-				},
-				'measurement_frag': {
-					'measurement_series': {
-						"value": random.uniform(0, 100)
-					}
-				}
-			}
-		else:
-			# Do not send a measurement
-			return None
+		return cycle_count % 3 != 1
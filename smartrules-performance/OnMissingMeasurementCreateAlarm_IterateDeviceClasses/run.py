@@ -73,7 +73,7 @@ class PySysTest(ApamaC8YPerfBaseTest):
 				self.startTime = self.getUTCTime()
 
 				# Create devices.
-				devices = [self.createTestDevice(f'device{i + 1}') for i in range(numOfDevices)]
+				devices = self.getTestDevicePool().acquire(numOfDevices)
 
 				# Deploy the rule.
 				rule = self.smartRulesManager.build_onMissingMeasurementsCreateAlarm(
@@ -15,18 +15,62 @@ from pysys.basetest import BaseTest
 import urllib.request
 import xml.etree.ElementTree as ET
 import os
-import urllib, urllib.parse
+import urllib, urllib.parse, urllib.error
 import inspect
 import hashlib
 import json
+import time
+import re
+import collections
+import shutil
+import threading
+import tempfile
+import atexit
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe()))))))
 from apamax.eplapplications.eplapps import EPLApps
 from apamax.eplapplications.platform import CumulocityPlatform
 from apamax.eplapplications.connection import C8yConnection
-from datetime import datetime, timezone
+from apamax.eplapplications.concurrency import runConcurrently, DEFAULT_MAX_WORKERS
+from apamax.eplapplications.devicepool import TestDevicePool, POOL_FRAGMENT
+from apamax.eplapplications.correlatorpool import getWarmCorrelatorPool
+from apamax.eplapplications.utctime import formatUTCTime, parseUTCTime
 
 APPLICATION_NAME = 'pysys-test-application'
 APPLICATION_KEY = 'pysys-test-key'
+# The default number of objects to fetch per page when querying Cumulocity collections. By default, pageSize = 5 for querying to C8y
+PAGE_SIZE = 100
+# The initial and maximum time (in seconds) between polls when waiting for Cumulocity objects
+WAIT_INITIAL_POLL_INTERVAL = 0.5
+WAIT_MAX_POLL_INTERVAL = 10.0
+# The number of objects to fetch per page when waiting for Cumulocity objects
+WAIT_PAGE_SIZE = 2000
+# The time (in seconds) the creation time watermark of waits for alarms, events and operations is kept behind the newest object seen,
+# so that objects whose creation became visible after a newer object are still fetched
+WAIT_CREATION_WATERMARK_MARGIN = 10.0
+# The time (in seconds) the source time watermark of waits for measurements is kept behind the newest measurement seen,
+# so that measurements arriving with an older source time are still fetched
+WAIT_TIME_WATERMARK_MARGIN = 300.0
+# The initial and maximum time (in seconds) between polls when waiting for injected monitors to terminate
+MONITOR_POLL_INITIAL_INTERVAL = 0.1
+MONITOR_POLL_MAX_INTERVAL = 1.0
+# The read buffer size (in bytes) used when scanning files for grep assertions
+GREP_BUFFER_SIZE = 16 * 1024 * 1024
+# The alarm statuses supported by Cumulocity
+ALARM_STATUSES = ['ACTIVE', 'ACKNOWLEDGED', 'CLEARED']
+# The default time (in seconds) allowed for deleting test devices while preparing a tenant
+DEFAULT_DEVICE_DELETION_TIMEOUT = 600.0
+# The maximum number of times to list and delete test devices while preparing a tenant
+MAX_DEVICE_CLEANUP_PASSES = 5
+# Content type for adding multiple child devices to a device with a single request
+CHILD_REFERENCE_COLLECTION_CONTENT_TYPE = 'application/vnd.com.nsn.cumulocity.managedObjectReferenceCollection+json'
+
+# Deployed local test projects, keyed by a hash of their inputs, that can be reused by other tests in the same run
+_deployedProjectCache = {}
+_deployedProjectCacheLock = threading.Lock()
+# The directory holding the deployed projects cached for the test run, created when the first project is cached
+_deployedProjectCacheDir = None
+# The methods that create local test projects. The cache is not used if a test overrides any of them.
+PROJECT_CREATION_METHODS = ['createProject', 'addC8YPropertiesToProject', 'addEPLAppsToProject', '_getProjectBundles', '_getC8YProperties']
 
 class ApamaC8YBaseTest(BaseTest):
 	"""
@@ -95,10 +139,20 @@ class ApamaC8YBaseTest(BaseTest):
 		apama_project = ProjectHelper(self, name)
 		apama_project.create(existingProject) 
 
+		apama_project.addBundle(self._getProjectBundles())
+		return apama_project
+
+	def _getProjectBundles(self):
+		"""
+			Gets the bundles added to projects which mimic the Cumulocity EPL applications environment.
+
+			:return: List of bundle names.
+			:rtype: list[str]
+		"""
 		n2 = getattr(self.project, 'CUMULOCITY_NOTIFICATIONS_2', 'false')
 
 		# need to have a version independent addition or this will need to be maintained.
-		apama_project.addBundle([
+		return [
 			"Automatic onApplicationInitialized",
 			"Cumulocity IoT > Cumulocity Client" if n2 == 'false' else "Cumulocity IoT > Cumulocity Notifications 2.0",
 			"Cumulocity IoT > Event Definitions for Cumulocity",
@@ -108,8 +162,7 @@ class ApamaC8YBaseTest(BaseTest):
 			"Time Format",
 			"Functional EPL Library",
 			"The MemoryStore",
-		])
-		return apama_project
+		]
 
 	def addC8YPropertiesToProject(self, apamaProject, params=None):
 		"""Adds the connection parameters into a project.
@@ -124,20 +177,36 @@ class ApamaC8YBaseTest(BaseTest):
 			<property name="CUMULOCITY_TENANT" value=""/>
 			<property name="CUMULOCITY_MEASUREMENT_FORMAT" value=""/>
 		"""
-		def create_properties_file(output_name, dest_file, properties):
-			"""Creates a local properties file and copies it to the destination."""
+		self._writeC8YProperties(apamaProject, self._getC8YProperties(params))
+
+	def _writeC8YProperties(self, apamaProject, propertyFiles):
+		"""
+			Writes connection properties files into a project.
+
+			:param apamaProject: The `ProjectHelper` object for a project.
+			:param propertyFiles: The properties files, as returned by `_getC8YProperties`.
+		"""
+		for output_name, (dest_file, properties) in propertyFiles.items():
+			# we create a properties file at this point that will get copied into the project 
 			with open(os.path.join(self.output, output_name), "w", encoding='utf8') as propfile:
 				propfile.write('\ufeff\n')
 				for prop, value in properties.items():
 					propfile.write(f"{prop}={value}\n")
 			self.copy(output_name, apamaProject.configDir() + dest_file)
 
+	def _getC8YProperties(self, params=None):
+		"""
+			Gets the connection properties files to add to a project.
+
+			:param params: The dictionary of parameters to override and add to those defined for the project.
+			:return: Dictionary of the name of each properties file to a tuple of its path within the project config directory and its properties.
+			:rtype: dict[str, tuple[str, dict[str, str]]]
+		"""
 		if params is None:
 			params = {}
 
 		n2 = getattr(self.project, 'CUMULOCITY_NOTIFICATIONS_2', 'false')
 
-		# we create a properties file at this point that will get copied into the project 
 		paramImpl = {
 			"CUMULOCITY_USERNAME": self.project.CUMULOCITY_USERNAME,
 			"CUMULOCITY_PASSWORD": self.project.CUMULOCITY_PASSWORD,
@@ -156,23 +225,24 @@ class ApamaC8YBaseTest(BaseTest):
 		paramImpl.update(params)
 
 		if n2 == 'false':
-			create_properties_file("CumulocityIoT.properties", "/connectivity/CumulocityClient/CumulocityIoT.properties", paramImpl)
-		else:	
-			create_properties_file("CumulocityIoT.properties", "/connectivity/CumulocityNotifications2.0/CumulocityIoTREST.properties", paramImpl)
-
-			n2props = {
-				"CUMULOCITY_NOTIFICATIONS_SUBSCRIBER_NAME": "streamingAnalytics",
-				"CUMULOCITY_NOTIFICATIONS_SUBSCRIPTION_NAME": "streamingAnalytics",
-				"CUMULOCITY_NOTIFICATIONS_SUBSCRIPTION_TYPE": "KeyShared",
-				"CUMULOCITY_NOTIFICATIONS_NUMBER_CLIENTS": "1",
-				"CUMULOCITY_NOTIFICATIONS_MAX_BUFFERSIZE": "1000",
-				"CUMULOCITY_NOTIFICATIONS_MAX_BATCHSIZE": "1000",
-				"CUMULOCITY_NOTIFICATIONS_AUTO_START": "True",
-				"CUMULOCITY_NOTIFICATIONS_SERVICE_URL": getattr(self.project, 'CUMULOCITY_NOTIFICATIONS_SERVICE_URL', '')
-			}
-
-			n2props.update(params)
-			create_properties_file("CumulocityNotifications2.properties", "/connectivity/CumulocityNotifications2.0/CumulocityNotifications2.properties", n2props)
+			return {"CumulocityIoT.properties": ("/connectivity/CumulocityClient/CumulocityIoT.properties", paramImpl)}
+
+		n2props = {
+			"CUMULOCITY_NOTIFICATIONS_SUBSCRIBER_NAME": "streamingAnalytics",
+			"CUMULOCITY_NOTIFICATIONS_SUBSCRIPTION_NAME": "streamingAnalytics",
+			"CUMULOCITY_NOTIFICATIONS_SUBSCRIPTION_TYPE": "KeyShared",
+			"CUMULOCITY_NOTIFICATIONS_NUMBER_CLIENTS": "1",
+			"CUMULOCITY_NOTIFICATIONS_MAX_BUFFERSIZE": "1000",
+			"CUMULOCITY_NOTIFICATIONS_MAX_BATCHSIZE": "1000",
+			"CUMULOCITY_NOTIFICATIONS_AUTO_START": "True",
+			"CUMULOCITY_NOTIFICATIONS_SERVICE_URL": getattr(self.project, 'CUMULOCITY_NOTIFICATIONS_SERVICE_URL', '')
+		}
+
+		n2props.update(params)
+		return {
+			"CumulocityIoT.properties": ("/connectivity/CumulocityNotifications2.0/CumulocityIoTREST.properties", paramImpl),
+			"CumulocityNotifications2.properties": ("/connectivity/CumulocityNotifications2.0/CumulocityNotifications2.properties", n2props),
+		}
 
 	def getTestSubjectEPLApps(self):
 		"""
@@ -235,18 +305,152 @@ class ApamaC8YBaseTest(BaseTest):
 		:rtype: str
 		"""
 		connection = (tenant or self.platform.getTenant()).getConnection()
+		id = self._createTestDeviceImpl(connection, name, type)
+		self._addChildDevices(connection, id, children or [])
+		return id
+
+	def createTestDevices(self, count, namePattern='device{index}', type='PySysTestDevice', childrenSpec=None, tenant=None,
+			startIndex=1, maxWorkers=DEFAULT_MAX_WORKERS):
+		"""
+		Creates multiple Cumulocity devices for testing, performing the requests concurrently.
+
+		The children of each device are added with a single request per device. The throughput of creating devices
+		is logged, and the outcome of the creation is available in the `lastTestDeviceCreation` attribute.
+
+		Failed requests are retried without creating a device twice: if adding the children fails, only adding the children
+		is retried, and if creating a device fails, the device is looked up by its name before it is created again.
+
+		For example::
+
+			devices = self.createTestDevices(1000)
+			accessPoints = self.createTestDevices(30, namePattern='accesspoint_{index}', type='AccessPoint', startIndex=0)
+			buildings = self.createTestDevices(10, namePattern='building_{index}', type='Building', startIndex=0,
+							childrenSpec=lambda i: accessPoints[i*3:(i+1)*3])
+
+		:param int count: The number of devices to create.
+		:param str namePattern: The pattern used to generate the name of each device, formatted with the `index` of the device.
+			The name of the device is prefixed with `PYSYS_` so that the framework can identify and clean up test devices.
+		:param type: The type of the devices.
+		:type type: str, optional
+		:param childrenSpec: The device IDs to add as children to each created device. Either a list containing a list of
+			device IDs for each device, or a function called with the position (starting at 0) of the device returning the list of device IDs.
+		:type childrenSpec: list[list[str]] or callable, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param int startIndex: The index of the first device used in the name pattern.
+		:param int maxWorkers: The maximum number of devices to create concurrently.
+		:return: The IDs of the devices created, in the order of their index.
+		:rtype: list[str]
+		"""
+		connection = (tenant or self.platform.getTenant()).getConnection()
+
+		created = {}	# The ID of each device created, by position, so that retries only add the children
+		attempted = set()	# The positions for which creating the device has been attempted
+
+		def create(position):
+			name = namePattern.format(index=startIndex + position)
+			id = created.get(position)
+			if id is None:
+				# A previous attempt may have created the device even though its request failed
+				if position in attempted:
+					id = self._findTestDevice(connection, name, type)
+				attempted.add(position)
+				if id is None:
+					id = self._createTestDeviceImpl(connection, name, type)
+				created[position] = id
+			if childrenSpec:
+				children = childrenSpec(position) if callable(childrenSpec) else childrenSpec[position]
+				self._addChildDevices(connection, id, children or [])
+			return id
+
+		outcome = runConcurrently(create, range(count), description='test devices created', maxWorkers=maxWorkers,
+						retries=2, log=self.log, progressInterval=10.0)
+		self.lastTestDeviceCreation = outcome
+		outcome.raiseIfFailed()
+		return outcome.getResults()
+
+	def _createTestDeviceImpl(self, connection, name, type):
+		"""
+			Creates a single test device.
+
+			:param connection: The connection to the Cumulocity tenant.
+			:type connection: :class:`~apamax.eplapplications.connection.C8yConnection`
+			:param str name: The name of the device, without the test device prefix.
+			:param str type: The type of the device.
+			:return: The ID of the device created.
+			:rtype: str
+		"""
 		device = {
 			'name': f'{self.TEST_DEVICE_PREFIX}{name}',
 			'c8y_IsDevice': True,
 			'type': type,
 			'com_cumulocity_model_Agent': {}
 		}
-		id = json.loads(connection.do_request_json('POST', '/inventory/managedObjects', device, useLocationHeaderPostResp=False))['id']
-		
-		children = children or []
+		return json.loads(connection.do_request_json('POST', '/inventory/managedObjects', device, useLocationHeaderPostResp=False))['id']
+
+	def _findTestDevice(self, connection, name, type):
+		"""
+			Finds a test device created by :meth:`_createTestDeviceImpl`.
+
+			:param connection: The connection to the Cumulocity tenant.
+			:type connection: :class:`~apamax.eplapplications.connection.C8yConnection`
+			:param str name: The name of the device, without the test device prefix.
+			:param str type: The type of the device.
+			:return: The ID of the device, or `None` if it does not exist.
+			:rtype: str
+		"""
+		query = f"name eq '{self.TEST_DEVICE_PREFIX}{name}' and type eq '{type}'"
+		resp = connection.do_get('/inventory/managedObjects', params={'query': query, 'pageSize': 10})
+		# Devices of a test device pool can have the same name
+		devices = [device for device in resp.get('managedObjects', []) if POOL_FRAGMENT not in device]
+		return devices[-1]['id'] if devices else None
+
+	def _addChildDevices(self, connection, id, children):
+		"""
+			Adds child devices to a device.
+
+			All children are added using a single managed object reference collection request. If the platform rejects
+			that request, the children are added one at a time.
+
+			:param connection: The connection to the Cumulocity tenant.
+			:type connection: :class:`~apamax.eplapplications.connection.C8yConnection`
+			:param str id: The ID of the parent device.
+			:param list[str] children: The IDs of the child devices.
+		"""
+		if not children: return
+		if len(children) > 1:
+			references = {'references': [{'managedObject': {'id': child}} for child in children]}
+			headers = {'Content-Type': CHILD_REFERENCE_COLLECTION_CONTENT_TYPE, 'Accept': 'application/json'}
+			try:
+				connection.request('POST', f'/inventory/managedObjects/{id}/childDevices', json.dumps(references), headers, useLocationHeaderPostResp=False)
+				return
+			except urllib.error.HTTPError as ex:
+				if ex.code // 100 != 4: raise
+				self.log.debug(f'Adding child devices to {id} in bulk is not supported, adding them individually: {ex}')
 		for child in children:
 			connection.do_request_json('POST', f'/inventory/managedObjects/{id}/childDevices', {'managedObject': {'id': child}})
-		return id
+
+	def getTestDevicePool(self, namePrefix='device', type='PySysTestDevice', tenant=None):
+		"""
+		Gets a pool of test devices that are reused across test variations, tests and test runs instead of being deleted when the tenant is prepared.
+
+		Set the `reuseTestDevices` project property to `false` in the PySys project configuration to delete pooled devices when the tenant is prepared.
+
+		For example::
+
+			# Devices named PYSYS_device1 to PYSYS_device100, created only if they do not exist yet
+			devices = self.getTestDevicePool().acquire(100)
+
+		:param str namePrefix: The name prefix of the devices in the pool. The devices are named by appending an index, starting at 1, to the prefix.
+			The name of each device is also prefixed with `PYSYS_` so that the framework can identify test devices.
+		:param type: The type of the devices.
+		:type type: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:return: The device pool.
+		:rtype: :class:`~apamax.eplapplications.devicepool.TestDevicePool`
+		"""
+		return TestDevicePool(tenant or self.platform.getTenant(), self.log, f'{self.TEST_DEVICE_PREFIX}{namePrefix}', type)
 
 	def getAlarms(self, source=None, type=None, status=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
 		"""
@@ -327,6 +531,315 @@ class ApamaC8YBaseTest(BaseTest):
 		
 		return self._getCumulocityObjectCollection('/devicecontrol/operations', queryParams=queryParams, responseKey='operations',tenant=tenant)
 
+	def countAlarms(self, source=None, type=None, status=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
+		"""
+		Counts alarms with matching parameters, without fetching the alarms.
+
+		For example::
+
+			raised = self.countAlarms(type='my_alarms', dateFrom=self.startTime, dateTo=self.endTime)
+
+		:param source: The source object of the alarm. Count alarms for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of alarm to count. Count alarms of all types if not specified.
+		:type type: str, optional
+		:param status: The status of the alarms to count. Count alarms of all status if not specified.
+		:type status: str, optional
+		:param dateFrom: The start time of the alarm in the ISO format. If specified, only alarms that are created on or after this time are counted.
+		:type dateFrom: str, optional
+		:param dateTo: The end time of the alarm in the ISO format. If specified, only alarms that are created on or before this time are counted.
+		:type dateTo: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering alarms.
+		:return: The number of alarms.
+		:rtype: int
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, status=status, dateFrom=dateFrom, dateTo=dateTo, **kwargs)
+		return self._countCumulocityObjects('/alarm/alarms', queryParams, tenant=tenant)
+
+	def countAlarmsByStatus(self, statuses=ALARM_STATUSES, source=None, type=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
+		"""
+		Counts alarms with matching parameters for each alarm status, querying the count of each status concurrently.
+
+		For example::
+
+			counts = self.countAlarmsByStatus(type='my_alarms', dateFrom=self.startTime, dateTo=self.endTime)
+			raised, cleared = sum(counts.values()), counts['CLEARED']
+
+		:param statuses: The alarm statuses to count. Counts ACTIVE, ACKNOWLEDGED and CLEARED alarms if not specified.
+		:type statuses: list[str], optional
+		:param source: The source object of the alarm. Count alarms for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of alarm to count. Count alarms of all types if not specified.
+		:type type: str, optional
+		:param dateFrom: The start time of the alarm in the ISO format. If specified, only alarms that are created on or after this time are counted.
+		:type dateFrom: str, optional
+		:param dateTo: The end time of the alarm in the ISO format. If specified, only alarms that are created on or before this time are counted.
+		:type dateTo: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering alarms.
+		:return: Dictionary of alarm status to the number of alarms with that status.
+		:rtype: dict[str, int]
+		"""
+		outcome = runConcurrently(lambda status: self.countAlarms(source=source, type=type, status=status, dateFrom=dateFrom, dateTo=dateTo, tenant=tenant, **kwargs),
+						statuses, description='alarm counts', maxWorkers=len(statuses), retries=2)
+		outcome.raiseIfFailed()
+		return dict(zip(statuses, outcome.getResults()))
+
+	def countEvents(self, source=None, type=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
+		"""
+		Counts events with matching parameters, without fetching the events.
+
+		:param source: The source object of the event. Count events for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of event to count. Count events of all types if not specified.
+		:type type: str, optional
+		:param dateFrom: The start time of the event in the ISO format. If specified, only events that occurred on or after this time are counted.
+		:type dateFrom: str, optional
+		:param dateTo: The end time of the event in the ISO format. If specified, only events that occurred on or before this time are counted.
+		:type dateTo: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering events.
+		:return: The number of events.
+		:rtype: int
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, dateFrom=dateFrom, dateTo=dateTo, **kwargs)
+		return self._countCumulocityObjects('/event/events', queryParams, tenant=tenant)
+
+	def countOperations(self, deviceId=None, fragmentType=None, status=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
+		"""
+		Counts operations with matching parameters, without fetching the operations.
+
+		:param deviceId: The device ID of the operation. Count operations for all devices if not specified.
+		:type deviceId: str, optional
+		:param fragmentType: The type of fragment that must be part of the operation.
+		:type fragmentType: str, optional
+		:param status: The status of the operations to count. Count operations of all status if not specified.
+		:type status: str, optional
+		:param dateFrom: The start time of the operation in the ISO format. If specified, only operations that are created on or after this time are counted.
+		:type dateFrom: str, optional
+		:param dateTo: The end time of the operation in the ISO format. If specified, only operations that are created on or before this time are counted.
+		:type dateTo: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering operations.
+		:return: The number of operations.
+		:rtype: int
+		"""
+		queryParams = self._createQueryParams(deviceId=deviceId, fragmentType=fragmentType, status=status, dateFrom=dateFrom, dateTo=dateTo, **kwargs)
+		return self._countCumulocityObjects('/devicecontrol/operations', queryParams, tenant=tenant)
+
+	def countMeasurements(self, source=None, type=None, valueFragmentType=None, valueFragmentSeries=None, dateFrom=None, dateTo=None, tenant=None, **kwargs):
+		"""
+		Counts measurements with matching parameters, without fetching the measurements.
+
+		:param source: The source object of the measurement. Count measurements for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of measurement to count. Count measurements of all types if not specified.
+		:type type: str, optional
+		:param valueFragmentType: The fragment that must be part of the measurement.
+		:type valueFragmentType: str, optional
+		:param valueFragmentSeries: The series that must be part of the measurement.
+		:type valueFragmentSeries: str, optional
+		:param dateFrom: The start time of the measurement in the ISO format. If specified, only measurements taken on or after this time are counted.
+		:type dateFrom: str, optional
+		:param dateTo: The end time of the measurement in the ISO format. If specified, only measurements taken on or before this time are counted.
+		:type dateTo: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering measurements.
+		:return: The number of measurements.
+		:rtype: int
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, valueFragmentType=valueFragmentType,
+						valueFragmentSeries=valueFragmentSeries, dateFrom=dateFrom, dateTo=dateTo, **kwargs)
+		return self._countCumulocityObjects('/measurement/measurements', queryParams, tenant=tenant)
+
+	def waitForAlarms(self, count, timeout=TIMEOUTS['WaitForSignal'], source=None, type=None, status=None, dateFrom=None, tenant=None, abortOnError=None, **kwargs):
+		"""
+		Waits until at least the specified number of alarms with matching parameters exist.
+
+		Cumulocity is polled with an increasing interval between polls. Each poll only fetches alarms that were created after
+		those already seen, regardless of their source time, unless alarms are filtered by status, since the status of older alarms can change.
+
+		For example::
+
+			alarms = self.waitForAlarms(10, type='my_alarms', dateFrom=self.startTime, timeout=120)
+
+		:param int count: The number of alarms to wait for.
+		:param timeout: The maximum time (in seconds) to wait. The test outcome is set to TIMEDOUT if the condition does not hold before the timeout.
+		:type timeout: float, optional
+		:param source: The source object of the alarm. Wait for alarms for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of alarm to wait for. Wait for alarms of all types if not specified.
+		:type type: str, optional
+		:param status: The status of the alarms to wait for. Wait for alarms of all status if not specified.
+		:type status: str, optional
+		:param dateFrom: The start time of the alarm in the ISO format. If specified, only alarms that are created on or after this time are included.
+		:type dateFrom: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param abortOnError: Abort the test if the condition does not hold before the timeout. Uses the project's `defaultAbortOnError` setting if not specified.
+		:type abortOnError: bool, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering alarms.
+		:return: List of matching alarms found.
+		:rtype: list[object]
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, status=status, **kwargs)
+		return self._waitForCumulocityObjects('/alarm/alarms', queryParams, 'alarms', count, watermarkParam='createdFrom', dateFrom=dateFrom,
+					moveWatermark=status is None, timeout=timeout, tenant=tenant, abortOnError=abortOnError)
+
+	def waitForEvents(self, count, timeout=TIMEOUTS['WaitForSignal'], source=None, type=None, dateFrom=None, tenant=None, abortOnError=None, **kwargs):
+		"""
+		Waits until at least the specified number of events with matching parameters exist.
+
+		Cumulocity is polled with an increasing interval between polls. Each poll only fetches events that were created after those
+		already seen, regardless of their source time.
+
+		:param int count: The number of events to wait for.
+		:param timeout: The maximum time (in seconds) to wait. The test outcome is set to TIMEDOUT if the condition does not hold before the timeout.
+		:type timeout: float, optional
+		:param source: The source object of the event. Wait for events for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of event to wait for. Wait for events of all types if not specified.
+		:type type: str, optional
+		:param dateFrom: The start time of the event in the ISO format. If specified, only events that occurred on or after this time are included.
+		:type dateFrom: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param abortOnError: Abort the test if the condition does not hold before the timeout. Uses the project's `defaultAbortOnError` setting if not specified.
+		:type abortOnError: bool, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering events.
+		:return: List of matching events found.
+		:rtype: list[object]
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, **kwargs)
+		return self._waitForCumulocityObjects('/event/events', queryParams, 'events', count, watermarkParam='createdFrom', dateFrom=dateFrom,
+					timeout=timeout, tenant=tenant, abortOnError=abortOnError)
+
+	def waitForMeasurements(self, count, timeout=TIMEOUTS['WaitForSignal'], source=None, type=None, valueFragmentType=None, valueFragmentSeries=None,
+			dateFrom=None, tenant=None, abortOnError=None, **kwargs):
+		"""
+		Waits until at least the specified number of measurements with matching parameters exist.
+
+		Cumulocity is polled with an increasing interval between polls. Measurements cannot be queried by their creation time,
+		so each poll fetches the measurements with a source time up to 5 minutes before the newest measurement already seen.
+		Measurements arriving with a source time more than 5 minutes older than the newest measurement seen are not found.
+
+		:param int count: The number of measurements to wait for.
+		:param timeout: The maximum time (in seconds) to wait. The test outcome is set to TIMEDOUT if the condition does not hold before the timeout.
+		:type timeout: float, optional
+		:param source: The source object of the measurement. Wait for measurements for all objects if not specified.
+		:type source: str, optional
+		:param type: The type of measurement to wait for. Wait for measurements of all types if not specified.
+		:type type: str, optional
+		:param valueFragmentType: The fragment that must be part of the measurement.
+		:type valueFragmentType: str, optional
+		:param valueFragmentSeries: The series that must be part of the measurement.
+		:type valueFragmentSeries: str, optional
+		:param dateFrom: The start time of the measurement in the ISO format. If specified, only measurements taken on or after this time are included.
+		:type dateFrom: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param abortOnError: Abort the test if the condition does not hold before the timeout. Uses the project's `defaultAbortOnError` setting if not specified.
+		:type abortOnError: bool, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering measurements.
+		:return: List of matching measurements found.
+		:rtype: list[object]
+		"""
+		queryParams = self._createQueryParams(source=source, type=type, valueFragmentType=valueFragmentType, valueFragmentSeries=valueFragmentSeries, **kwargs)
+		return self._waitForCumulocityObjects('/measurement/measurements', queryParams, 'measurements', count, watermarkParam='dateFrom',
+					watermarkField='time', watermarkMargin=WAIT_TIME_WATERMARK_MARGIN, dateFrom=dateFrom,
+					timeout=timeout, tenant=tenant, abortOnError=abortOnError)
+
+	def waitForOperations(self, count, timeout=TIMEOUTS['WaitForSignal'], deviceId=None, fragmentType=None, status=None, dateFrom=None, tenant=None, abortOnError=None, **kwargs):
+		"""
+		Waits until at least the specified number of operations with matching parameters exist.
+
+		Cumulocity is polled with an increasing interval between polls. Each poll only fetches operations that were created after those
+		already seen, unless operations are filtered by status, since the status of older operations can change.
+
+		:param int count: The number of operations to wait for.
+		:param timeout: The maximum time (in seconds) to wait. The test outcome is set to TIMEDOUT if the condition does not hold before the timeout.
+		:type timeout: float, optional
+		:param deviceId: The device ID of the operation. Wait for operations for all devices if not specified.
+		:type deviceId: str, optional
+		:param fragmentType: The type of fragment that must be part of the operation.
+		:type fragmentType: str, optional
+		:param status: The status of the operations to wait for. Wait for operations of all status if not specified.
+		:type status: str, optional
+		:param dateFrom: The start time of the operation in the ISO format. If specified, only operations that are created on or after this time are included.
+		:type dateFrom: str, optional
+		:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+		:param abortOnError: Abort the test if the condition does not hold before the timeout. Uses the project's `defaultAbortOnError` setting if not specified.
+		:type abortOnError: bool, optional
+		:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering operations.
+		:return: List of matching operations found.
+		:rtype: list[object]
+		"""
+		queryParams = self._createQueryParams(deviceId=deviceId, fragmentType=fragmentType, status=status, **kwargs)
+		return self._waitForCumulocityObjects('/devicecontrol/operations', queryParams, 'operations', count, watermarkParam='dateFrom', dateFrom=dateFrom,
+					moveWatermark=status is None, timeout=timeout, tenant=tenant, abortOnError=abortOnError)
+
+	def assertGrepAll(self, file, assertions, encoding='utf8', abortOnError=None):
+		"""
+		Performs multiple grep assertions on a file, reading the file only once.
+
+		Each assertion has the same meaning and produces the same outcome as calling `assertGrep` for it. The expressions are
+		combined into a single regular expression, so lines that match none of them are only checked once. This is much faster
+		than separate `assertGrep` calls on large log files.
+
+		For example::
+
+			self.assertGrepAll(self.platform.getApamaLogFile(), [
+				{'expr': r' (ERROR|FATAL) .* eplfiles\\.', 'contains': False},
+				{'expr': 'Added monitor eplfiles.MyApp'},
+			])
+
+		:param str file: The path of the file, relative to the output directory if not absolute.
+		:param assertions: The assertions. Each is a dictionary containing the regular expression `expr`, and optionally
+			`contains` (defaults to `True`) and `assertMessage` to use instead of the default outcome reason.
+		:type assertions: list[dict]
+		:param str encoding: The encoding of the file.
+		:param abortOnError: Abort the test if any assertion fails. Uses the project's `defaultAbortOnError` setting if not specified.
+		:type abortOnError: bool, optional
+		:return: The first line matching each expression, or `None` if the expression did not match any line.
+		:rtype: list[str]
+		"""
+		if abortOnError is None: abortOnError = self.defaultAbortOnError
+		path = os.path.join(self.output, file)
+		expressions = [re.compile(a['expr']) for a in assertions]
+		combined = re.compile('|'.join(f'(?:{a["expr"]})' for a in assertions))
+		matches = [None] * len(assertions)
+		unmatched = set(range(len(assertions)))
+		if not os.path.exists(path):
+			self.addOutcome(BLOCKED, f'Grep on {file} failed: file does not exist', abortOnError=abortOnError)
+			return matches
+
+		with open(path, encoding=encoding, errors='replace', buffering=GREP_BUFFER_SIZE) as f:
+			for line in f:
+				if not unmatched: break
+				if not combined.search(line): continue
+				for i in list(unmatched):
+					if expressions[i].search(line):
+						matches[i] = line.rstrip('\r\n')
+						unmatched.discard(i)
+
+		for assertion, match in zip(assertions, matches):
+			contains = assertion.get('contains', True)
+			msg = assertion.get('assertMessage') or f'Grep on {file} {"contains" if contains else "does not contain"} "{assertion["expr"]}"'
+			if contains == (match is not None):
+				self.addOutcome(PASSED, msg)
+			elif contains:
+				self.addOutcome(FAILED, msg, abortOnError=abortOnError)
+			else:
+				self.addOutcome(FAILED, f'{msg} failed with: "{match}"', abortOnError=abortOnError)
+		return matches
+
 	def copyWithReplace(self, sourceFile, targetFile, replacementDict, marker='@'):
 		"""
 			Copies the source file to the target file and replaces the placeholder strings with the actual values.
@@ -361,7 +874,6 @@ class ApamaC8YBaseTest(BaseTest):
 			:rtype: list[dict]
 		"""
 		result = []
-		PAGE_SIZE = 100 	# By default, pageSize = 5 for querying to C8y
 		queryParams = queryParams or {}
 
 		connection = (tenant or self.platform.getTenant()).getConnection()
@@ -386,6 +898,117 @@ class ApamaC8YBaseTest(BaseTest):
 
 		return result
 
+	def _createQueryParams(self, **params):
+		"""
+			Creates query parameters for querying a Cumulocity collection, ignoring parameters that are not specified.
+
+			:param \\**params: The query parameters. Parameters that are `None` are ignored, but other values such as `False` are kept.
+			:return: The query parameters that have a value.
+			:rtype: dict[str,str]
+		"""
+		return {key: value for key, value in params.items() if value is not None}
+
+	def _countCumulocityObjects(self, resourceUrl, queryParams, tenant=None):
+		"""
+			Counts the objects of a Cumulocity collection by fetching a single object along with the collection statistics.
+
+			:param str resourceUrl: The base url of the object to count. For example, /alarm/alarms.
+			:param dict[str,str] queryParams: The query parameters.
+			:param tenant: The Cumulocity tenant.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+			:return: The number of objects.
+			:rtype: int
+		"""
+		connection = (tenant or self.platform.getTenant()).getConnection()
+		params = dict(queryParams or {}, pageSize=1, withTotalElements='true', withTotalPages='true')
+		stats = connection.do_get(f'{resourceUrl}?{urllib.parse.urlencode(params)}')['statistics']
+		# Older versions of Cumulocity do not support totalElements, but with one object per page the number of pages is the same
+		return int(stats['totalElements'] if 'totalElements' in stats else stats['totalPages'])
+
+	def _waitForCumulocityObjects(self, resourceUrl, queryParams, responseKey, count, watermarkParam, dateFrom, timeout, tenant=None, abortOnError=None,
+			moveWatermark=True, watermarkField='creationTime', watermarkMargin=WAIT_CREATION_WATERMARK_MARGIN):
+		"""
+			Polls a Cumulocity object collection until it contains at least the specified number of objects.
+
+			The watermark query parameter of each poll is moved to a margin before the newest value of the watermark field of
+			the objects already seen, so that each poll mostly fetches new objects. Objects are deduplicated by their ID, so
+			objects fetched again by several polls are only counted once. If the watermark is not moved, each poll fetches
+			all matching objects, so only the objects found by the latest poll are counted. Objects that no longer match
+			the query, for example alarms cleared since an earlier poll, are not counted.
+
+			:param str resourceUrl: The base url of the object to get. For example, /alarm/alarms.
+			:param dict[str,str] queryParams: The query parameters.
+			:param str responseKey: The key to use to get actual object list from the response JSON.
+			:param int count: The number of objects to wait for.
+			:param str watermarkParam: The query parameter used as the watermark, for example `createdFrom`.
+			:param dateFrom: The value of the `dateFrom` query parameter. If it is also the watermark, this is its initial value.
+			:type dateFrom: str, optional
+			:param float timeout: The maximum time (in seconds) to wait.
+			:param tenant: The Cumulocity tenant.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+			:param abortOnError: Abort the test on timeout.
+			:type abortOnError: bool, optional
+			:param bool moveWatermark: Move the watermark to the newest object seen. Do not move it if the query filters by a
+				property that can change, such as the status.
+			:param str watermarkField: The field of the objects filtered by the watermark query parameter.
+			:param float watermarkMargin: The time (in seconds) to keep the watermark before the newest object seen.
+			:return: List of objects found.
+			:rtype: list[dict]
+		"""
+		seen = {}
+		newest = None	# The newest epoch time of the watermark field of the objects seen
+		delay = WAIT_INITIAL_POLL_INTERVAL
+		startTime = time.time()
+		while True:
+			params = dict(queryParams)
+			if dateFrom:
+				params['dateFrom'] = dateFrom
+			if moveWatermark and newest is not None:
+				watermark = newest - watermarkMargin
+				if watermarkParam == 'dateFrom' and dateFrom:
+					watermark = max(watermark, parseUTCTime(dateFrom))
+				params[watermarkParam] = formatUTCTime(watermark)
+			if not moveWatermark:
+				seen = {}
+			for obj in self._iterCumulocityObjectCollection(resourceUrl, params, responseKey, tenant=tenant, pageSize=WAIT_PAGE_SIZE):
+				seen.setdefault(obj['id'], obj)
+				if obj.get(watermarkField):
+					newest = max(newest or 0.0, parseUTCTime(obj[watermarkField]))
+			if len(seen) >= count:
+				self.log.info(f'Found {len(seen)} {responseKey} after {time.time() - startTime:.1f} seconds')
+				return list(seen.values())
+
+			remaining = startTime + timeout - time.time()
+			if remaining <= 0:
+				msg = f'Timed out waiting for {count} {responseKey} after {timeout} seconds, found {len(seen)}'
+				self.addOutcome(TIMEDOUT, msg, abortOnError=self.defaultAbortOnError if abortOnError is None else abortOnError)
+				return list(seen.values())
+			time.sleep(min(delay, remaining))
+			delay = min(delay * 2, WAIT_MAX_POLL_INTERVAL)
+
+	def _iterCumulocityObjectCollection(self, resourceUrl, queryParams, responseKey, tenant=None, pageSize=PAGE_SIZE):
+		"""
+			Iterates over a Cumulocity object collection, fetching each page only when the objects of the previous page have been consumed.
+
+			:param str resourceUrl: The base url of the object to get. For example, /alarm/alarms.
+			:param dict[str,str] queryParams: The query parameters.
+			:param str responseKey: The key to use to get actual object list from the response JSON.
+			:param tenant: The Cumulocity tenant.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+			:param int pageSize: The number of objects to fetch per request.
+			:return: Generator of objects.
+		"""
+		connection = (tenant or self.platform.getTenant()).getConnection()
+		params = dict(queryParams or {}, pageSize=pageSize)
+		separator = '&' if '?' in resourceUrl else '?'
+		currentPage = 1
+		while True:
+			params['currentPage'] = currentPage
+			objects = connection.do_get(f'{resourceUrl}{separator}{urllib.parse.urlencode(params)}')[responseKey]
+			yield from objects
+			if len(objects) < pageSize: break
+			currentPage += 1
+
 	def _clearActiveAlarms(self,tenant=None):
 		"""
 			Clears all active alarms as part of a pre-test tenant cleanup.
@@ -405,20 +1028,47 @@ class ApamaC8YBaseTest(BaseTest):
 	def _deleteTestDevices(self,tenant=None):
 		"""
 			Deletes all ManagedObjects that have name prefixed with "PYSYS_" and the 'c8y_isDevice' param as part of pre-test tenant cleanup.
+			Devices in a test device pool are kept, unless the `reuseTestDevices` project property is set to `false`.
+
+			All test devices are listed first and then deleted by up to `testDeviceDeletionConcurrency` threads (a project property, defaults to 10).
+			Transient failures are retried. If the `testDeviceDeletionCascade` project property is `true`, child assets and devices
+			are deleted together with each device. An exception is raised if any device could not be deleted
+			within `testDeviceDeletionTimeout` seconds (a project property, defaults to 600), or if any test device remains.
 
 			:param tenant: The Cumulocity tenant.
 			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
 
 		"""
 		connection = (tenant or self.platform.getTenant()).getConnection()
+		maxWorkers = int(getattr(self.project, 'testDeviceDeletionConcurrency', DEFAULT_MAX_WORKERS))
+		timeout = float(getattr(self.project, 'testDeviceDeletionTimeout', DEFAULT_DEVICE_DELETION_TIMEOUT))
+		cascade = getattr(self.project, 'testDeviceDeletionCascade', 'false').lower() == 'true'
+		deadline = time.time() + timeout
+
 		self.log.info("Deleting old test devices")
-		testDevices = self._getCumulocityObjectCollection(f"/inventory/managedObjects", 
-						queryParams={'query':f"has(c8y_IsDevice) and name eq '{self.TEST_DEVICE_PREFIX}*'"},
-						responseKey='managedObjects',tenant=tenant)
-		# Deleting test devices
-		testDeviceIds = [device['id'] for device in testDevices]
-		for deviceId in testDeviceIds:
-			resp = connection.request('DELETE', f'/inventory/managedObjects/{deviceId}')
+		query = f"has(c8y_IsDevice) and name eq '{self.TEST_DEVICE_PREFIX}*'"
+		# Keep pooled test devices so that they can be reused
+		if getattr(self.project, 'reuseTestDevices', 'true').lower() != 'false':
+			query += f" and not(has({POOL_FRAGMENT}))"
+
+		def delete(deviceId):
+			try:
+				connection.request('DELETE', f'/inventory/managedObjects/{deviceId}' + ('?cascade=true' if cascade else ''))
+			except urllib.error.HTTPError as ex:
+				# Already deleted, for example as the child of a device deleted with cascade
+				if ex.code != 404: raise
+
+		# List all test devices before deleting any, as deleting devices shifts the later pages of the listing. List again
+		# after deleting them to check that no test devices remain, for example devices created while they were being deleted.
+		for _ in range(MAX_DEVICE_CLEANUP_PASSES):
+			testDeviceIds = [device['id'] for device in self._iterCumulocityObjectCollection('/inventory/managedObjects',
+								queryParams={'query': query}, responseKey='managedObjects', tenant=tenant)]
+			if not testDeviceIds: return
+			runConcurrently(delete, testDeviceIds, description='test device deletions', maxWorkers=maxWorkers,
+							timeout=max(deadline - time.time(), 0), retries=3, log=self.log, progressInterval=10.0).raiseIfFailed()
+		remaining = self._countCumulocityObjects('/inventory/managedObjects', {'query': query}, tenant=tenant)
+		if remaining:
+			raise Exception(f'{remaining} test devices remain after deleting them {MAX_DEVICE_CLEANUP_PASSES} times')
 
 	def _deleteTestEPLApps(self,tenant=None):
 		"""
@@ -452,11 +1102,20 @@ class ApamaC8YBaseTest(BaseTest):
 			:return: Timestamp string.
 			:rtype: str
 		"""
-		if timestamp is not None:
-			t = datetime.fromtimestamp(timestamp, timezone.utc)
-		else:
-			t = datetime.now(timezone.utc)
-		return t.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+		return formatUTCTime(timestamp)
+
+	def _getIntProperty(self, propertyName, default):
+		"""
+			Gets an integer option of the test, set with the `-X` command line option or as a project property.
+
+			:param str propertyName: The name of the option.
+			:param int default: The value to use if the option is not set.
+			:rtype: int
+		"""
+		value = getattr(self, propertyName, None)
+		if value is None:
+			value = getattr(self.project, propertyName, default)
+		return int(value)
 
 	def _maybePauseDuringTest(self):
 		if self.getBoolProperty('pauseDuringTest'):
@@ -477,42 +1136,245 @@ class LocalCorrelatorSimpleTest(ApamaC8YBaseTest):
 		"""
 			Runs all the tests in the Input directory against the applications configured in the EPL_APPS 
 			directory or with the `EPLApps` directive. 
+
+			If the `localCorrelatorShards` option (set with `-XlocalCorrelatorShards=N` or as a project property) is greater than 1,
+			the tests are split across that many local correlators started from the same project, which run concurrently.
+			The logs of the correlators are merged into the c8y-correlator.log file once all tests have completed.
+			Only use this if the tests and the applications under test do not interfere with each other when running in separate correlators.
+
+			If the `reuseLocalCorrelators` option is `true`, correlators already connected to Cumulocity are leased from a pool shared by
+			all tests of the run instead of starting a new correlator for each test. A correlator is only returned to the pool if the
+			test passed and its test monitors have all terminated. The monitors of the applications under test are then deleted and
+			injected again, so the next test starts with fresh applications. Otherwise, the correlator is stopped.
 		"""
 		# Check APAMA_HOME env is set
 		if not os.path.isdir(self.project.APAMA_HOME):
 			self.abort(BLOCKED, f'APAMA_HOME project property is not valid ({self.project.APAMA_HOME}). Try running in an Apama command prompt.')
 
-		from apama.correlator import CorrelatorHelper
 		# Create test project and add C8Y properties and EPL Apps 
-		project = self.createProject("test-project")
-		self.addC8YPropertiesToProject(project)
-		eplApps = self.getTestSubjectEPLApps()
-		self.addEPLAppsToProject(eplApps, project)
-		project.deploy()
+		deployedDir = self._deployTestProject("test-project")
 
-		# Run local correlator connected to C8Y with Apama EPL Apps and test files deployed
-		correlator = CorrelatorHelper(self, name='c8y-correlator')              
-		correlator.start(logfile='c8y-correlator.log', config=project.deployedDir())
+		# Test mon files from Input directory to inject to correlator
+		inputFiles = [inputFile for inputFile in sorted(os.listdir(self.input)) if os.path.splitext(inputFile)[1] == '.mon']
 
-		# Wait for our EPL App test subjects to be added
-		correlator.flush()
+		shards = max(1, min(self._getIntProperty('localCorrelatorShards', 1), len(inputFiles)))
+		if shards == 1:
+			self._runTestFiles(None, self.log, deployedDir, 'c8y-correlator', 'c8y-correlator.log', inputFiles, pause=True)
+			return
+
+		# Run a shard of the test files in each correlator concurrently, then merge their logs so that they are validated together
+		self.log.info(f'Running {len(inputFiles)} test case(s) in {shards} local correlators')
+		threads = [self.startBackgroundThread(f'c8y-correlator-{shard+1}', self._runTestFiles, {
+					'deployedDir': deployedDir, 'name': f'c8y-correlator-{shard+1}', 'logfile': f'c8y-correlator-{shard+1}.log',
+					'inputFiles': inputFiles[shard::shards]}) for shard in range(shards)]
+		# Each shard waits for its correlator to connect and then for each of its test files in turn
+		timeout = (len(inputFiles[0::shards]) + 1) * TIMEOUTS['WaitForSignal']
+		deadline = time.time() + timeout
+		for thread in threads:
+			thread.join(timeout=max(deadline - time.time(), 0), abortOnError=False)
+		unfinished = [thread for thread in threads if thread.is_alive()]
+		for thread in unfinished:
+			thread.stop()
+		if unfinished:
+			# The merged log is still written for diagnosing the problem, but it is incomplete so the test must not pass
+			self.addOutcome(TIMEDOUT, f'{len(unfinished)} of {shards} local correlator shards did not complete within {timeout} seconds',
+				abortOnError=False)
+		with open(os.path.join(self.output, 'c8y-correlator.log'), 'w', encoding='utf8') as merged:
+			for shard in range(shards):
+				name = f'c8y-correlator-{shard+1}'
+				with open(os.path.join(self.output, f'{name}.log'), encoding='utf8', errors='replace') as f:
+					for line in f:
+						merged.write(f'[{name}] {line}')
+
+	def _runTestFiles(self, stopping, log, deployedDir, name, logfile, inputFiles, pause=False):
+		"""
+			Runs test files in a new local correlator connected to Cumulocity.
+
+			:param stopping: The event set when a background thread running this method should stop, or `None`.
+			:param log: The logger to use.
+			:param str deployedDir: The directory of the deployed test project.
+			:param str name: The name of the correlator.
+			:param str logfile: The name of the correlator log file.
+			:param list[str] inputFiles: The names of the test mon files in the Input directory to inject one after another.
+			:param bool pause: Pause after the correlator connects to Cumulocity if the `pauseDuringTest` option is set.
+		"""
+		from apama.correlator import CorrelatorHelper
+		if self.getBoolProperty('reuseLocalCorrelators'):
+			# Lease a correlator that is already connected to C8Y with the same project deployed, and log to this test's output
+			warm = getWarmCorrelatorPool().lease(self.testProjectKey, deployedDir, self.project.APAMA_HOME, log, TIMEOUTS['WaitForSignal'])
+			correlator = CorrelatorHelper(self, port=warm.port, host=warm.host, name=name)
+			self.addCleanupFunction(lambda: self._releaseWarmCorrelator(warm, correlator, inputFiles))
+			correlator.manage(arguments=['-r', 'setLogFile', os.path.join(self.output, logfile)])
+			process = None
+		else:
+			# Run local correlator connected to C8Y with Apama EPL Apps and test files deployed
+			correlator = CorrelatorHelper(self, name=name)
+			correlator.start(logfile=logfile, config=deployedDir)
+			process = correlator
 
-		self.waitForGrep('c8y-correlator.log', expr="Connected to Cumulocity")
+			# Wait for our EPL App test subjects to be added
+			correlator.flush()
 
-		self._maybePauseDuringTest()
+			self.waitForGrep(logfile, expr="Connected to Cumulocity")
+
+		if pause:
+			self._maybePauseDuringTest()
 
-		# Inject test mon files from Input directory to correlator
-		inputFiles = os.listdir(self.input)
 		for inputFile in inputFiles:
-			# Check file is a .mon file before injecting
-			if os.path.splitext(inputFile)[1] == '.mon':
-				self.log.info(f"Injecting {inputFile} test case")
-				correlator.injectEPL(inputFile, self.input)
-				# Wait for test to complete
-				correlator.flush()
-				activeTestMonitors = self.getMonitorsFromInjectedFile(correlator, os.path.join(self.input, inputFile))
-				for monitor in activeTestMonitors:
-					self.waitForGrep('c8y-correlator.log', expr=f"Removed monitor {monitor}", process=correlator)
+			if stopping is not None and stopping.is_set(): return
+			log.info(f"Injecting {inputFile} test case")
+			correlator.injectEPL(inputFile, self.input)
+			# Wait for test to complete
+			correlator.flush()
+			self.waitForInjectedMonitors(correlator, [os.path.join(self.input, inputFile)], process=process)
+
+	def _releaseWarmCorrelator(self, warm, correlator, inputFiles):
+		"""
+			Returns a leased warm correlator to the pool when the test is cleaned up.
+
+			The correlator is only reused by other tests if the test did not fail, no monitors from the test files are still
+			running, and the EPL apps under test could be reset, otherwise it is stopped.
+
+			:param warm: The leased correlator.
+			:type warm: :class:`~apamax.eplapplications.correlatorpool.WarmCorrelator`
+			:param correlator: The `CorrelatorHelper` used to access the leased correlator.
+			:param list[str] inputFiles: The names of the test mon files in the Input directory that may have been injected.
+		"""
+		reusable = self.getOutcome() not in FAILS
+		try:
+			if reusable and any(self.getMonitorsFromInjectedFile(correlator, os.path.join(self.input, inputFile)) for inputFile in inputFiles):
+				self.log.info('Test monitors are still running in the warm correlator')
+				reusable = False
+			if reusable:
+				reusable = self._resetEPLApps(correlator)
+			correlator.manage(arguments=['-r', 'setLogFile', warm.logfile])
+		except Exception as e:
+			self.log.info(f'Failed to reset warm correlator: {e}')
+			reusable = False
+		getWarmCorrelatorPool().release(warm, reusable, self.log)
+
+	def _resetEPLApps(self, correlator):
+		"""
+			Resets the state of the EPL apps under test in a correlator by deleting their monitors and injecting them again.
+
+			All apps are deleted before any is injected again, so that apps using types defined by other apps are injected again
+			after them, as they were when the project was deployed.
+
+			:param correlator: The `CorrelatorHelper` used to access the correlator.
+			:return: `True` if the apps were reset and the monitors that were running before are running again.
+			:rtype: bool
+		"""
+		eplApps = self.getTestSubjectEPLApps()
+		running = {eplApp: self._listMonitorsForHash(correlator, self._getFileHash(eplApp)) for eplApp in eplApps}
+		monitors = [monitor for eplApp in eplApps for monitor in running[eplApp]]
+		if monitors:
+			correlator.delete(names=monitors, force=True)
+		for eplApp in eplApps:
+			correlator.injectEPL(os.path.basename(eplApp), os.path.dirname(eplApp))
+		correlator.flush()
+		for eplApp in eplApps:
+			missing = set(running[eplApp]) - set(self._listMonitorsForHash(correlator, self._getFileHash(eplApp)))
+			if missing:
+				self.log.info(f'Monitors of {os.path.basename(eplApp)} are not running after resetting the warm correlator: {", ".join(sorted(missing))}')
+				return False
+		return True
+
+	def _deployTestProject(self, name):
+		"""
+			Creates and deploys a test project containing the EPL apps being tested and the properties to connect to Cumulocity.
+
+			Deployed projects are cached for the rest of the test run, keyed by a hash of the Apama installation, bundles,
+			properties and EPL apps of the project. If a project with the same inputs has already been deployed by another test,
+			a copy of the cached deployed directory is made in the output directory instead of deploying the project again.
+			The cache is kept in a directory of its own, so correlators writing to their deployed directory do not affect it.
+			Set the `cacheLocalTestProjects` project property to `false` to disable the cache. The cache is not used by tests that
+			override `createProject`, `addC8YPropertiesToProject` or `addEPLAppsToProject`, since their projects can differ.
+			For such tests, the key used to share warm correlators is a hash of the deployed directory, so they only reuse
+			correlators running an identical project.
+
+			:param str name: The name of the project.
+			:return: The path of the deployed project directory.
+			:rtype: str
+		"""
+		eplApps = self.getTestSubjectEPLApps()
+		propertyFiles = self._getC8YProperties()
+		useCache = getattr(self.project, 'cacheLocalTestProjects', 'true').lower() != 'false'
+		overridden = [m for m in PROJECT_CREATION_METHODS if getattr(type(self), m) is not getattr(LocalCorrelatorSimpleTest, m)]
+		if useCache and overridden:
+			self.log.debug(f'Not caching the deployed test project since the test overrides {", ".join(overridden)}')
+			useCache = False
+
+		key = hashlib.sha256()
+		key.update(json.dumps([self.project.APAMA_HOME, self._getProjectBundles(), propertyFiles], sort_keys=True).encode('utf8'))
+		for eplApp in eplApps:
+			key.update(os.path.basename(eplApp).encode('utf8'))
+			with open(eplApp, 'rb') as f:
+				key.update(hashlib.sha256(f.read()).digest())
+		key = key.hexdigest()
+		self.testProjectKey = key
+
+		with _deployedProjectCacheLock:
+			cachedDir = _deployedProjectCache.get(key) if useCache else None
+		if cachedDir and os.path.isdir(cachedDir):
+			deployedDir = os.path.join(self.output, f'{name}_deployed')
+			self.log.info(f'Reusing deployed test project from {cachedDir}')
+			# Copy rather than link the files, since the correlator may write to its deployed directory
+			shutil.copytree(cachedDir, deployedDir)
+			return deployedDir
+
+		project = self.createProject(name)
+		self.addC8YPropertiesToProject(project)
+		self.addEPLAppsToProject(eplApps, project)
+		project.deploy()
+		if overridden:
+			self.testProjectKey = self._hashDeployedProject(key, project.deployedDir())
+		if useCache:
+			self._cacheDeployedProject(key, project.deployedDir())
+		return project.deployedDir()
+
+	def _hashDeployedProject(self, key, deployedDir):
+		"""
+			Creates a key for a deployed project from the names and contents of all its files, before any correlator has used it.
+
+			:param str key: The key of the inputs of the project.
+			:param str deployedDir: The deployed directory of the project.
+			:return: The key of the deployed project.
+			:rtype: str
+		"""
+		digest = hashlib.sha256(key.encode('utf8'))
+		for root, dirs, files in os.walk(deployedDir):
+			dirs.sort()
+			for file in sorted(files):
+				path = os.path.join(root, file)
+				digest.update(os.path.relpath(path, deployedDir).replace(os.sep, '/').encode('utf8'))
+				with open(path, 'rb') as f:
+					digest.update(hashlib.sha256(f.read()).digest())
+		return digest.hexdigest()
+
+	def _cacheDeployedProject(self, key, deployedDir):
+		"""
+			Copies a deployed project into the cache directory of the test run, before any correlator has used it.
+
+			:param str key: The key of the project.
+			:param str deployedDir: The deployed directory of the project.
+		"""
+		global _deployedProjectCacheDir
+		with _deployedProjectCacheLock:
+			if _deployedProjectCacheDir is None:
+				_deployedProjectCacheDir = tempfile.mkdtemp(prefix='pysys-deployed-projects-')
+				atexit.register(shutil.rmtree, _deployedProjectCacheDir, ignore_errors=True)
+		cachedDir = os.path.join(_deployedProjectCacheDir, key)
+		try:
+			# Copy to a temporary directory first, so that other tests never see a partial copy
+			copyDir = tempfile.mkdtemp(dir=_deployedProjectCacheDir)
+			shutil.copytree(deployedDir, os.path.join(copyDir, 'deployed'))
+			with _deployedProjectCacheLock:
+				if key not in _deployedProjectCache:
+					os.rename(os.path.join(copyDir, 'deployed'), cachedDir)
+					_deployedProjectCache[key] = cachedDir
+			shutil.rmtree(copyDir, ignore_errors=True)
+		except OSError as ex:
+			self.log.info(f'Failed to cache deployed test project: {ex}')
 
 	def validate(self):
 		"""
@@ -538,33 +1400,108 @@ class LocalCorrelatorSimpleTest(ApamaC8YBaseTest):
 			using a GET request to http://correlator.host:correlator.port.
 		"""
 		monitors = []
-		url = f'http://{correlator.host}:{correlator.port}'
 		try:
-			with open(file, 'rb') as f:
-				filehash = hashlib.md5(f.read()).hexdigest()
-				# GET request to http://correlator.host:correlator.port to retrieve active monitors
-				req = urllib.request.Request(f'{url}/correlator/code/hash/list/{filehash}')
-				with urllib.request.urlopen(req) as resp:
-					xmlstring = str(resp.read(), 'utf-8')
-					# Paring xml string to get the names of active monitors
-					tree = ET.ElementTree(ET.fromstring(xmlstring))
-					for mapItem in tree.getroot().iter('map'):
-						isMon = False
-						for prop in mapItem.iter('prop'):
-							if prop.get('name') == 'type' and prop.text == "monitor":
-								isMon = True
-								continue # 'name' property follows after 'type' property
-							if isMon and prop.get('name') == 'name':
-								if prop.text not in monitors:
-									monitors.append(prop.text)
-								isMon = False
-		except urllib.error.HTTPError as err:
-			pass # it's OK if there aren't any monitors listed, or the hash can't be found, just means its already completed
+			monitors = self._listMonitorsForHash(correlator, self._getFileHash(file))
 		except Exception as err:
 			self.abort(BLOCKED, 'Error retrieving injected monitors: ' + str(err))
 		finally:
 			return monitors
 
+	def waitForInjectedMonitors(self, correlator, files, timeout=TIMEOUTS['WaitForSignal'], process=None):
+		"""
+			Waits until all monitors injected into a correlator from the specified mon files have terminated.
+
+			A single poller queries the correlator's code listing for each file that still has active monitors, with an increasing
+			interval between polls, until no monitors remain.
+
+			For example::
+
+				correlator.injectEPL(['Test1.mon', 'Test2.mon'], self.input)
+				self.waitForInjectedMonitors(correlator, [os.path.join(self.input, f) for f in ['Test1.mon', 'Test2.mon']])
+
+			:param correlator: The `CorrelatorHelper` of the correlator.
+			:param list[str] files: The paths of the injected mon files.
+			:param float timeout: The maximum time (in seconds) to wait for the next monitor to terminate. The test outcome is set to TIMEDOUT if this expires.
+			:param process: The correlator process. The test is aborted if the process is no longer running.
+		"""
+		outstanding = {}
+		for file in files:
+			try:
+				outstanding[self._getFileHash(file)] = file
+			except Exception as err:
+				self.abort(BLOCKED, 'Error retrieving injected monitors: ' + str(err))
+
+		remaining = set()
+		lastProgress = time.time()
+		delay = MONITOR_POLL_INITIAL_INTERVAL
+		while outstanding:
+			monitors = set()
+			for filehash, file in list(outstanding.items()):
+				try:
+					fileMonitors = self._listMonitorsForHash(correlator, filehash)
+				except Exception as err:
+					if process is not None and not process.running():
+						self.abort(BLOCKED, f'Correlator {process} is no longer running while waiting for monitors from {os.path.basename(file)}')
+					self.abort(BLOCKED, 'Error retrieving injected monitors: ' + str(err))
+				if fileMonitors:
+					monitors.update(fileMonitors)
+				else:
+					del outstanding[filehash]
+			if monitors != remaining:
+				for monitor in sorted(remaining - monitors):
+					self.log.info(f'Monitor {monitor} terminated')
+				remaining = monitors
+				lastProgress = time.time()
+				delay = MONITOR_POLL_INITIAL_INTERVAL
+			if not outstanding: break
+			if time.time() - lastProgress > timeout:
+				self.addOutcome(TIMEDOUT, f'Timed out waiting for monitors to terminate after {timeout} seconds: {", ".join(sorted(remaining))}', abortOnError=self.defaultAbortOnError)
+				return
+			time.sleep(delay)
+			delay = min(delay * 2, MONITOR_POLL_MAX_INTERVAL)
+
+	def _getFileHash(self, file):
+		"""
+			Gets the hash the correlator uses to identify code injected from a file.
+
+			:param str file: The path of the injected file.
+			:rtype: str
+		"""
+		with open(file, 'rb') as f:
+			return hashlib.md5(f.read()).hexdigest()
+
+	def _listMonitorsForHash(self, correlator, filehash):
+		"""
+			Lists the active monitors injected from a file, using a GET request to http://correlator.host:correlator.port.
+
+			:param correlator: The `CorrelatorHelper` of the correlator.
+			:param str filehash: The hash of the injected file.
+			:return: The names of the active monitors. The list is empty if all monitors from the file have terminated.
+			:rtype: list[str]
+		"""
+		monitors = []
+		url = f'http://{correlator.host}:{correlator.port}'
+		try:
+			# GET request to http://correlator.host:correlator.port to retrieve active monitors
+			req = urllib.request.Request(f'{url}/correlator/code/hash/list/{filehash}')
+			with urllib.request.urlopen(req) as resp:
+				xmlstring = str(resp.read(), 'utf-8')
+		except urllib.error.HTTPError as err:
+			return monitors # it's OK if there aren't any monitors listed, or the hash can't be found, just means its already completed
+		# Paring xml string to get the names of active monitors
+		tree = ET.ElementTree(ET.fromstring(xmlstring))
+		for mapItem in tree.getroot().iter('map'):
+			isMon = False
+			for prop in mapItem.iter('prop'):
+				if prop.get('name') == 'type' and prop.text == "monitor":
+					isMon = True
+					continue # 'name' property follows after 'type' property
+				if isMon and prop.get('name') == 'name':
+					if prop.text not in monitors:
+						monitors.append(prop.text)
+					isMon = False
+		return monitors
+
 class EPLAppsSimpleTest(ApamaC8YBaseTest):
 	"""
 		Base test for running test with no pysystest.py on EPL apps running in Cumulocity.
@@ -576,6 +1513,7 @@ class EPLAppsSimpleTest(ApamaC8YBaseTest):
 		self.tests = None
 		self.apps = None
 		self.eplapps = None
+		self.testStatus = None
 		self.addCleanupFunction(lambda: self.shutdown())
 		self.EPL_TEST_APP_PREFIX = self.EPL_APP_PREFIX + "TEST_"
 
@@ -617,6 +1555,10 @@ class EPLAppsSimpleTest(ApamaC8YBaseTest):
 		if len(testPaths) > 0:
 			self.log.info(f"Uploading {len(testPaths)} test case(s) from {self.input}")
 
+		if self.getBoolProperty('runEPLTestsInParallel'):
+			self._executeTestsInParallel()
+			return
+
 		for (name, path) in self.tests:
 			# deploy the test and wait for it to start
 			self.eplapps.deploy(path, name=name, description='Test case, injected by test framework', redeploy=True)
@@ -624,13 +1566,88 @@ class EPLAppsSimpleTest(ApamaC8YBaseTest):
 
 			# wait until the test completes
 			self.waitForGrep(self.platform.getApamaLogFile(), expr='Removed monitor eplfiles.'+name)
-		
+
+	def _executeTestsInParallel(self):
+		"""
+			Deploys all test cases concurrently and waits for them to complete.
+
+			Enabled by setting the `runEPLTestsInParallel` project property (or the `-XrunEPLTestsInParallel` option) to `true`.
+			Only use this if the test cases are independent of each other. The Apama log file is scanned once for
+			the start and completion of every test case. Each test case must complete within `eplTestTimeout` seconds
+			(a project property, defaults to the PySys `WaitForSignal` timeout) of starting. Errors logged by a test case are
+			reported against that test case by `validate`. Only lines logged after the test cases started being deployed are
+			scanned, so errors logged earlier, for example while the apps under test were injected, are not attributed to them.
+		"""
+		timeout = float(getattr(self.project, 'eplTestTimeout', TIMEOUTS['WaitForSignal']))
+		maxWorkers = int(getattr(self.project, 'eplTestDeploymentConcurrency', DEFAULT_MAX_WORKERS))
+		self.testStatus = {name: {'state': 'deploying', 'time': time.time(), 'errors': []} for (name, _) in self.tests}
+
+		# Only scan what is logged from now on
+		logFile = self.platform.getApamaLogFile()
+		position = os.path.getsize(logFile) if os.path.exists(logFile) else 0
+
+		outcome = runConcurrently(lambda test: self.eplapps.deploy(test[1], name=test[0], description='Test case, injected by test framework', redeploy=True),
+						self.tests, description='test case deployments', maxWorkers=maxWorkers, retries=2, log=self.log)
+		for o in outcome.getFailed():
+			self.testStatus[o.item[0]]['state'] = 'failed to deploy'
+			self.addOutcome(BLOCKED, f'Failed to deploy test case {o.item[0]}: {o.error}', abortOnError=False)
+
+		addedExpr = re.compile(r'Added monitor eplfiles\.([^\s.:\[\]]+)')
+		removedExpr = re.compile(r'Removed monitor eplfiles\.([^\s.:\[\]]+)')
+		injectionErrorExpr = re.compile(r'Error injecting monitorscript from file ([^\s.:\[\]]+)')
+		errorExpr = re.compile(r' (ERROR|FATAL) .* eplfiles\.([^\s.:\[\]]+)')
+
+		def running():
+			return [name for name, status in self.testStatus.items() if status['state'] in ['deploying', 'running']]
+
+		pending = ''
+		while running():
+			if os.path.exists(logFile):
+				with open(logFile, encoding='utf8', errors='replace') as f:
+					f.seek(position)
+					pending += f.read()
+					position = f.tell()
+			lines = pending.split('\n')
+			pending = lines.pop()
+			for line in lines:
+				for expr, state in [(addedExpr, 'running'), (removedExpr, 'completed'), (injectionErrorExpr, 'failed to inject')]:
+					m = expr.search(line)
+					status = self.testStatus.get(m.group(1)) if m else None
+					if status and status['state'] in ['deploying', 'running']:
+						status['state'] = state
+						status['time'] = time.time()
+				m = errorExpr.search(line)
+				if m and m.group(2) in self.testStatus:
+					self.testStatus[m.group(2)]['errors'].append(line.strip())
+
+			now = time.time()
+			for name in running():
+				status = self.testStatus[name]
+				if now - status['time'] > timeout:
+					self.addOutcome(TIMEDOUT, f'Test case {name} did not {"complete" if status["state"] == "running" else "start"} within {timeout} seconds', abortOnError=False)
+					status['state'] = 'timed out'
+			if running():
+				self.pollWait(0.5)
+
+		states = collections.Counter(status['state'] for status in self.testStatus.values())
+		self.log.info('Test case results: ' + ', '.join(f'{count} {state}' for state, count in sorted(states.items())))
+
 	def validate(self):
 		"""
 			Ensures that no tests failed.
 		"""
 		self.log.info("Checking for errors")
-		self.assertGrep(self.platform.getApamaLogFile(), expr=r' (ERROR|FATAL) .* eplfiles\.', contains=False)
+		if self.testStatus is None:
+			self.assertGrep(self.platform.getApamaLogFile(), expr=r' (ERROR|FATAL) .* eplfiles\.', contains=False)
+			return
+
+		# Report errors against the test case that logged them, and check that no other EPL app logged errors
+		for name, status in self.testStatus.items():
+			if status['state'] == 'failed to inject':
+				self.addOutcome(FAILED, f'Error injecting test case {name}', abortOnError=False)
+			for error in status['errors'][:10]:
+				self.addOutcome(FAILED, f'Test case {name} logged: {error}', abortOnError=False)
+		self.assertGrep(self.platform.getApamaLogFile(), expr=r' (ERROR|FATAL) .* eplfiles\.(?!' + re.escape(self.EPL_TEST_APP_PREFIX) + ')', contains=False)
 		
 	def shutdown(self):
 		"""
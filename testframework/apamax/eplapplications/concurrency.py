@@ -0,0 +1,296 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import time, math, threading, statistics
+import concurrent.futures
+import urllib.error
+
+# Default number of requests that are performed concurrently against Cumulocity.
+DEFAULT_MAX_WORKERS = 10
+
+class TaskOutcome(object):
+	"""
+	The outcome of a single task performed by :func:`runConcurrently`.
+
+	:ivar item: The item the task was performed for.
+	:ivar int index: The position of the item in the input.
+	:ivar result: The value returned by the task, if it succeeded.
+	:ivar error: The exception raised by the task, if it failed.
+	:ivar float startTime: The epoch time the task was started at, or `None` if it was never started.
+	:ivar float duration: The time (in seconds) taken by the task, including any retries.
+	:ivar int attempts: The number of times the task was attempted.
+	"""
+
+	def __init__(self, item, index):
+		self.item = item
+		self.index = index
+		self.result = None
+		self.error = None
+		self.startTime = None
+		self.duration = None
+		self.attempts = 0
+
+	def isSuccess(self):
+		"""
+		Check if the task completed successfully.
+
+		:return: `True` if the task completed without an error, `False` otherwise.
+		:rtype: bool
+		"""
+		return self.startTime is not None and self.duration is not None and self.error is None
+
+class BulkOutcome(object):
+	"""
+	The combined outcome of tasks performed by :func:`runConcurrently`.
+
+	:ivar str description: A description of the tasks used for logging.
+	:ivar list[TaskOutcome] outcomes: The outcome of each task, in the order of the input items.
+	:ivar float startTime: The epoch time the first task was started at.
+	:ivar float duration: The total time (in seconds) taken to perform all tasks.
+	:ivar bool timedOut: `True` if the deadline expired before all tasks completed.
+	"""
+
+	def __init__(self, description):
+		self.description = description
+		self.outcomes = []
+		self.startTime = None
+		self.duration = 0.0
+		self.timedOut = False
+
+	def getResults(self):
+		"""
+		Get the results of all tasks in the order of the input items. The result is `None` for failed tasks.
+
+		:return: List of results.
+		:rtype: list
+		"""
+		return [o.result for o in self.outcomes]
+
+	def getSucceeded(self):
+		"""
+		Get the outcomes of the tasks that completed successfully.
+
+		:rtype: list[TaskOutcome]
+		"""
+		return [o for o in self.outcomes if o.isSuccess()]
+
+	def getFailed(self):
+		"""
+		Get the outcomes of the tasks that failed, or that did not complete before the deadline.
+
+		:rtype: list[TaskOutcome]
+		"""
+		return [o for o in self.outcomes if not o.isSuccess()]
+
+	def getThroughput(self):
+		"""
+		Get the number of tasks completed successfully per second.
+
+		:rtype: float
+		"""
+		if self.duration <= 0: return 0.0
+		return len(self.getSucceeded()) / self.duration
+
+	def getStatistics(self):
+		"""
+		Get a summary of the outcome suitable for logging or for including in a performance report.
+
+		:return: A dictionary containing the number of tasks, the number of failures, the total duration, the throughput and latency statistics of tasks.
+		:rtype: dict
+		"""
+		latencies = sorted(o.duration for o in self.getSucceeded())
+		stats = {
+			'count': len(self.outcomes),
+			'succeeded': len(latencies),
+			'failed': len(self.outcomes) - len(latencies),
+			'duration': self.duration,
+			'throughput': self.getThroughput(),
+		}
+		if latencies:
+			stats['mean_latency'] = statistics.mean(latencies)
+			stats['90th_percentile_latency'] = latencies[int(math.ceil(len(latencies) * 0.9)) - 1]
+			stats['max_latency'] = latencies[-1]
+		return stats
+
+	def raiseIfFailed(self):
+		"""
+		Raise an exception describing the failed tasks, if any task failed.
+		"""
+		failed = self.getFailed()
+		if failed:
+			errors = '\n'.join(f'  {o.item}: {o.error}' for o in failed[:10])
+			more = f'\n  ... and {len(failed) - 10} more' if len(failed) > 10 else ''
+			raise Exception(f'Failed {len(failed)} of {len(self.outcomes)} {self.description}:\n{errors}{more}')
+
+class RateLimiter(object):
+	"""
+	Limits the rate at which tasks are started across multiple threads.
+
+	:param float maxRate: The maximum number of tasks started per second.
+	"""
+
+	def __init__(self, maxRate):
+		self.interval = 1.0 / float(maxRate)
+		self.nextTime = time.time()
+		self.lock = threading.Lock()
+
+	def acquire(self):
+		""" Block until the next task can be started. """
+		with self.lock:
+			now = time.time()
+			waitTime = self.nextTime - now
+			self.nextTime = max(now, self.nextTime) + self.interval
+		if waitTime > 0:
+			time.sleep(waitTime)
+
+def isTransientError(error):
+	"""
+	Check if the error raised by a REST request is likely to be transient and worth retrying.
+
+	An error raised from another error, for example to add a description of the failed request, is checked by its cause.
+
+	:param Exception error: The error.
+	:return: `True` for 5XX HTTP errors, connection failures and timeouts, `False` otherwise.
+	:rtype: bool
+	"""
+	if isinstance(error, urllib.error.HTTPError):
+		return error.code // 100 == 5 or error.code == 429
+	if isinstance(error, (urllib.error.URLError, ConnectionError, TimeoutError)):
+		return True
+	return error.__cause__ is not None and isTransientError(error.__cause__)
+
+def runConcurrently(func, items, description='tasks', maxWorkers=DEFAULT_MAX_WORKERS, maxRate=None, timeout=None,
+		retries=0, retryDelay=0.5, isRetryable=isTransientError, log=None, progressInterval=None):
+	"""
+	Call a function for each item using a bounded pool of worker threads.
+
+	Items are consumed lazily from the iterable, so it can be a generator that is still producing items (for example,
+	from a paged REST query) while earlier items are being processed.
+
+	For example::
+
+		outcome = runConcurrently(lambda deviceId: connection.request('DELETE', f'/inventory/managedObjects/{deviceId}'),
+						deviceIds, description='device deletions', maxWorkers=20, timeout=300)
+		outcome.raiseIfFailed()
+
+	:param func: The function to call with each item.
+	:param items: The items to process.
+	:type items: iterable
+	:param str description: The description of the tasks used for logging.
+	:param int maxWorkers: The maximum number of tasks to run concurrently.
+	:param maxRate: The maximum number of tasks to start per second. There is no limit if not specified.
+	:type maxRate: float, optional
+	:param timeout: The time (in seconds) after which no further tasks are started and the call returns without
+		waiting for tasks still in progress. Those tasks keep running in the background until they complete, so tasks
+		that make several requests should check the deadline between them. Their outcome is reported as timed out, and
+		is not changed when they complete later. There is no deadline if not specified.
+	:type timeout: float, optional
+	:param int retries: The number of times to retry a task that failed with an error accepted by `isRetryable`.
+	:param float retryDelay: The initial delay (in seconds) before retrying a task. The delay is doubled for each retry.
+	:param isRetryable: A function that checks if an error is worth retrying.
+	:param log: The logger to use for logging progress. Nothing is logged if not specified.
+	:param progressInterval: The interval (in seconds) between progress log messages. Progress is not logged if not specified.
+	:type progressInterval: float, optional
+	:return: The outcome of all tasks.
+	:rtype: :class:`BulkOutcome`
+	"""
+	bulk = BulkOutcome(description)
+	limiter = RateLimiter(maxRate) if maxRate else None
+	startTime = time.time()
+	deadline = (startTime + timeout) if timeout is not None else None
+	bulk.startTime = startTime
+	completed = [0]
+	finalised = [False]	# set once the outcome is returned, after which tasks still running must not change it
+	lock = threading.Lock()
+
+	def timeLeft():
+		return (deadline - time.time()) if deadline is not None else None
+
+	def perform(outcome):
+		if limiter: limiter.acquire()
+		if deadline is not None and time.time() >= deadline:
+			with lock:
+				if not finalised[0]:
+					outcome.error = TimeoutError(f'Not started before the deadline of {timeout} seconds')
+			return outcome
+		# Record the outcome locally and only publish it if the caller has not been given the bulk outcome yet
+		taskStartTime = time.time()
+		result, error, attempts = None, None, 0
+		delay = retryDelay
+		while True:
+			attempts += 1
+			try:
+				result = func(outcome.item)
+				error = None
+				break
+			except Exception as ex:
+				error = ex
+				if attempts > retries or not isRetryable(ex): break
+				if deadline is not None and time.time() + delay >= deadline: break
+				time.sleep(delay)
+				delay *= 2
+		with lock:
+			if finalised[0]: return outcome
+			outcome.startTime = taskStartTime
+			outcome.result, outcome.error, outcome.attempts = result, error, attempts
+			outcome.duration = time.time() - taskStartTime
+			completed[0] += 1
+		return outcome
+
+	executor = concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers)
+	pending = set()
+	lastLogged = startTime
+	try:
+		def drain(returnWhen):
+			nonlocal pending, lastLogged
+			if not pending: return
+			left = timeLeft()
+			done, pending = concurrent.futures.wait(pending, timeout=max(left, 0) if left is not None else None, return_when=returnWhen)
+			if not done and left is not None and left <= 0:
+				bulk.timedOut = True
+			if log and progressInterval and time.time() - lastLogged >= progressInterval:
+				elapsed = time.time() - startTime
+				log.info(f'Completed {completed[0]} of {len(bulk.outcomes)} {description} so far ({completed[0]/elapsed:.1f}/s)')
+				lastLogged = time.time()
+
+		for index, item in enumerate(items):
+			if bulk.timedOut or (deadline is not None and time.time() >= deadline):
+				bulk.timedOut = True
+				break
+			outcome = TaskOutcome(item, index)
+			bulk.outcomes.append(outcome)
+			pending.add(executor.submit(perform, outcome))
+			# Keep a bounded number of tasks queued so that items are consumed lazily
+			while len(pending) >= 2 * maxWorkers and not bulk.timedOut:
+				drain(concurrent.futures.FIRST_COMPLETED)
+
+		while pending and not bulk.timedOut:
+			drain(concurrent.futures.ALL_COMPLETED)
+	finally:
+		# Cancel the tasks that have not started. This is done explicitly rather than with the cancel_futures parameter
+		# of shutdown, which requires Python 3.9 or later.
+		for future in pending:
+			future.cancel()
+		# Do not wait for tasks still in progress if the deadline has expired
+		executor.shutdown(wait=not bulk.timedOut)
+
+	with lock:
+		finalised[0] = True
+	bulk.duration = time.time() - startTime
+	if bulk.timedOut:
+		for outcome in bulk.outcomes:
+			if outcome.duration is None and outcome.error is None:
+				outcome.error = TimeoutError(f'Did not complete before the deadline of {timeout} seconds')
+	if log and bulk.outcomes:
+		stats = bulk.getStatistics()
+		log.info(f"Completed {stats['succeeded']} of {stats['count']} {description} in {stats['duration']:.1f} seconds ({stats['throughput']:.1f}/s)" +
+			(f", {stats['failed']} failed" if stats['failed'] else '') + (' before the deadline expired' if bulk.timedOut else ''))
+	return bulk
@@ -0,0 +1,166 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import os, time, socket, subprocess, tempfile, threading, atexit
+
+# The line logged by a correlator once it has connected to Cumulocity
+CONNECTED_EXPR = 'Connected to Cumulocity'
+
+class WarmCorrelator(object):
+	"""
+	A local correlator connected to Cumulocity that is kept running across tests.
+
+	:ivar str key: The key of the deployed project the correlator was started from.
+	:ivar str host: The host the correlator is listening on.
+	:ivar int port: The port the correlator is listening on.
+	:ivar process: The correlator process.
+	:ivar str logfile: The path of the log file the correlator logs to while it is not leased.
+	:ivar int leases: The number of times the correlator has been leased.
+	"""
+
+	def __init__(self, key, port, process, logfile):
+		self.key = key
+		self.host = 'localhost'
+		self.port = port
+		self.process = process
+		self.logfile = logfile
+		self.leases = 0
+
+	def isRunning(self):
+		"""
+		Check if the correlator process is still running.
+
+		:rtype: bool
+		"""
+		return self.process.poll() is None
+
+	def __str__(self):
+		return f'correlator on port {self.port}'
+
+class WarmCorrelatorPool(object):
+	"""
+	A pool of local correlators connected to Cumulocity, shared by the tests of a test run.
+
+	Correlators are keyed by the deployed project they were started from, so a test only leases a correlator running the same
+	EPL apps with the same connection properties. Starting a correlator and connecting it to Cumulocity is done once,
+	rather than by every test. All correlators are stopped when the test run exits.
+
+	Use :func:`getWarmCorrelatorPool` to get the pool of the test run.
+	"""
+
+	def __init__(self):
+		self.idle = {}
+		self.correlators = []
+		self.lock = threading.Lock()
+		self.logDir = None
+		atexit.register(self.shutdown)
+
+	def lease(self, key, deployedDir, apamaHome, log, timeout):
+		"""
+		Lease a running correlator started from a deployed project, starting a new one if none is idle.
+
+		:param str key: The key identifying the contents of the deployed project.
+		:param str deployedDir: The directory of the deployed project.
+		:param str apamaHome: The Apama installation directory.
+		:param log: The `logger` instance to use for logging.
+		:param float timeout: The time (in seconds) to wait for a new correlator to connect to Cumulocity.
+		:return: The leased correlator.
+		:rtype: :class:`WarmCorrelator`
+		"""
+		with self.lock:
+			idle = self.idle.get(key, [])
+			while idle:
+				correlator = idle.pop()
+				if correlator.isRunning():
+					correlator.leases += 1
+					log.info(f'Reusing warm {correlator} (lease {correlator.leases})')
+					return correlator
+			if self.logDir is None:
+				self.logDir = tempfile.mkdtemp(prefix='pysys-warm-correlators-')
+
+		correlator = self._start(key, deployedDir, apamaHome, log, timeout)
+		correlator.leases += 1
+		return correlator
+
+	def release(self, correlator, reusable, log):
+		"""
+		Return a leased correlator to the pool, or stop it if it cannot be reused.
+
+		:param correlator: The leased correlator.
+		:type correlator: :class:`WarmCorrelator`
+		:param bool reusable: `False` if the state of the correlator may affect other tests.
+		:param log: The `logger` instance to use for logging.
+		"""
+		if reusable and correlator.isRunning():
+			with self.lock:
+				self.idle.setdefault(correlator.key, []).append(correlator)
+			return
+		log.info(f'Stopping warm {correlator} since it cannot be reused')
+		self._stop(correlator)
+
+	def shutdown(self):
+		""" Stop all correlators in the pool. """
+		with self.lock:
+			correlators, self.correlators, self.idle = self.correlators, [], {}
+		for correlator in correlators:
+			self._stop(correlator)
+
+	def _start(self, key, deployedDir, apamaHome, log, timeout):
+		"""
+			Start a correlator from a deployed project and wait for it to connect to Cumulocity.
+		"""
+		with socket.socket() as s:
+			s.bind(('localhost', 0))
+			port = s.getsockname()[1]
+		logfile = os.path.join(self.logDir, f'correlator-{port}.log')
+		log.info(f'Starting warm correlator on port {port}, logging to {logfile}')
+		with open(os.path.join(self.logDir, f'correlator-{port}.out'), 'w') as out:
+			process = subprocess.Popen([os.path.join(apamaHome, 'bin', 'correlator'), '--config', deployedDir, '--port', str(port), '--logfile', logfile],
+							stdout=out, stderr=subprocess.STDOUT, cwd=self.logDir)
+		correlator = WarmCorrelator(key, port, process, logfile)
+		with self.lock:
+			self.correlators.append(correlator)
+
+		deadline = time.time() + timeout
+		while time.time() < deadline:
+			if not correlator.isRunning():
+				raise Exception(f'Warm correlator on port {port} exited with code {process.returncode}, see {logfile}')
+			if os.path.exists(logfile):
+				with open(logfile, encoding='utf8', errors='replace') as f:
+					if CONNECTED_EXPR in f.read():
+						return correlator
+			time.sleep(0.5)
+		self._stop(correlator)
+		raise Exception(f'Warm correlator on port {port} did not connect to Cumulocity within {timeout} seconds, see {logfile}')
+
+	def _stop(self, correlator):
+		"""
+			Stop a correlator process.
+		"""
+		with self.lock:
+			if correlator in self.correlators:
+				self.correlators.remove(correlator)
+		if correlator.isRunning():
+			correlator.process.terminate()
+			try:
+				correlator.process.wait(timeout=30)
+			except subprocess.TimeoutExpired:
+				correlator.process.kill()
+
+_pool = WarmCorrelatorPool()
+
+def getWarmCorrelatorPool():
+	"""
+	Get the pool of warm correlators shared by all tests of the test run.
+
+	:rtype: :class:`WarmCorrelatorPool`
+	"""
+	return _pool
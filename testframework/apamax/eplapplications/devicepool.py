@@ -0,0 +1,170 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import json, urllib.parse
+from .concurrency import runConcurrently, DEFAULT_MAX_WORKERS
+
+# The fragment identifying devices that belong to a device pool
+POOL_FRAGMENT = 'pysys_TestDevicePool'
+
+# The number of objects to fetch per page when listing pooled devices and alarms
+PAGE_SIZE = 2000
+
+class TestDevicePool(object):
+	"""
+	A pool of test devices that are kept on Cumulocity across test variations, tests and test runs, rather than being
+	deleted and created again for every test.
+
+	Devices in a pool are identified by their name prefix and type. The devices are named by appending an index, starting
+	at 1, to the name prefix, so the first N devices of a pool are always the same devices. Pooled devices are not deleted
+	when a tenant is prepared, unless the `reuseTestDevices` project property is set to `false`.
+
+	Use :meth:`~apamax.eplapplications.basetest.ApamaC8YBaseTest.getTestDevicePool` to get a pool in a test.
+
+	:param tenant: The Cumulocity tenant.
+	:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+	:param log: The `logger` instance to use for logging.
+	:param str namePrefix: The name prefix of the devices, including the test device prefix. For example, `PYSYS_device`.
+	:param str type: The type of the devices.
+	"""
+
+	def __init__(self, tenant, log, namePrefix, type):
+		self.connection = tenant.getConnection()
+		self.log = log
+		self.namePrefix = namePrefix
+		self.type = type
+
+	def acquire(self, count, reset=True, maxWorkers=DEFAULT_MAX_WORKERS):
+		"""
+		Get the first devices of the pool, creating any that do not exist yet.
+
+		For example::
+
+			devices = self.getTestDevicePool().acquire(100)
+
+		:param int count: The number of devices to get.
+		:param bool reset: Clear active and acknowledged alarms raised for the devices and remove any child devices added to them.
+		:param int maxWorkers: The maximum number of requests to perform concurrently.
+		:return: The IDs of the devices, in the order of their index.
+		:rtype: list[str]
+		"""
+		existing = self._listDevices()
+		missing = [index for index in range(1, count + 1) if index not in existing]
+		reused = count - len(missing)
+		if missing:
+			outcome = runConcurrently(self._createDevice, missing, description=f'{self.namePrefix} pool devices created',
+							maxWorkers=maxWorkers, retries=2, log=self.log, progressInterval=10.0)
+			outcome.raiseIfFailed()
+			for index, id in zip(missing, outcome.getResults()):
+				existing[index] = {'id': id, 'childDevices': {'references': []}}
+		self.log.info(f'Acquired {count} devices from the {self.namePrefix} device pool ({reused} reused, {len(missing)} created)')
+
+		devices = [existing[index] for index in range(1, count + 1)]
+		if reset:
+			self._reset(devices, maxWorkers)
+		return [device['id'] for device in devices]
+
+	def resize(self, count, maxWorkers=DEFAULT_MAX_WORKERS):
+		"""
+		Grow or shrink the pool to the specified number of devices, creating missing devices and deleting devices beyond the count.
+
+		:param int count: The number of devices to keep in the pool.
+		:param int maxWorkers: The maximum number of requests to perform concurrently.
+		:return: The IDs of the devices in the pool, in the order of their index.
+		:rtype: list[str]
+		"""
+		ids = self.acquire(count, reset=False, maxWorkers=maxWorkers)
+		extra = [device['id'] for index, device in self._listDevices().items() if index > count]
+		if extra:
+			outcome = runConcurrently(lambda id: self.connection.request('DELETE', f'/inventory/managedObjects/{id}'), extra,
+							description=f'{self.namePrefix} pool devices deleted', maxWorkers=maxWorkers, retries=2, log=self.log)
+			outcome.raiseIfFailed()
+		return ids
+
+	def _listDevices(self):
+		"""
+			Get the devices currently in the pool. Devices with a duplicate index are deleted.
+
+			:return: Dictionary of device index to the device managed object.
+			:rtype: dict[int, dict]
+		"""
+		query = f"has({POOL_FRAGMENT}) and type eq '{self.type}' and name eq '{self.namePrefix}*'"
+		devices = {}
+		for device in self._iterCollection('/inventory/managedObjects', {'query': query}, 'managedObjects'):
+			info = device.get(POOL_FRAGMENT) or {}
+			if info.get('namePrefix') != self.namePrefix: continue
+			index = info.get('index')
+			if index in devices:
+				self.log.warn(f'Deleting duplicate device {device["id"]} for index {index} of the {self.namePrefix} device pool')
+				self.connection.request('DELETE', f'/inventory/managedObjects/{device["id"]}')
+				continue
+			devices[index] = device
+		return devices
+
+	def _createDevice(self, index):
+		"""
+			Create the device for an index of the pool.
+
+			:param int index: The index of the device.
+			:return: The ID of the device created.
+			:rtype: str
+		"""
+		device = {
+			'name': f'{self.namePrefix}{index}',
+			'c8y_IsDevice': True,
+			'type': self.type,
+			'com_cumulocity_model_Agent': {},
+			POOL_FRAGMENT: {'namePrefix': self.namePrefix, 'index': index},
+		}
+		return json.loads(self.connection.do_request_json('POST', '/inventory/managedObjects', device, useLocationHeaderPostResp=False))['id']
+
+	def _reset(self, devices, maxWorkers):
+		"""
+			Reset the state of devices so that they can be used by a new test.
+
+			Unresolved (active or acknowledged) alarms of the devices are cleared, with one bulk request per device, and child
+			devices are removed.
+
+			:param list[dict] devices: The device managed objects.
+			:param int maxWorkers: The maximum number of requests to perform concurrently.
+		"""
+		childLinks = [(device['id'], ref['managedObject']['id']) for device in devices
+						for ref in device.get('childDevices', {}).get('references', [])]
+
+		def resetDevice(task):
+			if task[0] == 'alarms':
+				# Acknowledged alarms must be cleared too, as a new alarm of the same type would be deduplicated into them
+				self.connection.do_request_json('PUT', f'/alarm/alarms?resolved=false&source={task[1]}', {'status': 'CLEARED'})
+			else:
+				self.connection.request('DELETE', f'/inventory/managedObjects/{task[1]}/childDevices/{task[2]}')
+
+		tasks = [('alarms', device['id']) for device in devices] + [('child', parent, child) for parent, child in childLinks]
+		if tasks:
+			self.log.info(f'Resetting {self.namePrefix} pool devices: clearing alarms of {len(devices)} devices and removing {len(childLinks)} child devices')
+			outcome = runConcurrently(resetDevice, tasks, description=f'{self.namePrefix} pool device resets', maxWorkers=maxWorkers, retries=2)
+			outcome.raiseIfFailed()
+
+	def _iterCollection(self, resourceUrl, queryParams, responseKey):
+		"""
+			Iterate over all objects of a Cumulocity collection, fetching one page at a time.
+
+			:param str resourceUrl: The base url of the collection. For example, /alarm/alarms.
+			:param dict[str,str] queryParams: The query parameters.
+			:param str responseKey: The key to use to get actual object list from the response JSON.
+			:return: Generator of objects.
+		"""
+		currentPage = 1
+		while True:
+			params = dict(queryParams, pageSize=PAGE_SIZE, currentPage=currentPage)
+			objects = self.connection.do_get(f'{resourceUrl}?{urllib.parse.urlencode(params)}')[responseKey]
+			yield from objects
+			if len(objects) < PAGE_SIZE: break
+			currentPage += 1
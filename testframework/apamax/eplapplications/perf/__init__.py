@@ -1 +1,4 @@
-from .basetest import ObjectCreator
\ No newline at end of file
+from .basetest import ObjectCreator
+from .loadprofile import LoadProfile
+
+__all__ = ['ObjectCreator', 'LoadProfile']
@@ -14,10 +14,13 @@ import urllib, urllib.error
 import sys, os, time, pathlib, glob
 import csv
 import math, statistics
+import copy
 from pysys.utils.linecount import linecount
 from apamax.eplapplications.basetest import ApamaC8YBaseTest
 from apamax.eplapplications.eplapps import EPLApps
-from apamax.eplapplications.smartrules import SmartRulesManager
+from apamax.eplapplications.smartrules import SmartRulesManager, SmartRule
+from apamax.eplapplications.concurrency import runConcurrently, DEFAULT_MAX_WORKERS
+from apamax.eplapplications.utctime import parseUTCTime
 
 # constants for performance metrics strings.
 PERF_TIMESTAMP = 'timestamp'
@@ -33,6 +36,21 @@ PERF_CEP_PROXY_REQ_STARTED = 'cep_proxy_requests_started'
 PERF_CEP_PROXY_REQ_COMPLETED = 'cep_proxy_requests_completed'
 PERF_CEP_PROXY_REQ_FAILED = 'cep_proxy_requests_failed'
 PERF_CPU_USAGE_MILLI = 'cpu_usage_milli'
+PERF_SIM_SEND_RATE = 'simulator_send_rate'
+PERF_SIM_TARGET_RATE = 'simulator_target_rate'
+PERF_SIM_LATENCY_P50 = 'simulator_request_latency_p50'
+PERF_SIM_LATENCY_P90 = 'simulator_request_latency_p90'
+PERF_SIM_LATENCY_P99 = 'simulator_request_latency_p99'
+PERF_SIM_SCHEDULE_LAG = 'simulator_schedule_lag'
+PERF_SIM_OBJECTS_SENT = 'simulator_objects_sent'
+PERF_SIM_RETRIES = 'simulator_request_retries'
+PERF_SIM_ERRORS = 'simulator_request_errors'
+
+# Metrics aggregated from the telemetry of all simulators. Values are only present once a simulator has reported telemetry.
+SIMULATOR_METRICS = [PERF_SIM_SEND_RATE, PERF_SIM_TARGET_RATE, PERF_SIM_LATENCY_P50, PERF_SIM_LATENCY_P90, PERF_SIM_LATENCY_P99, PERF_SIM_SCHEDULE_LAG]
+SIMULATOR_COUNTERS = [PERF_SIM_OBJECTS_SENT, PERF_SIM_RETRIES, PERF_SIM_ERRORS]
+
+PERF_END_TO_END_LATENCY = 'end_to_end_latency'
 
 # Description of metrics. Order is important as it determines the order of fields in the final HTML report table
 METRICS_DESCRIPTION = {
@@ -48,6 +66,16 @@ METRICS_DESCRIPTION = {
 	PERF_CEP_PROXY_REQ_STARTED: 'CEP Requests Started',
 	PERF_CEP_PROXY_REQ_COMPLETED: 'CEP Requests Completed',
 	PERF_CEP_PROXY_REQ_FAILED: 'CEP Requests Failed',
+	PERF_SIM_SEND_RATE: 'Simulator Send Rate (objects/sec)',
+	PERF_SIM_TARGET_RATE: 'Simulator Target Rate (objects/sec)',
+	PERF_SIM_LATENCY_P50: 'Simulator Request Latency p50 (ms)',
+	PERF_SIM_LATENCY_P90: 'Simulator Request Latency p90 (ms)',
+	PERF_SIM_LATENCY_P99: 'Simulator Request Latency p99 (ms)',
+	PERF_SIM_SCHEDULE_LAG: 'Simulator Schedule Lag (secs)',
+	PERF_SIM_OBJECTS_SENT: 'Objects Sent by Simulators',
+	PERF_SIM_RETRIES: 'Simulator Requests Retried',
+	PERF_SIM_ERRORS: 'Simulator Requests Failed',
+	PERF_END_TO_END_LATENCY: 'End-to-End Latency (ms)',
 }
 
 # constants for output files
@@ -56,6 +84,35 @@ OUTFILE_PERF_CPU_USAGE = 'perf_cpuusage'
 OUTFILE_PERF_STATS = 'perf_statistics'
 OUTFILE_PERF_COUNTERS = 'perf_counters'
 OUTFILE_ENV_DETAILS = 'env_details'
+OUTFILE_TEARDOWN_TIMINGS = 'teardown_timings'
+OUTFILE_TENANT_PREPARATION_TIMINGS = 'tenant_preparation_timings'
+OUTFILE_END_TO_END_LATENCY = 'end_to_end_latency'
+
+# The Cumulocity collections of outputs supported for end-to-end latency measurement: resource url and response key
+LATENCY_OUTPUT_COLLECTIONS = {
+	'alarms': ('/alarm/alarms', 'alarms'),
+	'events': ('/event/events', 'events'),
+	'operations': ('/devicecontrol/operations', 'operations'),
+}
+
+# Phases of preparing a tenant for a performance test
+PHASE_STOP_SIMULATORS = 'Stop simulators'
+PHASE_DELETE_EPL_APPS = 'Delete test EPL apps'
+PHASE_DELETE_SMART_RULES = 'Delete test smart rules'
+PHASE_CLEAR_ALARMS = 'Clear active alarms'
+PHASE_DELETE_DEVICES = 'Delete test devices'
+PREPARATION_PHASES = [PHASE_STOP_SIMULATORS, PHASE_DELETE_EPL_APPS, PHASE_DELETE_SMART_RULES, PHASE_CLEAR_ALARMS, PHASE_DELETE_DEVICES]
+# Phases in the same group are run concurrently. Groups are run in order.
+PREPARATION_PHASE_GROUPS = [
+	[PHASE_STOP_SIMULATORS, PHASE_DELETE_EPL_APPS, PHASE_DELETE_SMART_RULES],
+	[PHASE_CLEAR_ALARMS, PHASE_DELETE_DEVICES],
+]
+
+# Default time (in seconds) allowed for cleaning up tenants at the end of a test
+DEFAULT_TEARDOWN_TIMEOUT = 600.0
+
+# Maximum number of times to list and delete test smart rules when preparing a tenant
+MAX_SMART_RULE_CLEANUP_PASSES = 5
 
 class ObjectCreator:
 	"""
@@ -82,9 +139,106 @@ class ObjectCreator:
 			            }
 			        }
 			    }
+
+			If the creator declares a template by implementing :meth:`getTemplate`, this creates the object from the template
+			and the values returned by :meth:`createFields`, so it does not need to be implemented.
+		"""
+		template = self.getTemplate()
+		if template is None:
+			raise Exception('Not Implemeted')
+		return fillTemplate(template, self.createFields(device, time))
+
+	def getTemplate(self):
+		"""
+			Gets the template of all objects created by this creator, or `None` if objects are created by :meth:`createObject`.
+
+			The template is an object in which the values that change between objects are replaced by placeholders of the
+			form `@name@`. The simulator serializes the template once and only serializes the values returned by
+			:meth:`createFields` for each object, which uses significantly less CPU than creating and serializing each object.
+			A placeholder must be the whole value, not part of a string or a key.
+
+			:return: The template, or `None` if the creator does not use a template.
+
+			For example::
+
+			    # Declare the measurement shape once
+			    return {
+			        'time': '@time@',
+			        "type": 'my_measurement',
+			        "source": { "id": '@device@' },
+			        'my_fragment': {
+			            'my_series': {
+			                "value": '@value@'
+			            }
+			        }
+			    }
+		"""
+		return None
+
+	def createFields(self, device, time):
+		"""
+			Creates the values of the template placeholders for a new object. Only called if :meth:`getTemplate` returns a template.
+
+			:param str device: The ID of the device to create an object for.
+			:param str time: The source time to use for the object.
+			:return: Dictionary of placeholder name to value. Values must be strings, numbers, booleans or `None`.
+			:rtype: dict
+
+			For example::
+
+			    return {'time': time, 'device': device, 'value': random.uniform(0, 100)}
 		"""
 		raise Exception('Not Implemeted')
 
+	def createObjects(self, devices, times):
+		"""
+			Creates a batch of objects to publish.
+
+			The simulator calls this method rather than :meth:`createObject` for each object, so a creator can override it to
+			create the values for a whole batch at once. The default implementation calls :meth:`createObject` for each object.
+
+			:param list[str] devices: The ID of the device to create each object for.
+			:param list[str] times: The source time to use for each object.
+			:return: A list of new objects, one for each device. An entry may be `None` if no object should be published.
+			:rtype: list
+		"""
+		return [self.createObject(device, time) for device, time in zip(devices, times)]
+
+	def createFieldColumns(self, devices, times):
+		"""
+			Creates the values of the template placeholders for a batch of objects. Only called if :meth:`getTemplate` returns a template.
+
+			The simulator calls this method rather than :meth:`createFields` for each object, so a creator can override it to
+			create the values for a whole batch at once. The default implementation calls :meth:`createFields` for each object.
+
+			:param list[str] devices: The ID of the device to create each object for.
+			:param list[str] times: The source time to use for each object.
+			:return: Dictionary of placeholder name to the list of values for all objects, in the order of the devices.
+			:rtype: dict[str, list]
+
+			For example::
+
+			    return {'time': times, 'device': devices, 'value': [random.uniform(0, 100) for _ in devices]}
+		"""
+		rows = [self.createFields(device, time) for device, time in zip(devices, times)]
+		return {name: [row[name] for row in rows] for name in (rows[0] if rows else {})}
+
+def fillTemplate(template, fields):
+	"""
+		Creates an object from an object creator template by replacing the placeholders with their values.
+
+		:param template: The template, as returned by :meth:`ObjectCreator.getTemplate`.
+		:param dict fields: Dictionary of placeholder name to value.
+		:return: A new object.
+	"""
+	if isinstance(template, dict):
+		return {key: fillTemplate(value, fields) for key, value in template.items()}
+	if isinstance(template, list):
+		return [fillTemplate(value, fields) for value in template]
+	if isinstance(template, str) and len(template) > 2 and template[0] == '@' and template[-1] == '@':
+		return fields[template[1:-1]]
+	return template
+
 class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 	"""
 	Base class for performance tests for EPL apps and smart rules.
@@ -108,6 +262,8 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		self.perfMonitorThread = None 	# Current performance monitoring thread
 		self.perfMonitorCount = 0		# Number of time performance monitoring is started
 		self.simulators = {}			# All simulators per tenant
+		self.simulatorTelemetryFiles = []	# Telemetry files of all simulators
+		self.simulatorInputLogs = []		# Logs of the inputs marked for latency measurement by all simulators
 
 	def prepareTenant(self, restartMicroservice=False,tenant=None):
 		"""
@@ -122,20 +278,7 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		tenantId = (tenant or self.platform.getTenant()).getTenantId()
 		self.log.info(f'Preparing tenant {tenantId} to run performance test')
 
-		# Stop any running simulators
-		self._stopSimulators(tenantId)
-
-		# Delete existing EPL test apps
-		self._deleteTestEPLApps(tenant)
-		
-		# Clear all active alarms
-		self._clearActiveAlarms(tenant)
-		
-		# Delete devices that were created by tests
-		self._deleteTestDevices(tenant)
-		
-		# Delete all smartrules created by the tests
-		self._deleteTestSmartRules(tenant)
+		self._prepareTenantPhases(tenant)
 
 		# Stop monitoring thread
 		if self.perfMonitorThread:
@@ -148,6 +291,81 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		if restartMicroservice:
 			self._restartApamaMicroserviceImpl()
 
+	def prepareTenants(self, tenants, restartMicroservice=False, maxWorkers=DEFAULT_MAX_WORKERS, raiseOnFailure=True):
+		"""
+			Prepares multiple tenants concurrently for a performance test. See `prepareTenant` for details of how each tenant is prepared.
+
+			The time taken by each preparation phase of each tenant is logged and written to the tenant_preparation_timings.json
+			file in the output directory.
+
+			For example::
+
+				outcome = self.prepareTenants(self.platform.getSubscribedTenants(), maxWorkers=20, raiseOnFailure=False)
+				tenants = [o.item for o in outcome.getSucceeded()]
+
+			:param tenants: The Cumulocity tenants to prepare.
+			:type tenants: list[:class:`~apamax.eplapplications.tenant.CumulocityTenant`]
+			:param bool restartMicroservice: Restart the Apama-ctrl microservice once all tenants are prepared.
+			:param int maxWorkers: The maximum number of tenants to prepare concurrently.
+			:param bool raiseOnFailure: Raise an exception if any tenant failed to be prepared.
+			:return: The outcome of preparing each tenant. The result of each successful outcome is a dictionary of the time (in seconds) taken by each phase.
+			:rtype: :class:`~apamax.eplapplications.concurrency.BulkOutcome`
+		"""
+		tenants = list(tenants)
+		self.log.info(f'Preparing {len(tenants)} tenants to run performance test')
+		outcome = runConcurrently(self._prepareTenantPhases, tenants, description='tenant preparations', maxWorkers=maxWorkers, log=self.log)
+
+		timings = {}
+		for o in outcome.outcomes:
+			timings[o.item.getTenantId()] = o.result if o.isSuccess() else {'error': str(o.error)}
+		self.write_text(f'{OUTFILE_TENANT_PREPARATION_TIMINGS}.json', json.dumps(timings, indent=2), encoding='utf8')
+		for phase in PREPARATION_PHASES:
+			values = [o.result[phase] for o in outcome.getSucceeded() if phase in o.result]
+			if values:
+				self.log.info(f'Tenant preparation phase "{phase}" took {statistics.mean(values):.1f} seconds on average and {max(values):.1f} seconds at most')
+
+		# Stop monitoring thread. When testing against a multi-tenant microservice, all tenants are monitored at once so do not stop it.
+		if self.perfMonitorThread and not self.platform.isMultiTenantMicroservice():
+			self.perfMonitorThread.stop()
+			self.perfMonitorThread.join()
+
+		if restartMicroservice:
+			self._restartApamaMicroserviceImpl()
+
+		if raiseOnFailure:
+			outcome.raiseIfFailed()
+		return outcome
+
+	def _prepareTenantPhases(self, tenant=None):
+		"""
+			Performs the cleanup phases of preparing a tenant, running independent phases concurrently.
+
+			Simulators, EPL test apps and test smart rules are removed first so that they cannot raise alarms or
+			update devices while alarms are cleared and devices are deleted.
+
+			:param tenant: The Cumulocity tenant.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+			:return: The time (in seconds) taken by each phase.
+			:rtype: dict[str, float]
+		"""
+		tenantId = (tenant or self.platform.getTenant()).getTenantId()
+		phases = {
+			PHASE_STOP_SIMULATORS: lambda: self._stopSimulators(tenantId),
+			PHASE_DELETE_EPL_APPS: lambda: self._deleteTestEPLApps(tenant),
+			PHASE_DELETE_SMART_RULES: lambda: self._deleteTestSmartRules(tenant),
+			PHASE_CLEAR_ALARMS: lambda: self._clearActiveAlarms(tenant),
+			PHASE_DELETE_DEVICES: lambda: self._deleteTestDevices(tenant),
+		}
+		timings = {}
+		for group in PREPARATION_PHASE_GROUPS:
+			outcome = runConcurrently(lambda name: phases[name](), group, description=f'tenant {tenantId} preparation phases', maxWorkers=len(group))
+			for o in outcome.outcomes:
+				timings[o.item] = o.duration
+			failed = outcome.getFailed()
+			if failed:
+				raise Exception(f'Failed to prepare tenant {tenantId}: ' + '; '.join(f'{o.item}: {o.error}' for o in failed))
+		return timings
+
 	def _deleteMeasurements(self,tenant=None):
 		"""
 			Clears all measurements that we raised on teant as part of a pre-test tenant cleanup.
@@ -162,15 +380,39 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 	def _shutdown(self):
 		"""
 		Performs common cleanup during test shutdown, like stopping performance monitoring thread, deactivating EPL test apps, and generating final HTML report.
+
+		Work for multiple tenants is performed concurrently by up to `teardownConcurrency` threads (a project property, defaults to 10).
+		Cleanup stops starting new work once `teardownTimeout` seconds (a project property, defaults to 600) have passed.
+		Cleanup tasks check the deadline between requests, but a request already in progress at the deadline may still
+		complete after this method returns.
+		The time taken by each phase is logged and written to the teardown_timings.json file in the output directory.
 		"""
-		if self.perfMonitorThread:
-			self.perfMonitorThread.stop()
-			self.perfMonitorThread.join(10*60)
-		self._disableTestSmartRules()
-		self._deactivateTestEPLApps()
-		self._generateFinalHTMLReport()
-		for t in self.simulators.keys():
-			self._stopSimulators(t)
+		maxWorkers = int(getattr(self.project, 'teardownConcurrency', DEFAULT_MAX_WORKERS))
+		deadline = time.time() + float(getattr(self.project, 'teardownTimeout', DEFAULT_TEARDOWN_TIMEOUT))
+		timings = {}
+
+		def phase(name, func):
+			startTime = time.time()
+			try:
+				func()
+			except Exception as ex:
+				self.log.warn(f'Failed to {name.lower()} during cleanup: {ex}')
+			timings[name] = time.time() - startTime
+
+		def stopPerfMonitoring():
+			if self.perfMonitorThread:
+				self.perfMonitorThread.stop()
+				self.perfMonitorThread.join(max(deadline - time.time(), 0))
+
+		phase('Stop performance monitoring', stopPerfMonitoring)
+		phase('Disable test smart rules', lambda: self._disableTestSmartRules(maxWorkers=maxWorkers, timeout=deadline - time.time()))
+		phase('Deactivate test EPL apps', lambda: self._deactivateTestEPLApps(maxWorkers=maxWorkers, timeout=deadline - time.time()))
+		phase('Generate HTML report', self._generateFinalHTMLReport)
+		phase('Stop simulators', lambda: runConcurrently(self._stopSimulators, list(self.simulators.keys()), description='tenant simulator shutdowns',
+							maxWorkers=maxWorkers, timeout=deadline - time.time(), log=self.log))
+
+		self.log.info('Cleanup timings: ' + ', '.join(f'{name}={secs:.1f}s' for (name, secs) in timings.items()))
+		self.write_text(f'{OUTFILE_TEARDOWN_TIMINGS}.json', json.dumps(timings, indent=2), encoding='utf8')
 
 	def _stopSimulators(self, tenantId):
 		""" Stop running simulators for the specified tenant ID. """
@@ -186,19 +428,36 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 	def _deleteTestEPLApps(self,tenant=None):
 		super()._deleteTestEPLApps(tenant)
 
-	def _disableTestSmartRules(self):
-		""" As part of test cleanup, disable smart rules created by the framework for all tenants."""
-		for tenant in self.platform.getSubscribedTenants():
+	def _disableTestSmartRules(self, maxWorkers=DEFAULT_MAX_WORKERS, timeout=None):
+		"""
+		As part of test cleanup, disable smart rules created by the framework for all tenants.
+
+		:param int maxWorkers: The maximum number of tenants to clean up concurrently.
+		:param timeout: The time (in seconds) after which no further requests are made to clean up tenants.
+		:type timeout: float, optional
+		"""
+		deadline = (time.time() + timeout) if timeout is not None else None
+
+		def disable(tenant):
 			sm = SmartRulesManager(tenant, self.log)
-			rules = sm.getAllSmartRules(withLocalRules=True)
-			for rule in rules:
-				if rule._isTestSmartRule():
-					rule.setEnabled(False)
-					rule.deploy()
+			rules = []
+			# Check the deadline while listing, so that no further pages are fetched once it has expired
+			for rule in sm.iterSmartRules(withLocalRules=True, namePrefix=SmartRule.NAME_PREFIX):
+				if deadline is not None and time.time() >= deadline:
+					raise TimeoutError(f'Smart rules of tenant {tenant.tenantId} not listed before the deadline of {timeout} seconds')
+				rules.append(rule)
+			# Only the test smart rules that are still enabled are updated
+			disabledRules = [copy.copy(rule).setEnabled(False) for rule in rules]
+			sm.reconcile(disabledRules, existingRules=rules, timeout=(deadline - time.time()) if deadline is not None else None)
+
+		runConcurrently(disable, self.platform.getSubscribedTenants(), description='tenant smart rule cleanups',
+			maxWorkers=maxWorkers, timeout=timeout, log=self.log).raiseIfFailed()
 
 	def _deleteTestSmartRules(self,tenant=None):
 		"""
 		Delete smart rules created by the framework.
+
+		An exception is raised if any test smart rule could not be deleted.
 		
 		:param tenant: The Cumulocity tenant. If no tenant is specified, smart rules are deleted from the tenant configured in the pysysproject.xml file.
 		:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
@@ -208,10 +467,16 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		if tenant is not None:
 			sm = SmartRulesManager(tenant, self.log)
 		
-		existingSmartRules = sm.getAllSmartRules(withLocalRules=True)
-		for rule in existingSmartRules:
-			if rule._isTestSmartRule():
-				rule.delete()
+		# List all test rules before deleting any, as deleting rules shifts the later pages of the listing. List again
+		# after deleting them to check that no test rules remain, for example rules created while they were being deleted.
+		for _ in range(MAX_SMART_RULE_CLEANUP_PASSES):
+			rules = list(sm.iterSmartRules(withLocalRules=True, namePrefix=SmartRule.NAME_PREFIX))
+			if not rules: return
+			runConcurrently(lambda rule: rule.delete(), rules, description='test smart rule deletions', retries=3,
+							log=self.log).raiseIfFailed()
+		remaining = len(list(sm.iterSmartRules(withLocalRules=True, namePrefix=SmartRule.NAME_PREFIX)))
+		if remaining:
+			raise Exception(f'{remaining} test smart rules remain after deleting them {MAX_SMART_RULE_CLEANUP_PASSES} times')
 
 	def restartApamaMicroservice(self):
 		"""
@@ -243,22 +508,24 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		self.waitForGrep('platform.log', expr='httpServer-.*Started receiving messages', condition=f'>={count2+1}', timeout=TIMEOUTS['WaitForProcess'])
 		self.log.info('Apama-ctrl microservice is successfully restarted')
 
-	def _deactivateTestEPLApps(self):
+	def _deactivateTestEPLApps(self, maxWorkers=DEFAULT_MAX_WORKERS, timeout=None):
 		"""
 		Deactivates all EPL test apps as part of test cleanup.
+
+		:param int maxWorkers: The maximum number of EPL apps to deactivate concurrently.
+		:param timeout: The time (in seconds) after which no further EPL apps are deactivated.
+		:type timeout: float, optional
 		"""
 		if self.platform.supportsEPLApps():
 			eplapps = self.eplapps.getEPLApps(False) or []
-			for app in eplapps:
-				name = app["name"]
-				if name.startswith(self.EPL_APP_PREFIX):
-					try:
-						self.eplapps.update(name, state='inactive')
-					except Exception as e:
-						self.log.info(f"Failed to deactivate app {name}: {e}")
+			names = [app["name"] for app in eplapps if app["name"].startswith(self.EPL_APP_PREFIX)]
+			outcome = runConcurrently(lambda name: self.eplapps.update(name, state='inactive'), names,
+						description='EPL app deactivations', maxWorkers=maxWorkers, timeout=timeout)
+			for o in outcome.getFailed():
+				self.log.info(f"Failed to deactivate app {o.item}: {o.error}")
 
 
-	def startMeasurementSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None):
+	def startMeasurementSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None, maxInFlight=1, latencyFragment=None, loadProfile=None):
 		"""
 			Starts a measurement simulator process to publish simulated measurements to Cumulocity.
 
@@ -277,6 +544,15 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			:type duration: float, optional
 			:param tenant: The Cumulocity tenant. If no tenant is specified, measurements are published to the tenant configured in the pysysproject.xml file.
 			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+			:param int maxInFlight: The maximum number of requests the simulator sends concurrently. Devices are spread across
+				that many send lanes, so measurements for a device are still sent in order. Use this instead of starting multiple
+				simulators when the rate is limited by the time taken by each request.
+			:param latencyFragment: The name of a fragment to add to each of the measurements, containing a sequence number and the time it
+				was sent, for measuring end-to-end latency with :meth:`measureEndToEndLatency`. Latency is not measured if not specified.
+			:type latencyFragment: str, optional
+			:param loadProfile: The shape of the load over time, which the rate per device is multiplied by. For example,
+				``LoadProfile.bursts(1, 10, 60, 5)`` publishes at 10 times the rate for 5 seconds every minute. The rate is constant if not specified.
+			:type loadProfile: :class:`~apamax.eplapplications.perf.loadprofile.LoadProfile`, optional
 			:return: The process handle of the simulator process.
 			:rtype: L{pysys.process.Process}
 
@@ -310,9 +586,9 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 				        [10, 50],                   # constructor parameters for MyMeasurementCreator class
 				    )
 		"""
-		return self._startPublisher(devices, perDeviceRate, '/measurement/measurements', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant)
+		return self._startPublisher(devices, perDeviceRate, '/measurement/measurements', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant, maxInFlight=maxInFlight, latencyFragment=latencyFragment, loadProfile=loadProfile)
 
-	def startEventSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None):
+	def startEventSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None, maxInFlight=1, latencyFragment=None, loadProfile=None):
 		"""
 			Starts an event simulator process to publish simulated events to Cumulocity.
 
@@ -331,6 +607,15 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			:type duration: float, optional
 			:param tenant: The Cumulocity tenant. If no tenant is specified, events are published to the tenant configured in the pysysproject.xml file.
 			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+			:param int maxInFlight: The maximum number of requests the simulator sends concurrently. Devices are spread across
+				that many send lanes, so events for a device are still sent in order. Use this instead of starting multiple
+				simulators when the rate is limited by the time taken by each request.
+			:param latencyFragment: The name of a fragment to add to each of the events, containing a sequence number and the time it
+				was sent, for measuring end-to-end latency with :meth:`measureEndToEndLatency`. Latency is not measured if not specified.
+			:type latencyFragment: str, optional
+			:param loadProfile: The shape of the load over time, which the rate per device is multiplied by. For example,
+				``LoadProfile.bursts(1, 10, 60, 5)`` publishes at 10 times the rate for 5 seconds every minute. The rate is constant if not specified.
+			:type loadProfile: :class:`~apamax.eplapplications.perf.loadprofile.LoadProfile`, optional
 			:return: The process handle of the simulator process.
 			:rtype: L{pysys.process.Process}
 
@@ -363,9 +648,9 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 				        [],                         # constructor parameters for MyEventCreator class
 				    )
 		"""
-		return self._startPublisher(devices, perDeviceRate, '/event/events', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant)
+		return self._startPublisher(devices, perDeviceRate, '/event/events', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant, maxInFlight=maxInFlight, latencyFragment=latencyFragment, loadProfile=loadProfile)
 	
-	def startAlarmSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None):
+	def startAlarmSimulator(self, devices, perDeviceRate, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP', tenant=None, maxInFlight=1, latencyFragment=None, loadProfile=None):
 		"""
 			Starts an alarm simulator process to publish simulated alarms to Cumulocity.
 
@@ -384,6 +669,15 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			:type duration: float, optional
 			:param tenant: The Cumulocity tenant. If no tenant is specified, alarms are published to the tenant configured in the pysysproject.xml file.
 			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+			:param int maxInFlight: The maximum number of requests the simulator sends concurrently. Devices are spread across
+				that many send lanes, so alarms for a device are still sent in order. Use this instead of starting multiple
+				simulators when the rate is limited by the time taken by each request.
+			:param latencyFragment: The name of a fragment to add to each of the alarms, containing a sequence number and the time it
+				was sent, for measuring end-to-end latency with :meth:`measureEndToEndLatency`. Latency is not measured if not specified.
+			:type latencyFragment: str, optional
+			:param loadProfile: The shape of the load over time, which the rate per device is multiplied by. For example,
+				``LoadProfile.bursts(1, 10, 60, 5)`` publishes at 10 times the rate for 5 seconds every minute. The rate is constant if not specified.
+			:type loadProfile: :class:`~apamax.eplapplications.perf.loadprofile.LoadProfile`, optional
 			:return: The process handle of the simulator process.
 			:rtype: L{pysys.process.Process}
 
@@ -414,9 +708,65 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 				        [],                         # constructor parameters for MyAlarmCreator class
 				    )
 		"""
-		return self._startPublisher(devices, perDeviceRate, '/alarm/alarms', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant)
+		return self._startPublisher(devices, perDeviceRate, '/alarm/alarms', creatorFile, creatorClassName, creatorParams, duration, processingMode,tenant=tenant, maxInFlight=maxInFlight, latencyFragment=latencyFragment, loadProfile=loadProfile)
 
-	def _startPublisher(self, devices, perDeviceRate, resourceUrl, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP',tenant=None):
+	def startReplaySimulator(self, devices, recordingFile, objectType='measurements', timeScale=1.0, loop=False, deviceMapping=None,
+			duration=None, processingMode='CEP', tenant=None, maxInFlight=1, latencyFragment=None):
+		"""
+			Starts a simulator process to replay measurements, events or alarms recorded in a file to Cumulocity.
+
+			Unlike simulators using an object creator, a replay reproduces the timing and values of recorded traffic, such as
+			its bursts. The recording is read incrementally, so recordings of any size can be replayed.
+
+			Two recording formats are supported, chosen by the file extension:
+
+			- JSON lines (`.jsonl` or `.json`): one Cumulocity object per line, as returned by the REST API.
+			- CSV (`.csv`): a header row followed by one object per row. The `time` and `source` columns contain the time and
+			  source device ID of the object. Other columns are property paths separated by dots, for example `type` or
+			  `c8y_Temperature.T.value`.
+
+			Objects must be in the order of their time. Each object is published with its source time replaced by the time it
+			is published. The recorded source devices are mapped onto the specified devices in the order they first appear in
+			the recording, so a recording with more devices than the test shares test devices between recorded devices.
+
+			:param list[str] devices: List of device IDs to publish the recorded objects for.
+			:param str recordingFile: The path to the recording.
+			:param str objectType: The type of the recorded objects, one of `measurements`, `events` or `alarms`.
+			:param float timeScale: The factor to speed up the replay by. For example, 10 replays the recording 10 times faster
+				than it was recorded.
+			:param bool loop: Replay the recording again from the start once all objects are published, until the duration expires.
+			:param deviceMapping: Dictionary of recorded device ID to device ID, for mapping recorded devices explicitly.
+			:type deviceMapping: dict[str,str], optional
+			:param duration: The duration (in seconds) to run the simulator for. If no duration is specified, then the
+				simulator runs until the recording has been replayed, or is stopped or the end of the test.
+			:type duration: float, optional
+			:param str processingMode: Cumulocity processing mode. Possible values are CEP, PERSISTENT, TRANSIENT, and QUIESCENT.
+			:param tenant: The Cumulocity tenant. If no tenant is specified, objects are published to the tenant configured in the pysysproject.xml file.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+			:param int maxInFlight: The maximum number of requests the simulator sends concurrently.
+			:param latencyFragment: The name of a fragment to add to each object for measuring end-to-end latency with
+				:meth:`measureEndToEndLatency`. Latency is not measured if not specified.
+			:type latencyFragment: str, optional
+			:return: The process handle of the simulator process.
+			:rtype: L{pysys.process.Process}
+
+			For example::
+
+				self.startReplaySimulator(devices, f'{self.input}/recording.jsonl', 'measurements', timeScale=10, loop=True, duration=600)
+		"""
+		resourceUrls = {'measurements': '/measurement/measurements', 'events': '/event/events', 'alarms': '/alarm/alarms'}
+		if objectType not in resourceUrls:
+			raise Exception(f'Unsupported object type for replay: {objectType}')
+		replayInfo = {
+			'file': os.path.abspath(recordingFile),
+			'timeScale': timeScale,
+			'loop': loop,
+			'deviceMapping': deviceMapping or {},
+		}
+		return self._startPublisher(devices, None, resourceUrls[objectType], None, None, None, duration, processingMode, tenant=tenant,
+					maxInFlight=maxInFlight, latencyFragment=latencyFragment, replayInfo=replayInfo)
+
+	def _startPublisher(self, devices, perDeviceRate, resourceUrl, creatorFile, creatorClassName, creatorParams, duration=None, processingMode='CEP',tenant=None, maxInFlight=1, latencyFragment=None, replayInfo=None, loadProfile=None):
 		"""
 			Starts a publisher process to publish simulated data to Cumulocity using provided object creator class.
 
@@ -431,6 +781,13 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			:type duration: float, optional
 			:param tenant: The Cumulocity tenant. If no tenant is specified, data is published to the tenant configured in the pysysproject.xml file.
 			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`
+			:param int maxInFlight: The maximum number of requests to send concurrently.
+			:param latencyFragment: The name of the fragment to add to objects for measuring end-to-end latency.
+			:type latencyFragment: str, optional
+			:param replayInfo: The recording to replay and how to replay it. The object creator and rate are not used if specified.
+			:type replayInfo: dict, optional
+			:param loadProfile: The shape of the load over time, which the rate per device is multiplied by.
+			:type loadProfile: :class:`~apamax.eplapplications.perf.loadprofile.LoadProfile`, optional
 			:return: The publisher object which can be stopped by calling stop() method on it.
 			:rtype: L{pysys.process.Process}
 		"""
@@ -460,17 +817,29 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			'--username', username,
 			'--password', password,
 			'--devices', json.dumps(devices),
-			'--per_device_rate', str(perDeviceRate), 
 			'--resource_url', resourceUrl,
 			'--processing_mode', processingMode,
-			'--object_creator_info', json.dumps(object_creator_info),
+			'--max_in_flight', str(maxInFlight),
 		]
+		if replayInfo:
+			arguments.extend(['--replay_info', json.dumps(replayInfo)])
+		else:
+			arguments.extend(['--per_device_rate', str(perDeviceRate), '--object_creator_info', json.dumps(object_creator_info)])
+			if loadProfile:
+				arguments.extend(['--load_profile', json.dumps(loadProfile.toDict())])
 
 		if duration is not None:
 			arguments.extend(['--duration', str(duration)])
 
 		self.mkdir(f'{self.output}/simulators')
 		stdouterr=self.allocateUniqueStdOutErr('simulators/publisher')
+		telemetryFile = os.path.splitext(stdouterr[0])[0] + '.telemetry.jsonl'
+		arguments.extend(['--telemetry_file', telemetryFile])
+		self.simulatorTelemetryFiles.append(telemetryFile)
+		if latencyFragment:
+			inputLog = os.path.splitext(stdouterr[0])[0] + '.inputs.csv'
+			arguments.extend(['--latency_fragment', latencyFragment, '--input_log', inputLog])
+			self.simulatorInputLogs.append(inputLog)
 		p = self.startPython(arguments, stdouterr=stdouterr, disableCoverage=True, environs=env, background=True)
 		self.simulators.setdefault(tenant.getTenantId(), []).append(p)
 		self.waitForGrep(stdouterr[0], expr='Started publishing Cumulocity', errorExpr=['ERROR ', 'DataPublisher failed'])
@@ -572,6 +941,8 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 
 			if not self.platform.isSmartrulesOnlyMicroservice():
 				fieldnames.extend([PERF_MEMORY_APCTRL, PERF_CEP_PROXY_REQ_STARTED, PERF_CEP_PROXY_REQ_COMPLETED, PERF_CEP_PROXY_REQ_FAILED])
+			fieldnames.extend(SIMULATOR_METRICS + SIMULATOR_COUNTERS)
+			telemetryOffsets, latestTelemetry = {}, {}
 
 			csv_file = open(f'{self.output}/{OUTFILE_PERF_RAW_DATA}{suffix}.csv', 'w', encoding='utf8')
 			writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
@@ -611,6 +982,9 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 					data[PERF_CEP_PROXY_REQ_COMPLETED] = cep_proxy_requests_completed
 					data[PERF_CEP_PROXY_REQ_FAILED] = cep_proxy_requests_failed
 
+				# 3) aggregate telemetry reported by simulators
+				data.update(self._aggregateSimulatorTelemetry(telemetryOffsets, latestTelemetry, maxAge=max(5.0, 2 * pollingInterval)))
+
 				writer.writerow(data)
 				csv_file.flush()
 				if not stopping.is_set():
@@ -625,6 +999,50 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			self._generatePerfStatistics()
 			log.info('Finished performance monitoring')
 	
+	def _aggregateSimulatorTelemetry(self, offsets, latest, maxAge):
+		"""
+			Reads new telemetry records written by simulators and aggregates the latest record of each simulator.
+
+			Send rates are summed over simulators that reported recently, latencies and schedule lag are the maximum over
+			those simulators, and counters are summed over all simulators.
+
+			:param dict[str,int] offsets: The position up to which each telemetry file has been read. Updated by this method.
+			:param dict[str,dict] latest: The latest record read from each telemetry file. Updated by this method.
+			:param float maxAge: The time (in seconds) after which a simulator that has not reported is considered stopped.
+			:return: Dictionary of metric name to value, or an empty dictionary if no simulator has reported telemetry yet.
+			:rtype: dict
+		"""
+		for file in list(self.simulatorTelemetryFiles):
+			if not os.path.exists(file): continue
+			with open(file, 'rb') as f:
+				f.seek(offsets.get(file, 0))
+				chunk = f.read()
+			end = chunk.rfind(b'\n')
+			if end < 0: continue	# no complete record yet
+			offsets[file] = offsets.get(file, 0) + end + 1
+			for line in chunk[:end].splitlines():
+				if line.strip():
+					latest[file] = json.loads(line)
+		if not latest:
+			return {}
+
+		now = time.time()
+		active = [record for record in latest.values() if now - record['timestamp'] <= maxAge]
+		data = {
+			PERF_SIM_SEND_RATE: sum(record['rate'] for record in active),
+			PERF_SIM_SCHEDULE_LAG: max([record['schedule_lag'] for record in active], default=0.0),
+			PERF_SIM_OBJECTS_SENT: sum(record['acknowledged'] for record in latest.values()),
+			PERF_SIM_RETRIES: sum(record['retries'] for record in latest.values()),
+			PERF_SIM_ERRORS: sum(record['errors'] for record in latest.values()),
+		}
+		# simulators replaying a recording have no target rate
+		targets = [record['target_rate'] for record in active if record.get('target_rate') is not None]
+		if targets:
+			data[PERF_SIM_TARGET_RATE] = sum(targets)
+		for metric, key in [(PERF_SIM_LATENCY_P50, 'latency_p50'), (PERF_SIM_LATENCY_P90, 'latency_p90'), (PERF_SIM_LATENCY_P99, 'latency_p99')]:
+			data[metric] = 1000.0 * max([record[key] for record in active if record[key] is not None], default=0.0)
+		return data
+
 	def _monitor_cpu_usage_impl(self, stopping, log):
 		"""
 		Implements CPU usage monitoring thread.
@@ -680,6 +1098,11 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 					datapoints.setdefault(metric_name, [])
 					datapoints[metric_name].append(float(row[metric_name]))
 
+				# simulator metrics are only present once a simulator has reported telemetry
+				for metric_name in SIMULATOR_METRICS + SIMULATOR_COUNTERS:
+					if row.get(metric_name, '') != '':
+						datapoints.setdefault(metric_name, []).append(float(row[metric_name]))
+
 		cpu_perf_file = f'{self.output}/{OUTFILE_PERF_CPU_USAGE}{suffix}.csv'
 		if os.path.exists(cpu_perf_file):
 			metric_name = PERF_CPU_USAGE_MILLI
@@ -701,28 +1124,51 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			counter_values[name] = int(values[-1]) - int(values[0])
 			del datapoints[name]
 
+		for name in SIMULATOR_COUNTERS:
+			if name in datapoints:
+				values = datapoints.pop(name)
+				counter_values[name] = int(values[-1]) - int(values[0])
+
 		self.write_text(f'{OUTFILE_PERF_COUNTERS}{suffix}.json', json.dumps(counter_values, indent=2), encoding='utf8')
 		self.write_text(f'{OUTFILE_PERF_RAW_DATA}{suffix}.json', json.dumps(datapoints, indent=2), encoding='utf8')
 
-		def percentile(data, percent): # calculate percentile
-			size = len(data)
-			return sorted(data)[int(math.ceil((size * percent) / 100)) - 1]
-		
 		# calculate statistics
 		stats = {}
 		for name in datapoints.keys():
 			values = datapoints[name]
 			if len(values) <=0 : continue
-			stats[name] = {}
-			stats[name]['min'] = min(values)
-			stats[name]['max'] = max(values)
-			stats[name]['mean'] = statistics.mean(values)
-			stats[name]['median'] = statistics.median(values)
-			stats[name]['75th_percentile'] =  percentile(values, 75)
-			stats[name]['90th_percentile'] =  percentile(values, 90)
-			stats[name]['95th_percentile'] =  percentile(values, 95)
-			stats[name]['99th_percentile'] = percentile(values, 99)
-		
+			stats[name] = self._calculateStatistics(values)
+		self._writePerfStatistics(stats, suffix)
+
+	def _calculateStatistics(self, values):
+		"""
+			Calculates the statistics reported for a metric.
+
+			:param list[float] values: The values of the metric. Must not be empty.
+			:return: Dictionary of statistic name to value.
+			:rtype: dict[str,float]
+		"""
+		values = sorted(values)
+		def percentile(percent): # calculate percentile
+			return values[int(math.ceil((len(values) * percent) / 100)) - 1]
+		return {
+			'min': values[0],
+			'max': values[-1],
+			'mean': statistics.mean(values),
+			'median': statistics.median(values),
+			'75th_percentile': percentile(75),
+			'90th_percentile': percentile(90),
+			'95th_percentile': percentile(95),
+			'99th_percentile': percentile(99),
+		}
+
+	def _writePerfStatistics(self, stats, suffix):
+		"""
+			Writes the performance statistics to the JSON and CSV statistics files.
+
+			:param dict stats: Dictionary of metric name to its statistics.
+			:param str suffix: The suffix of the files.
+		"""
 		self.write_text(f'{OUTFILE_PERF_STATS}{suffix}.json', json.dumps(stats, indent=2), encoding='utf8')
 
 		with open(f'{self.output}/{OUTFILE_PERF_STATS}{suffix}.csv', 'w', encoding='utf8') as csv_file:
@@ -737,6 +1183,106 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 					row[col] = stats[name][col]
 				writer.writerow(row)
 
+	def measureEndToEndLatency(self, outputType, dateFrom, dateTo, latencyFragment=None, tenant=None, **kwargs):
+		"""
+			Measures the end-to-end latency from objects published by simulators to the outputs created for them, for example
+			from a measurement to the alarm raised for it by a smart rule.
+
+			Simulators must be started with the `latencyFragment` parameter, so that they log the source and send time of every
+			object they publish. Outputs created in the time range are fetched from Cumulocity and matched back to inputs,
+			either by the latency fragment, if the output contains a copy of it, or by the source and time of the output,
+			which applications typically copy from the input. The latency of an output is the time from sending the input to
+			the creation time of the output, so the clocks of the test machine and Cumulocity must be synchronized.
+
+			If a device published several inputs with the same time (to the millisecond), an output matched by source and time
+			cannot be attributed to one of them. Such outputs are matched to those inputs in the order they were sent, and are
+			counted as ambiguous.
+
+			The latency statistics are added to the performance statistics and the HTML report, so this must be called after
+			the performance monitoring is stopped and before generating the HTML report. They are also written, along with the
+			number of outputs that were matched and the number of ambiguous matches, to the end_to_end_latency.json file in the
+			output directory.
+
+			For example::
+
+				perfMonitor.stop()
+				self.measureEndToEndLatency('alarms', self.startTime, self.getUTCTime(), type='my_alarm')
+				self.generateHTMLReport(...)
+
+			:param str outputType: The type of the outputs, one of `alarms`, `events` or `operations`.
+			:param str dateFrom: The start of the time range of the outputs, in the ISO format.
+			:param str dateTo: The end of the time range of the outputs, in the ISO format.
+			:param latencyFragment: The latency fragment the simulators were started with, if the outputs may contain a copy of it.
+			:type latencyFragment: str, optional
+			:param tenant: The Cumulocity tenant. If no tenant is specified, the tenant configured in the pysysproject.xml file is used.
+			:type tenant: :class:`~apamax.eplapplications.tenant.CumulocityTenant`, optional
+			:param \\**kwargs: All additional keyword arguments are treated as extra parameters for filtering outputs.
+			:return: The latency statistics (in milliseconds), or `None` if no output could be matched to an input.
+			:rtype: dict[str,float]
+		"""
+		if outputType not in LATENCY_OUTPUT_COLLECTIONS:
+			raise Exception(f'Unsupported output type for latency measurement: {outputType}')
+		if self.perfMonitorThread and self.perfMonitorThread.is_alive():
+			self.perfMonitorThread.stop()
+			self.perfMonitorThread.join(10*60)
+
+		def inputKey(source, sourceTime):
+			return (source, round(parseUTCTime(sourceTime) * 1000))
+
+		# read the inputs logged by the simulators, keeping the send times of all inputs with the same source and time
+		sendTimes = {}
+		for inputLog in self.simulatorInputLogs:
+			if not os.path.exists(inputLog): continue
+			with open(inputLog, encoding='utf8') as f:
+				for line in f:
+					fields = line.rstrip('\n').split(',')
+					if len(fields) == 3:
+						sendTimes.setdefault(inputKey(fields[0], fields[1]), []).append(float(fields[2]))
+		for candidates in sendTimes.values():
+			candidates.sort(reverse=True)	# so the earliest send time is popped first
+		collisions = {key for key, candidates in sendTimes.items() if len(candidates) > 1}
+
+		resourceUrl, responseKey = LATENCY_OUTPUT_COLLECTIONS[outputType]
+		queryParams = self._createQueryParams(dateFrom=dateFrom, dateTo=dateTo, **kwargs)
+		latencies = []
+		unmatched = 0
+		ambiguous = 0	# outputs matched by source and time to one of several inputs
+		for output in self._iterCumulocityObjectCollection(resourceUrl, queryParams, responseKey, tenant=tenant, pageSize=2000):
+			sendTime = (output.get(latencyFragment) or {}).get('sendTime') if latencyFragment else None
+			if sendTime is None and 'time' in output:
+				source = output.get('source', {}).get('id') or output.get('deviceId')
+				key = inputKey(source, output['time'])
+				candidates = sendTimes.get(key)
+				if candidates:
+					# keep the last candidate, as an input may cause several outputs
+					sendTime = candidates.pop() if len(candidates) > 1 else candidates[0]
+					if key in collisions: ambiguous += 1
+			if sendTime is None:
+				unmatched += 1
+				continue
+			latencies.append(1000.0 * (parseUTCTime(output['creationTime']) - sendTime))
+
+		self.log.info(f'Matched {len(latencies)} of {len(latencies) + unmatched} {outputType} to inputs for end-to-end latency measurement')
+		if ambiguous:
+			self.log.warn(f'{ambiguous} {outputType} were matched to one of several inputs from the same source with the same time, '+
+				'so their latency may be inaccurate')
+		suffix = self._perfMonitorSuffix()
+		result = {'outputs': len(latencies) + unmatched, 'matched': len(latencies), 'ambiguous': ambiguous}
+		stats = None
+		if latencies:
+			stats = self._calculateStatistics(latencies)
+			result.update(stats)
+			self.log.info(f"End-to-end latency: median {stats['median']:.0f} ms, 90th percentile {stats['90th_percentile']:.0f} ms, "+
+				f"99th percentile {stats['99th_percentile']:.0f} ms, max {stats['max']:.0f} ms")
+			if os.path.exists(f'{self.output}/{OUTFILE_PERF_STATS}{suffix}.json'):
+				perfStats = self.read_json(f'{OUTFILE_PERF_STATS}{suffix}.json')
+				perfStats[PERF_END_TO_END_LATENCY] = stats
+				self._writePerfStatistics(perfStats, suffix)
+		else:
+			self.log.warn(f'No {outputType} could be matched to inputs for end-to-end latency measurement')
+		self.write_text(f'{OUTFILE_END_TO_END_LATENCY}{suffix}.json', json.dumps(result, indent=2), encoding='utf8')
+		return stats
+
 	def read_json(self, fileName, fileDirectory=None):
 		"""
 			Reads a JSON file and returns its content.
@@ -885,8 +1431,9 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		table_data = self.read_json(f'{OUTFILE_PERF_STATS}{suffix}.json')
 		# add counter type data to the table as well
 		counters = self.read_json(f'{OUTFILE_PERF_COUNTERS}{suffix}.json')
-		for s in [PERF_CORR_NUM_INPUT_RECEIVED, PERF_CORR_NUM_OUTPUT_SENT]:
-			table_data[s] = counters[s]
+		for s in [PERF_CORR_NUM_INPUT_RECEIVED, PERF_CORR_NUM_OUTPUT_SENT] + SIMULATOR_COUNTERS:
+			if s in counters:
+				table_data[s] = counters[s]
 
 		# Extracting the column names. PERF_MEMORY_CORR is present in both apama-ctrl and smartrules. So this
 		# works for both without any changes
@@ -913,6 +1460,8 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		queue_data = []
 		memory_data = []
 		cpu_usage_data = []
+		simulator_rate_data = []
+		simulator_latency_data = []
 		start_time = -1
 		end_time = -1
 		with open(f'{self.output}/{OUTFILE_PERF_RAW_DATA}{suffix}.csv', 'r', encoding='utf8') as csv_file:
@@ -933,6 +1482,12 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 					memory = f'{memory}, {float(row[PERF_MEMORY_APCTRL])}, {float(row[PERF_TOTAL_MEMORY_USAGE])}'
 
 				memory_data.append(f'[new Date({timestamp_milli}), {memory}]')
+
+				if row.get(PERF_SIM_SEND_RATE, '') != '':
+					target_rate = float(row[PERF_SIM_TARGET_RATE]) if row.get(PERF_SIM_TARGET_RATE, '') != '' else 'null'
+					simulator_rate_data.append(f'[new Date({timestamp_milli}), {float(row[PERF_SIM_SEND_RATE])}, {target_rate}]')
+					latencies = ', '.join(str(float(row[metric])) for metric in [PERF_SIM_LATENCY_P50, PERF_SIM_LATENCY_P90, PERF_SIM_LATENCY_P99])
+					simulator_latency_data.append(f'[new Date({timestamp_milli}), {latencies}, {1000.0 * float(row[PERF_SIM_SCHEDULE_LAG])}]')
 		queue_time_range = memory_time_range = format_time_range(start_time, end_time)
 
 		# generate data for cpu usage graphs
@@ -972,6 +1527,9 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 			'MEMORY_TIMERANGE': memory_time_range,
 			'CPU_USAGE_DATA': ','.join(cpu_usage_data),
 			'CPU_USAGE_TIMERANGE': cpu_usage_time_range,
+			'SIMULATOR_RATE_DATA': ','.join(simulator_rate_data),
+			'SIMULATOR_LATENCY_DATA': ','.join(simulator_latency_data),
+			'SIMULATOR_TIMERANGE': queue_time_range,
 		}
 
 		self.write_text(f'html_report_data{self._perfMonitorSuffix(False)}.json', json.dumps(variation_replacements, indent=2), encoding='utf8')
@@ -1059,13 +1617,13 @@ class ApamaC8YPerfBaseTest(ApamaC8YBaseTest):
 		"""
 		logFile = self.platform.getApamaLogFile()
 
-		self.assertGrep(logFile, expr=r' (ERROR|FATAL) .* eplfiles\.', contains=False)
-
-		# Check that microservice did not use more than 90% of available memory
-		self.assertGrep(logFile, expr='apama_highmemoryusage.*Apama is using 90. of available memory', contains=False)
-		
-		# Check that microservice did not exit because of high memory usage
-		self.assertGrep(logFile, expr='(Java exit 137|exit code 137)', contains=False)
+		self.assertGrepAll(logFile, [
+			{'expr': r' (ERROR|FATAL) .* eplfiles\.', 'contains': False},
+			# Check that microservice did not use more than 90% of available memory
+			{'expr': 'apama_highmemoryusage.*Apama is using 90. of available memory', 'contains': False},
+			# Check that microservice did not exit because of high memory usage
+			{'expr': '(Java exit 137|exit code 137)', 'contains': False},
+		])
 
 		# Check that no request to /cep from cumulocity failed
 		if not self.platform.isSmartrulesOnlyMicroservice():
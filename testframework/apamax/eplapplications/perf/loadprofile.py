@@ -0,0 +1,236 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import math, bisect
+
+# Number of linear segments a sine profile is approximated by per period
+SINE_SEGMENTS = 96
+
+class LoadProfile(object):
+	"""
+	The shape of the load a simulator generates over time, as a factor of its rate per device.
+
+	A profile is a piecewise linear schedule of `(time, factor)` points, where the time is in seconds since the simulator
+	started. The factor is interpolated linearly between points, so two points at the same time define a step change. The
+	factor before the first point is that of the first point, and the factor after the last point is that of the last point,
+	unless the profile repeats.
+
+	Use the factory methods, such as :meth:`ramp` or :meth:`bursts`, to create common profiles.
+
+	:param list[tuple[float,float]] points: The `(time, factor)` points of the profile, in the order of their time.
+	:param period: The time (in seconds) after which the profile repeats. The profile does not repeat if not specified.
+	:type period: float, optional
+	"""
+
+	def __init__(self, points, period=None):
+		points = [(float(t), float(f)) for t, f in points]
+		if not points:
+			raise Exception('A load profile must have at least one point')
+		if any(t < 0 or f < 0 for t, f in points):
+			raise Exception(f'Times and factors of a load profile must not be negative: {points}')
+		if any(points[i][0] > points[i + 1][0] for i in range(len(points) - 1)):
+			raise Exception(f'Points of a load profile must be in the order of their time: {points}')
+		if period is not None and (period <= 0 or points[-1][0] > period):
+			raise Exception(f'The period of a load profile must be positive and not before its last point: {period}')
+		if points[0][0] > 0:
+			points.insert(0, (0.0, points[0][1]))
+		if period is not None and points[-1][0] < period:
+			points.append((float(period), points[-1][1]))
+		self.points = points
+		self.period = float(period) if period is not None else None
+		self._times = [t for t, _ in points]
+		# The area under the profile from time 0 up to each point
+		self._areas = [0.0]
+		for (t0, f0), (t1, f1) in zip(points, points[1:]):
+			self._areas.append(self._areas[-1] + (t1 - t0) * (f0 + f1) / 2)
+
+	@staticmethod
+	def constant(factor=1.0):
+		"""
+		Create a profile with a constant rate.
+
+		:param float factor: The factor of the rate.
+		:rtype: :class:`LoadProfile`
+		"""
+		return LoadProfile([(0, factor)])
+
+	@staticmethod
+	def ramp(fromFactor, toFactor, duration, holdFor=None):
+		"""
+		Create a profile that changes the rate linearly and then holds it.
+
+		:param float fromFactor: The factor of the rate at the start of the ramp.
+		:param float toFactor: The factor of the rate at the end of the ramp.
+		:param float duration: The duration (in seconds) of the ramp.
+		:param holdFor: The time (in seconds) to hold the rate at the end of the ramp before the rate drops to zero. The rate is held
+			until the simulator stops if not specified.
+		:type holdFor: float, optional
+		:rtype: :class:`LoadProfile`
+		"""
+		points = [(0, fromFactor), (duration, toFactor)]
+		if holdFor is not None:
+			points.extend([(duration + holdFor, toFactor), (duration + holdFor, 0)])
+		return LoadProfile(points)
+
+	@staticmethod
+	def steps(factors, stepDuration, repeat=False):
+		"""
+		Create a profile that changes the rate in steps, for example to find the highest rate an application can sustain.
+
+		:param list[float] factors: The factor of the rate for each step.
+		:param float stepDuration: The duration (in seconds) of each step.
+		:param bool repeat: Repeat the steps from the first step after the last step. Otherwise, the last step is held.
+		:rtype: :class:`LoadProfile`
+		"""
+		points = []
+		for i, factor in enumerate(factors):
+			points.extend([(i * stepDuration, factor), ((i + 1) * stepDuration, factor)])
+		if not repeat:
+			points.pop()
+		return LoadProfile(points, period=len(factors) * stepDuration if repeat else None)
+
+	@staticmethod
+	def bursts(baseFactor, burstFactor, period, burstDuration, burstStart=None):
+		"""
+		Create a profile with periodic bursts of a higher rate on top of a base rate.
+
+		:param float baseFactor: The factor of the rate between bursts. Use 0 for no traffic between bursts.
+		:param float burstFactor: The factor of the rate during bursts.
+		:param float period: The time (in seconds) from the start of one burst to the start of the next burst.
+		:param float burstDuration: The duration (in seconds) of each burst.
+		:param burstStart: The time (in seconds) in each period the burst starts at. Defaults to the end of the period, so the
+			simulator starts at the base rate.
+		:type burstStart: float, optional
+		:rtype: :class:`LoadProfile`
+		"""
+		if burstDuration > period:
+			raise Exception(f'The burst duration {burstDuration} must not be longer than the period {period}')
+		if burstStart is None:
+			burstStart = period - burstDuration
+		burstEnd = burstStart + burstDuration
+		points = [(0, baseFactor), (burstStart, baseFactor), (burstStart, burstFactor), (burstEnd, burstFactor), (burstEnd, baseFactor)]
+		return LoadProfile(points, period=period)
+
+	@staticmethod
+	def sine(minFactor, maxFactor, period):
+		"""
+		Create a profile that varies the rate smoothly between a minimum and a maximum, for example to simulate a day of
+		traffic in a shorter time.
+
+		The rate starts at the minimum and peaks half way through each period.
+
+		:param float minFactor: The factor of the minimum rate.
+		:param float maxFactor: The factor of the maximum rate.
+		:param float period: The time (in seconds) of one cycle from the minimum rate to the maximum and back.
+		:rtype: :class:`LoadProfile`
+		"""
+		points = []
+		for i in range(SINE_SEGMENTS + 1):
+			t = period * i / SINE_SEGMENTS
+			points.append((t, minFactor + (maxFactor - minFactor) * (1 - math.cos(2 * math.pi * i / SINE_SEGMENTS)) / 2))
+		return LoadProfile(points, period=period)
+
+	@staticmethod
+	def piecewise(points, interpolate=True, period=None):
+		"""
+		Create a profile from an arbitrary schedule.
+
+		:param list[tuple[float,float]] points: The `(time, factor)` points of the schedule, in the order of their time.
+		:param bool interpolate: Change the rate linearly between points. Otherwise, each factor is held until the next point.
+		:param period: The time (in seconds) after which the schedule repeats. The schedule does not repeat if not specified.
+		:type period: float, optional
+		:rtype: :class:`LoadProfile`
+		"""
+		if not interpolate:
+			held = []
+			for (t, factor), following in zip(points, list(points[1:]) + [None]):
+				held.append((t, factor))
+				if following is not None:
+					held.append((following[0], factor))
+			points = held
+		return LoadProfile(points, period=period)
+
+	def toDict(self):
+		"""
+		Get the profile as a dictionary that can be serialized to JSON, and passed to the constructor to create the profile again.
+
+		:rtype: dict
+		"""
+		return {'points': [list(point) for point in self.points], 'period': self.period}
+
+	def factor(self, t):
+		"""
+		Get the factor of the rate at a time.
+
+		:param float t: The time (in seconds) since the start of the profile.
+		:rtype: float
+		"""
+		if self.period is not None:
+			t = t % self.period
+		i = bisect.bisect_right(self._times, t) - 1
+		if i < 0:
+			return self.points[0][1]
+		if i >= len(self.points) - 1:
+			return self.points[-1][1]
+		(t0, f0), (t1, f1) = self.points[i], self.points[i + 1]
+		return f0 + (f1 - f0) * (t - t0) / (t1 - t0)
+
+	def area(self, t):
+		"""
+		Get the area under the profile from its start up to a time. Multiplied by a rate, this is the number of objects to
+		send at that rate by that time.
+
+		:param float t: The time (in seconds) since the start of the profile.
+		:rtype: float
+		"""
+		if t <= 0:
+			return 0.0
+		cycles = 0
+		if self.period is not None:
+			cycles, t = divmod(t, self.period)
+		i = bisect.bisect_right(self._times, t) - 1
+		if i >= len(self.points) - 1:
+			area = self._areas[-1] + (t - self._times[-1]) * self.points[-1][1]
+		else:
+			(t0, f0), (t1, f1) = self.points[i], self.points[i + 1]
+			x = t - t0
+			area = self._areas[i] + x * f0 + (f1 - f0) / (t1 - t0) * x * x / 2
+		return cycles * self._areas[-1] + area
+
+	def timeOf(self, area):
+		"""
+		Get the time at which the area under the profile reaches a value. This is the inverse of :meth:`area`.
+
+		:param float area: The area.
+		:return: The time (in seconds) since the start of the profile, or infinity if the area is never reached.
+		:rtype: float
+		"""
+		if area <= 0:
+			return 0.0
+		offset = 0.0
+		if self.period is not None:
+			if self._areas[-1] <= 0:
+				return math.inf
+			cycles, area = divmod(area, self._areas[-1])
+			if area <= 0:
+				# reached at the end of the previous cycle
+				cycles, area = cycles - 1, self._areas[-1]
+			offset = cycles * self.period
+		i = bisect.bisect_left(self._areas, area) - 1
+		if i >= len(self.points) - 1:
+			f = self.points[-1][1]
+			return offset + self._times[-1] + (area - self._areas[-1]) / f if f > 0 else math.inf
+		(t0, f0), (t1, f1) = self.points[i], self.points[i + 1]
+		# solve f0*x + slope*x*x/2 = remaining for the time x since the start of the segment
+		remaining = area - self._areas[i]
+		slope = (f1 - f0) / (t1 - t0)
+		x = 2 * remaining / (f0 + math.sqrt(max(0.0, f0 * f0 + 2 * slope * remaining)))
+		return offset + t0 + min(x, t1 - t0)
@@ -19,28 +19,95 @@ import json
 import sys, os
 import importlib.util
 import urllib.error
-from datetime import datetime, timezone
+import threading, queue
+import re
 from apamax.eplapplications.connection import C8yConnection
+from apamax.eplapplications.utctime import formatUTCTime, formatUTCTimes
 from apamax.eplapplications.perf import ObjectCreator
+from apamax.eplapplications.perf.recording import RecordingReader
+from apamax.eplapplications.perf.loadprofile import LoadProfile
 
 # Maximum batch size
 MAX_BATCH_SIZE = 2000
 
-class DefaultObjectCreator:
-	def createObject(self, device, time):
+# Maximum number of requests queued per send lane before the publisher waits for earlier requests to complete
+MAX_QUEUED_REQUESTS_PER_LANE = 100
+
+# Interval (in seconds) between telemetry records written by the publisher
+TELEMETRY_INTERVAL = 1.0
+
+# Placeholder for a varying value in a serialized object creator template
+PLACEHOLDER_EXPR = re.compile(r'"@(\w+)@"')
+
+# Placeholder for the send time in the latency fragment, replaced when the request is sent
+SEND_TIME_PLACEHOLDER = '@sendTime@'
+
+class DefaultObjectCreator(ObjectCreator):
+	def getTemplate(self):
 		return {
-			'time': time,
+			'time': '@time@',
 			"type": 'my_measurement',
 			"source": {
-				"id": device
+				"id": '@device@'
 			},
 			'my_fragment': {
 				'my_series': {
-					"value": random.uniform(0, 100)
+					"value": '@value@'
 				}
 			}
 		}
 
+	def createFields(self, device, time):
+		return {'time': time, 'device': device, 'value': random.uniform(0, 100)}
+
+	def createFieldColumns(self, devices, times):
+		rand = random.random
+		return {'time': times, 'device': devices, 'value': [rand() * 100 for _ in devices]}
+
+def encode_value(value):
+	"""Serialize a single JSON value, avoiding the overhead of json.dumps for the common types."""
+	value_type = type(value)
+	if value_type is str:
+		return json.encoder.encode_basestring_ascii(value)
+	if value_type is float and math.isfinite(value):
+		return float.__repr__(value)
+	if value_type is int:
+		return int.__repr__(value)
+	return json.dumps(value)
+
+class PayloadTemplate(object):
+	"""
+	An object creator template serialized once, into which the values of each object are spliced.
+
+	:param template: The template returned by the object creator.
+	"""
+	def __init__(self, template):
+		parts = PLACEHOLDER_EXPR.split(json.dumps(template))
+		self.names = parts[1::2]
+		self.format = '{}'.join(part.replace('{', '{{').replace('}', '}}') for part in parts[0::2])
+
+	def render(self, fields):
+		"""
+		Create the serialized object for the values of the placeholders.
+
+		:param dict fields: Dictionary of placeholder name to value.
+		:return: The JSON string of the object.
+		:rtype: str
+		"""
+		return self.format.format(*[encode_value(fields[name]) for name in self.names])
+
+	def render_columns(self, columns):
+		"""
+		Create the serialized objects for a batch from the values of the placeholders.
+
+		:param dict[str,list] columns: Dictionary of placeholder name to the values for all objects.
+		:return: The JSON strings of the objects.
+		:rtype: list[str]
+		"""
+		format = self.format.format
+		encoded = [list(map(encode_value, columns[name])) for name in self.names]
+		return [format(*values) for values in zip(*encoded)]
+
 # '/measurement/measurements', '/event/events', '/alarm/alarms'
 MEASUREMENT_TYPE_NAME = 'measurements'
 MEASUREMENT_RESOURCE_URL = '/measurement/measurements'
@@ -54,14 +121,94 @@ ALARM_TYPE_NAME = 'alarm'
 ALARM_RESOURCE_URL = '/alarm/alarms'
 ALARM_CONTENT_TYPE = 'application/vnd.com.nsn.cumulocity.alarm+json'
 
+class PublisherTelemetry(object):
+	"""
+	Collects statistics about the requests sent by a publisher and appends them periodically to a telemetry file, one JSON
+	record per line, for the performance monitor of the test to aggregate.
+
+	:param str path: The path of the telemetry file.
+	"""
+	def __init__(self, path):
+		self.file = open(path, 'a', encoding='utf8')
+		self.lock = threading.Lock()
+		self.acknowledged = 0	# total number of objects accepted by Cumulocity
+		self.requests = 0		# total number of requests completed
+		self.retries = 0		# total number of requests retried
+		self.errors = 0			# total number of requests that failed
+		self.latencies = []		# latencies (in seconds) of requests completed since the last record
+		self.last_time = None
+		self.last_sent = 0
+
+	def record_request(self, latency, count):
+		"""Record a request that completed successfully."""
+		with self.lock:
+			self.requests += 1
+			self.acknowledged += count
+			self.latencies.append(latency)
+
+	def record_retry(self):
+		"""Record a request that failed and is retried."""
+		with self.lock:
+			self.retries += 1
+
+	def record_error(self):
+		"""Record a request that failed."""
+		with self.lock:
+			self.errors += 1
+
+	def write(self, now, sent, schedule_lag, queued, target_rate=None):
+		"""
+		Append a telemetry record for the period since the last record.
+
+		:param float now: The current epoch time.
+		:param int sent: The total number of objects sent or queued to be sent.
+		:param float schedule_lag: The time (in seconds) the publisher is behind its schedule.
+		:param int queued: The number of requests waiting to be sent.
+		:param float target_rate: The rate (in objects per second) the publisher is scheduled to send at, if it has one.
+		"""
+		with self.lock:
+			latencies, self.latencies = sorted(self.latencies), []
+			record = {
+				'timestamp': now,
+				'sent': sent,
+				'acknowledged': self.acknowledged,
+				'requests': self.requests,
+				'retries': self.retries,
+				'errors': self.errors,
+			}
+		elapsed = (now - self.last_time) if self.last_time is not None else None
+		record['rate'] = (sent - self.last_sent) / elapsed if elapsed else 0.0
+		record['target_rate'] = target_rate
+		for percent in [50, 90, 99]:
+			record[f'latency_p{percent}'] = latencies[int(math.ceil(len(latencies) * percent / 100)) - 1] if latencies else None
+		record['schedule_lag'] = schedule_lag
+		record['queued'] = queued
+		self.last_time, self.last_sent = now, sent
+		self.file.write(json.dumps(record) + '\n')
+		self.file.flush()
+
+	def close(self):
+		self.file.close()
+
 class DataPublisher(object):
-	def __init__(self, base_url, username, password, devices, per_device_rate, duration, resource_url, processing_mode='CEP', object_creator_info=None):
+	def __init__(self, base_url, username, password, devices, per_device_rate, duration, resource_url, processing_mode='CEP', object_creator_info=None, max_in_flight=1, telemetry_file=None, latency_fragment=None, input_log=None, replay_info=None, load_profile=None):
 		self.connection = C8yConnection(base_url, username, password)
 		self.devices = devices
 		self.per_device_rate = per_device_rate
 		self.duration = duration
 		self.resource_url = resource_url
 		self.processing_mode = processing_mode
+		self.max_in_flight = max(1, min(max_in_flight, len(devices)))
+		self.lanes = []
+		self.lane_threads = []
+		self.send_error = None
+		self.telemetry = PublisherTelemetry(telemetry_file) if telemetry_file else None
+		self.latency_fragment = latency_fragment
+		self.input_log = open(input_log, 'a', encoding='utf8') if input_log else None
+		self.input_log_lock = threading.Lock()	# the send lanes log the objects they send concurrently
+		self.sequence = 0	# sequence number of the last object marked for latency measurement
+		self.replay = json.loads(replay_info) if replay_info else None
+		self.load_profile = LoadProfile(**json.loads(load_profile)) if load_profile else None
 		self.supportsBatchSend = False
 		self.content_type = None
 		self.type_name = None
@@ -79,11 +226,16 @@ class DataPublisher(object):
 		else:
 			raise Exception(f'Unsupported resource type: {self.resource_url}')
 
-		if object_creator_info:
+		if self.replay:
+			self.object_creator = None	# objects are read from the recording
+		elif object_creator_info:
 			self.object_creator = self.load_object_creator(object_creator_info)
 		else:
 			self.object_creator = DefaultObjectCreator()
 
+		template = self.object_creator.getTemplate() if self.object_creator else None
+		self.template = PayloadTemplate(template) if template is not None else None
+
 	def load_object_creator(self, object_creator_info):
 		"""
 		Load object creator class from the specified Python file and create
@@ -132,10 +284,18 @@ class DataPublisher(object):
 			:return: Timestamp string.
 			:rtype: str
 		"""
-		return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+		return formatUTCTime()
 
-	def do_send(self, body):
-		"""Send event(s) to Cumulocity."""
+	def do_send(self, body, count=1, marks=None):
+		"""
+		Send event(s) to Cumulocity.
+
+		:param body: The object or batch body to send, or its JSON string.
+		:param int count: The number of objects in the body.
+		:param marks: The device ID and source time of each object marked for latency measurement. The send time placeholder
+			in the body is replaced by the time of each attempt, and the objects are logged to the input log once sent.
+		:type marks: list[tuple[str,str]], optional
+		"""
 
 		headers = {
 					'Content-Type': self.content_type,
@@ -143,82 +303,331 @@ class DataPublisher(object):
 				}
 		startTime = time.time()
 		MAX_RETRY_TIME = 60.0
+		body = body if isinstance(body, str) else json.dumps(body)
 		while time.time() < startTime + MAX_RETRY_TIME:
 			try:
+				sendTime = time.time()
 				self.connection.request(
 					'POST',
 					self.resource_url,
-					body=json.dumps(body),
+					body=body.replace(f'"{SEND_TIME_PLACEHOLDER}"', repr(sendTime)) if marks else body,
 					headers=headers
 				)
+				if self.telemetry: self.telemetry.record_request(time.time() - startTime, count)
+				if marks: self.log_inputs(marks, sendTime)
 				return
 			except urllib.error.HTTPError as ex:
 				# Retry in case of 5XX error.
 				if ex.code // 100 == 5:
 					print(f'WARN: Failed to send to Cumulocity, retrying; error={ex}')
+					if self.telemetry: self.telemetry.record_retry()
 					time.sleep(0.5)
 				else:
 					print(f'ERROR: Failed to send to Cumulocity; error={ex}')
+					if self.telemetry: self.telemetry.record_error()
 					raise ex
+			except Exception:
+				if self.telemetry: self.telemetry.record_error()
+				raise
 		
+		if self.telemetry: self.telemetry.record_error()
 		print(f'ERROR: Failed to send to Cumulocity after trying for {MAX_RETRY_TIME} seconds; headers={headers}, body={body}')
 
+	def start_lanes(self):
+		"""
+		Start the send lanes used to have multiple requests in flight.
+
+		Each device is assigned to a single lane and each lane sends its requests one at a time, in the order they were
+		queued, so objects for a device are always sent in order.
+		"""
+		self.lanes = [queue.Queue(maxsize=MAX_QUEUED_REQUESTS_PER_LANE) for _ in range(self.max_in_flight)]
+		self.lane_of_device = {device: index % self.max_in_flight for index, device in enumerate(self.devices)}
+		for lane in self.lanes:
+			thread = threading.Thread(target=self.run_lane, args=(lane,), daemon=True)
+			thread.start()
+			self.lane_threads.append(thread)
+
+	def stop_lanes(self):
+		"""Wait for all queued requests to be sent and stop the send lanes."""
+		for lane in self.lanes:
+			lane.put(None)
+		for thread in self.lane_threads:
+			thread.join()
+		if self.send_error:
+			raise self.send_error
+
+	def run_lane(self, lane):
+		"""Send the requests queued on a lane until stopped."""
+		while True:
+			request = lane.get()
+			if request is None:
+				return
+			if self.send_error:
+				continue	# discard remaining requests, the publisher is about to fail
+			try:
+				self.do_send(*request)
+			except Exception as ex:
+				self.send_error = ex
+
+	def create_objects(self, devices, times):
+		"""
+		Create a batch of objects to send, serialized if the object creator uses a template.
+
+		:return: The objects or their JSON strings. An entry is `None` if no object should be sent.
+		:rtype: list
+		"""
+		if self.template is None:
+			return self.object_creator.createObjects(devices, times)
+		return self.template.render_columns(self.object_creator.createFieldColumns(devices, times))
+
+	def next_devices(self, device_index, count):
+		"""
+		Get the devices to send the next objects for, in round robin order.
+
+		:return: The devices, and the index of the device to send the following object for.
+		:rtype: tuple[list[str], int]
+		"""
+		num_devices = len(self.devices)
+		end = device_index + count
+		if end <= num_devices:
+			return self.devices[device_index:end], end % num_devices
+		rotated = self.devices[device_index:] + self.devices[:device_index]
+		return (rotated * math.ceil(count / num_devices))[:count], end % num_devices
+
+	def batch_body(self, objs):
+		"""Create the body of a request sending multiple objects."""
+		if self.template is None:
+			return {self.type_name: objs}
+		return f'{{"{self.type_name}": [{", ".join(objs)}]}}'
+
+	def mark_for_latency(self, batch):
+		"""
+		Add the latency fragment containing a sequence number and a placeholder for the send time to each object of a batch.
+		The placeholder is replaced when the request containing the object is sent.
+
+		:param list[tuple[str,str,object]] batch: List of device ID, source time and object.
+		:return: List of device ID, source time and marked object.
+		:rtype: list[tuple[str,str,object]]
+		"""
+		fragment = json.dumps(self.latency_fragment)
+		marked = []
+		for device, source_time, obj in batch:
+			self.sequence += 1
+			if isinstance(obj, str):
+				obj = f'{obj[:-1]}, {fragment}: {{"sequence": {self.sequence}, "sendTime": "{SEND_TIME_PLACEHOLDER}"}}}}'
+			else:
+				obj[self.latency_fragment] = {'sequence': self.sequence, 'sendTime': SEND_TIME_PLACEHOLDER}
+			marked.append((device, source_time, obj))
+		return marked
+
+	def log_inputs(self, marks, send_time):
+		"""
+		Log objects marked for latency measurement to the input log so that outputs can be matched back to them.
+
+		:param list[tuple[str,str]] marks: List of device ID and source time of the objects.
+		:param float send_time: The time the objects were sent.
+		"""
+		if not self.input_log: return
+		lines = ''.join(f'{device},{source_time},{send_time!r}\n' for device, source_time in marks)
+		with self.input_log_lock:
+			self.input_log.write(lines)
+			self.input_log.flush()
+
+	def send(self, batch):
+		"""
+		Send a batch of objects, either directly or by queuing them on the send lanes of their devices.
+
+		:param list[tuple[str,str,object]] batch: List of device ID, source time and object.
+		"""
+		def marks(items):
+			# the objects to log to the input log once sent, if marked for latency measurement
+			return [(device, source_time) for device, source_time, _ in items] if self.latency_fragment else None
+
+		if not self.lanes:
+			if self.supportsBatchSend:
+				self.do_send(self.batch_body([obj for _, _, obj in batch]), len(batch), marks(batch))
+			else:
+				for item in batch:
+					self.do_send(item[2], 1, marks([item]))
+			return
+
+		if self.send_error:
+			raise self.send_error
+		if self.supportsBatchSend:
+			lane_batches = {}
+			for item in batch:
+				lane_batches.setdefault(self.lane_of_device[item[0]], []).append(item)
+			for lane, items in lane_batches.items():
+				self.lanes[lane].put((self.batch_body([obj for _, _, obj in items]), len(items), marks(items)))
+		else:
+			for item in batch:
+				self.lanes[self.lane_of_device[item[0]]].put((item[2], 1, marks([item])))
+
 	def run(self):
-		print(f'Started publishing Cumulocity {self.type_name} with rate of {self.per_device_rate} objects per device per second, with processing mode {self.processing_mode} to devices: {self.devices}')
+		if self.replay:
+			return self.run_replay()
+		profile_desc = f' varying by load profile {self.load_profile.toDict()}' if self.load_profile else ''
+		print(f'Started publishing Cumulocity {self.type_name} with rate of {self.per_device_rate} objects per device per second{profile_desc}, with processing mode {self.processing_mode} and {self.max_in_flight} requests in flight to devices: {self.devices}')
 		sys.stdout.flush()
+		if self.max_in_flight > 1:
+			self.start_lanes()
 		# Find total number of events to send per seconds
 		per_sec_total = float(len(self.devices) * self.per_device_rate)
-		# Interval between each event - we sleep for this amount of time
-		send_interval = 1.0 / per_sec_total
+		profile = self.load_profile or LoadProfile.constant()
+
+		def send_time(n):
+			# the time the n-th event (counting from 0) is scheduled to be sent, so the first event is sent straight away
+			return start_time + profile.timeOf(n / per_sec_total)
 		
 		# The index of next device to send event for (we send events in round robin fashion for each device).
 		device_index = 0
-		start_time = time.time() - send_interval
-		finish_time = (time.time() + self.duration) if self.duration is not None else float('inf')
+		start_time = time.time()
+		finish_time = (start_time + self.duration) if self.duration is not None else float('inf')
 		logged_time = 0	# last time a message was logged about number of events sent
 		total_sent = 0	# total number of events sent
 		total_batch = 0 # total number of batches sent
+		telemetry_time = 0	# last time a telemetry record was written
 		while time.time() < finish_time:
 			now_time = time.time()
 			# Find number of events to send; usually it should be 1 but sometime thread might
 			# sleep for longer period. So batch together all the events which should have been sent by now.
-			num_to_send = math.ceil(per_sec_total * (now_time-start_time)) - total_sent
+			num_to_send = math.floor(per_sec_total * profile.area(now_time-start_time)) + 1 - total_sent
 			num_to_send = min(num_to_send, MAX_BATCH_SIZE)	# have some upper bound on batch size
+			if self.telemetry and now_time - telemetry_time >= TELEMETRY_INTERVAL:
+				telemetry_time = now_time
+				# the lag is the time since the oldest object not sent yet was scheduled to be sent
+				self.write_telemetry(now_time, total_sent, send_time(total_sent), per_sec_total * profile.factor(now_time-start_time))
 			if num_to_send > 0:
-				batch = []
-				for _ in range(num_to_send):
-					if device_index >= len(self.devices):
-						device_index = 0 # wrap around
-					
-					obj = self.object_creator.createObject(self.devices[device_index],self.getUTCTime())
-					if obj:
-						batch.append(obj)
-					
-					#device_index += 1
-					device_index = (device_index+1) % len(self.devices)
-					# print(device_index)
-				if self.supportsBatchSend:
-					if len(batch) > 0:
-						self.do_send({self.type_name: batch})
-				else:
-					for e in batch:
-						self.do_send(e)
+				devices, device_index = self.next_devices(device_index, num_to_send)
+				# Use the time each object was scheduled to be sent at as its source time, but never a time in the future
+				times = formatUTCTimes([min(now_time, send_time(total_sent + i)) for i in range(num_to_send)])
+				objs = self.create_objects(devices, times)
+				batch = [(device, t, obj) for device, t, obj in zip(devices, times, objs) if obj]
+				if self.latency_fragment:
+					batch = self.mark_for_latency(batch)
+				if len(batch) > 0:
+					self.send(batch)
 
 				total_sent += len(batch)
 				total_batch += 1
 
 				# log total events sent every five seconds
 				if time.time() - logged_time > 5.0:
-					print(f'{time.time()}: sent total {total_sent} events with rate {total_sent/(now_time-start_time)} eps and average batch size of {total_sent/total_batch} events')
+					print(f'{time.time()}: sent total {total_sent} events with rate {total_sent/(now_time-start_time)} eps, target rate {per_sec_total * profile.factor(now_time-start_time)} eps and average batch size of {total_sent/total_batch} events')
 					sys.stdout.flush()
 					logged_time = time.time()
 
 			# sleep if we have some time remaining before the next batch
-			timeForNextEventToSend = start_time + (total_sent+1)/per_sec_total
-			timeToSleep = timeForNextEventToSend - time.time()
+			timeForNextEventToSend = send_time(total_sent)
+			if timeForNextEventToSend == math.inf and finish_time == math.inf:
+				break	# the load profile has dropped to zero for good
+			timeToSleep = min(timeForNextEventToSend, finish_time) - time.time()
+			if self.telemetry:
+				# keep reporting telemetry while the load profile is at zero
+				timeToSleep = min(timeToSleep, TELEMETRY_INTERVAL)
 			if timeToSleep > 0:
 				time.sleep(timeToSleep)
-			
+
+		if self.lanes:
+			self.stop_lanes()
+		if self.telemetry:
+			self.write_telemetry(time.time(), total_sent, None)
+			self.telemetry.close()
+		if self.input_log:
+			self.input_log.close()
+
+	def run_replay(self):
+		"""
+		Publish the objects of a recording, keeping the intervals between them scaled by the time scale factor.
+
+		The source time of each object is replaced by the time it is published, and the recorded source devices are mapped
+		onto the devices of the publisher in the order they first appear in the recording, unless mapped explicitly.
+		"""
+		recording = self.replay['file']
+		time_scale = float(self.replay.get('timeScale', 1.0))
+		loop = self.replay.get('loop', False)
+		device_map = dict(self.replay.get('deviceMapping') or {})
+		print(f'Started publishing Cumulocity {self.type_name} from recording {recording} with time scale {time_scale}{" in a loop" if loop else ""}, with processing mode {self.processing_mode} and {self.max_in_flight} requests in flight to devices: {self.devices}')
+		sys.stdout.flush()
+		if self.max_in_flight > 1:
+			self.start_lanes()
+
+		start_time = time.time()
+		finish_time = (start_time + self.duration) if self.duration is not None else float('inf')
+		max_batch_size = MAX_BATCH_SIZE if self.supportsBatchSend else 1
+		loop_offset = 0.0	# time (in seconds) from the start of the replay to the start of the current pass over the recording
+		logged_time = 0	# last time a message was logged about number of objects sent
+		telemetry_time = 0	# last time a telemetry record was written
+		total_sent = 0	# total number of objects sent
+		batch = []	# list of device ID, source time and object of objects due to be sent
+		batch_due_time = None	# the time the first object of the batch was due to be sent
+
+		def send_batch():
+			nonlocal batch, total_sent
+			self.send(self.mark_for_latency(batch) if self.latency_fragment else batch)
+			total_sent += len(batch)
+			batch = []
+
+		finished = False
+		while not finished:
+			first_time = None
+			offset = 0.0
+			count = 0
+			for record_time, obj in RecordingReader(recording):
+				if first_time is None:
+					first_time = record_time
+				offset = (record_time - first_time) / time_scale
+				due_time = start_time + loop_offset + offset
+				if due_time >= finish_time:
+					finished = True
+					break
+				now_time = time.time()
+				if self.telemetry and now_time - telemetry_time >= TELEMETRY_INTERVAL:
+					telemetry_time = now_time
+					self.write_telemetry(now_time, total_sent, batch_due_time if batch else due_time)
+				if due_time > now_time:
+					# send the objects that are already due before waiting for the next one
+					if batch: send_batch()
+					time.sleep(max(0.0, due_time - time.time()))
+
+				recorded_device = obj.get('source', {}).get('id')
+				device = device_map.get(recorded_device)
+				if device is None:
+					device = device_map[recorded_device] = self.devices[len(device_map) % len(self.devices)]
+				obj['source'] = {'id': device}
+				obj['time'] = formatUTCTime(due_time)
+				if not batch:
+					batch_due_time = due_time
+				batch.append((device, obj['time'], obj))
+				count += 1
+				if len(batch) >= max_batch_size: send_batch()
+
+				if time.time() - logged_time > 5.0:
+					print(f'{time.time()}: sent total {total_sent} {self.type_name} from recording with rate {total_sent/(time.time()-start_time)} eps')
+					sys.stdout.flush()
+					logged_time = time.time()
+			else:
+				if not loop or count == 0:
+					finished = True
+				else:
+					# start the next pass one average interval after the last object
+					loop_offset += offset + (offset / (count - 1) if count > 1 else 1.0)
+
+		if batch: send_batch()
+		print(f'{time.time()}: finished replaying recording after sending {total_sent} {self.type_name}')
+		sys.stdout.flush()
+		if self.lanes:
+			self.stop_lanes()
+		if self.telemetry:
+			self.write_telemetry(time.time(), total_sent, None)
+			self.telemetry.close()
+		if self.input_log:
+			self.input_log.close()
+
+	def write_telemetry(self, now, total_sent, next_send_time, target_rate=None):
+		"""Write a telemetry record for the current state of the publisher."""
+		schedule_lag = max(0.0, now - next_send_time) if next_send_time is not None else 0.0
+		self.telemetry.write(now, total_sent, schedule_lag, sum(lane.qsize() for lane in self.lanes), target_rate)
 
 def main():
 	parser = argparse.ArgumentParser(description='Cumulocity Data Publishing Process', add_help=True)
@@ -231,6 +640,12 @@ def main():
 	parser.add_argument('--resource_url', type=str, default='/measurement/measurements', help='The url for the resource to publish.')
 	parser.add_argument('--processing_mode', type=str, default='CEP', help='The cumulocity processing mode. Possible values are CEP, PERSISTENT, TRANSIENT and QUIESCENT')
 	parser.add_argument('--object_creator_info', type=str, required=False, help='Info about the object creator in JSON string')
+	parser.add_argument('--max_in_flight', type=int, default=1, help='The maximum number of requests to have in flight at the same time')
+	parser.add_argument('--telemetry_file', type=str, required=False, help='The file to append telemetry records to')
+	parser.add_argument('--latency_fragment', type=str, required=False, help='The fragment to add to objects for measuring end-to-end latency')
+	parser.add_argument('--replay_info', type=str, required=False, help='Info about the recording to replay in JSON string')
+	parser.add_argument('--load_profile', type=str, required=False, help='The load profile to vary the rate by in JSON string')
+	parser.add_argument('--input_log', type=str, required=False, help='The file to log the source and send time of objects marked for latency measurement to')
 	args = parser.parse_args()
 
 	if args.resource_url not in ['/measurement/measurements', '/event/events', '/alarm/alarms']:
@@ -238,7 +653,10 @@ def main():
 
 	publisher = DataPublisher(base_url=args.base_url, username=args.username, password=args.password,
 					devices=json.loads(args.devices), per_device_rate=args.per_device_rate, duration=args.duration,
-					resource_url=args.resource_url, processing_mode=args.processing_mode, object_creator_info=args.object_creator_info)
+					resource_url=args.resource_url, processing_mode=args.processing_mode, object_creator_info=args.object_creator_info,
+					max_in_flight=args.max_in_flight, telemetry_file=args.telemetry_file,
+					latency_fragment=args.latency_fragment, input_log=args.input_log, replay_info=args.replay_info,
+					load_profile=args.load_profile)
 	publisher.run()
 
 if __name__ == '__main__':
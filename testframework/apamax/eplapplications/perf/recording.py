@@ -0,0 +1,94 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import csv, json, re
+from apamax.eplapplications.utctime import parseUTCTime
+
+# Properties of recorded objects that are assigned by Cumulocity and must not be sent again
+SERVER_ASSIGNED_PROPERTIES = ['id', 'self', 'creationTime', 'lastUpdated', 'count', 'firstOccurrenceTime', 'history']
+
+# Values of CSV recordings that are published as numbers, following the JSON number syntax so that values such as
+# identifiers with leading zeros or 'NaN' are kept as strings
+INTEGER_EXPR = re.compile(r'-?(0|[1-9][0-9]*)')
+FLOAT_EXPR = re.compile(r'-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+
+class RecordingReader(object):
+	"""
+	Reads the Cumulocity objects of a recording one at a time, so that recordings of any size can be replayed without
+	loading them into memory.
+
+	Two formats are supported, chosen by the file extension:
+
+	- JSON lines (`.jsonl` or `.json`): one Cumulocity object per line, as returned by the REST API.
+	- CSV (`.csv`): a header row followed by one object per row. The `time` and `source` columns contain the time and
+	  source device ID of the object. Other columns are property paths separated by dots, for example `type` or
+	  `c8y_Temperature.T.value`. Values may be quoted and contain newlines. Values that are numbers are published as
+	  numbers, and all other values as strings.
+
+	The file is read incrementally. Objects must be in the order of their time.
+
+	:param str path: The path of the recording.
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self.format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+	def __iter__(self):
+		"""
+		Iterate over the objects of the recording.
+
+		:return: Generator of the epoch time and the object of each record. The time and source of the object are also
+			set in the object.
+		"""
+		if self.format == 'jsonl':
+			with open(self.path, encoding='utf8') as f:
+				for line in f:
+					line = line.strip()
+					if line:
+						yield self._fromRecord(json.loads(line))
+		else:
+			with open(self.path, encoding='utf-8-sig', newline='') as f:
+				rows = csv.reader(f)
+				header = next(rows, None)
+				for row in rows:
+					if any(row):
+						yield self._fromRecord(self._fromCSVRow(header, row))
+
+	def _fromRecord(self, obj):
+		"""
+			Remove the server-assigned properties from a recorded object and get its epoch time.
+		"""
+		for name in SERVER_ASSIGNED_PROPERTIES:
+			obj.pop(name, None)
+		return parseUTCTime(obj['time']), obj
+
+	def _fromCSVRow(self, header, row):
+		"""
+			Create an object from a CSV row.
+		"""
+		obj = {}
+		for column, value in zip(header, row):
+			if value == '': continue
+			if column == 'source':
+				obj['source'] = {'id': value}
+				continue
+			if column != 'time':
+				if INTEGER_EXPR.fullmatch(value):
+					value = int(value)
+				elif FLOAT_EXPR.fullmatch(value):
+					value = float(value)
+			target = obj
+			path = column.split('.')
+			for key in path[:-1]:
+				target = target.setdefault(key, {})
+			target[path[-1]] = value
+		return obj
@@ -10,6 +10,7 @@
 # See the License for the specific language governing permissions and limitations under the License.
 
 import json
+from .concurrency import runConcurrently, DEFAULT_MAX_WORKERS
 
 # Constants for smart rule types
 RULE_ON_ALARM_SEND_SMS = 'onAlarmSendSms'
@@ -38,6 +39,9 @@ RULE_NAMES = {
 	RULE_THRESHOLD: 'Creates alarms when measurement reaches thresholds',
 }
 
+# Number of smart rules to fetch per request when listing smart rules
+DEFAULT_PAGE_SIZE = 100
+
 class SmartRule(object):
 	"""
 		Class representing a smart rule object.
@@ -265,8 +269,11 @@ class SmartRule(object):
 			self._resetIds()
 			self.log.debug(f'Deleted {self._getDesc()}')
 		except Exception as err:
-			raise Exception(f'Failed to delete {self._getDesc()} using DELETE on {self.connection.base_url}{self._getEndPoint()}: {err}')
+			raise Exception(f'Failed to delete {self._getDesc()} using DELETE on {self.connection.base_url}{self._getEndPoint()}: {err}') from err
 	
+	def __str__(self):
+		return self._getDesc()
+
 	def _getDesc(self):
 		"""
 		Get the description of the smart rule for logging.
@@ -295,7 +302,7 @@ class SmartRule(object):
 			self._extractAndSaveIds(resp)
 			self.log.debug(f'Created {self._getDesc()}')
 		except Exception as err:
-			raise Exception(f'Failed to create {self._getDesc()} using POST on {self.connection.base_url}{self._getEndPoint()}: {err}')
+			raise Exception(f'Failed to create {self._getDesc()} using POST on {self.connection.base_url}{self._getEndPoint()}: {err}') from err
 	
 	def _updateRule(self, **kwargs):
 		""" Update the smart rule on Cumulocity. """
@@ -309,7 +316,7 @@ class SmartRule(object):
 			self._extractAndSaveIds(resp)
 			self.log.debug(f'Updated {self._getDesc()}')
 		except Exception as err:
-			raise Exception(f'Failed to update {self._getDesc()} using PUT on {self.connection.base_url}{self._getEndPoint()}: {err}')
+			raise Exception(f'Failed to update {self._getDesc()} using PUT on {self.connection.base_url}{self._getEndPoint()}: {err}') from err
 
 	@staticmethod
 	def _toDeviceIds(deviceList):
@@ -388,6 +395,32 @@ class SmartRule(object):
 		"""
 		return '/service/smartrule' + ( '/managedObjects/%s' % self.managedObjectId if self.managedObjectId is not None else '') + '/smartrules' + ('/%s' % self._id if self._id is not None else '')
 
+	def _getChangedFields(self, existing):
+		"""
+		Get the fields of the request body that differ between this smart rule and the deployed smart rule.
+
+		Configuration values that are not set on this smart rule are ignored, as Cumulocity may add defaults to the deployed configuration.
+
+		:param existing: The smart rule as currently deployed on Cumulocity.
+		:type existing: :class:`SmartRule`
+		:return: The names of the changed fields.
+		:rtype: list[str]
+		"""
+		changed = []
+		if self.ruleName != existing.ruleName:
+			changed.append('name')
+		existingConfig = existing.configuration or {}
+		if any(existingConfig.get(k) != v for (k, v) in self.configuration.items()):
+			changed.append('config')
+		if bool(self.enabled) != bool(existing.enabled):
+			changed.append('enabled')
+		# A source list of None is sent as an empty list
+		if sorted(self.enabledSources or []) != sorted(existing.enabledSources or []):
+			changed.append('enabledSources')
+		if self.isGlobal() and self.getEnabledSources() is None and sorted(self.disabledSources or []) != sorted(existing.disabledSources or []):
+			changed.append('disabledSources')
+		return changed
+
 	def _isTestSmartRule(self):
 		"""
 		Checks if the smart rule was created by the test framework as part of a test.
@@ -412,18 +445,272 @@ class SmartRulesManager(object):
 		self.connection = tenant.getConnection()
 		self.log = log
 
-	def getAllSmartRules(self, withLocalRules=False):
+	def getAllSmartRules(self, withLocalRules=False, namePrefix=None, ruleType=None):
 		"""
 		Get all smart rules deployed on Cumulocity.
 
 		:param withLocalRules: If `True`, also include smart rules local to a device or group.
+		:param namePrefix: Only include smart rules with names starting with this prefix. For example, `SmartRule.NAME_PREFIX` to get smart rules created by the test framework.
+		:type namePrefix: str, optional
+		:param ruleType: Only include smart rules of this template, for example, `RULE_EXPLICIT_THRESHOLD`.
+		:type ruleType: str, optional
 		:return: List of smart rule objects.
 		:rtype: list[:class:`SmartRule`]
 		"""
+		return list(self.iterSmartRules(withLocalRules=withLocalRules, namePrefix=namePrefix, ruleType=ruleType))
+
+	def iterSmartRules(self, withLocalRules=False, namePrefix=None, ruleType=None, pageSize=DEFAULT_PAGE_SIZE):
+		"""
+		Iterate over the smart rules deployed on Cumulocity, fetching them one page at a time.
+
+		Smart rule objects are only created for rules that match the filters, as they are iterated over, so that
+		the caller can start processing them (for example, deleting them) before all pages have been fetched.
+
+		For example::
+
+			for rule in self.smartRulesManager.iterSmartRules(withLocalRules=True, namePrefix=SmartRule.NAME_PREFIX):
+				rule.delete()
+
+		:param withLocalRules: If `True`, also include smart rules local to a device or group.
+		:param namePrefix: Only include smart rules with names starting with this prefix.
+		:type namePrefix: str, optional
+		:param ruleType: Only include smart rules of this template.
+		:type ruleType: str, optional
+		:param int pageSize: The number of smart rules to fetch per request.
+		:return: A generator of smart rule objects.
+		:rtype: iterator[:class:`SmartRule`]
+		"""
 		withLocalRules = 'true' if withLocalRules else 'false'
-		response = self.connection.request('GET', f'/service/smartrule/smartrules?withPrivateRules={withLocalRules}')
-		rules = json.loads(response)['rules']
-		return [self._parseSmartRule(rule) for rule in rules]
+		seenIds = set()
+		currentPage = 1
+		while True:
+			response = self.connection.request('GET', f'/service/smartrule/smartrules?withPrivateRules={withLocalRules}&pageSize={pageSize}&currentPage={currentPage}')
+			rules = json.loads(response)['rules']
+			newRules = 0
+			for rule in rules:
+				# Skip rules returned again, in case paging is not honoured by the server
+				if rule.get('id') in seenIds: continue
+				seenIds.add(rule.get('id'))
+				newRules += 1
+				if namePrefix is not None and not rule.get('name', '').startswith(namePrefix): continue
+				if ruleType is not None and rule.get('ruleTemplateName') != ruleType: continue
+				yield self._parseSmartRule(rule)
+			if newRules == 0 or len(rules) < pageSize or len(rules) > pageSize:
+				return
+			currentPage += 1
+
+	def deployAll(self, rules, maxWorkers=DEFAULT_MAX_WORKERS, maxRate=None, raiseOnFailure=True):
+		"""
+		Deploy multiple smart rules to Cumulocity concurrently.
+
+		The rules are deployed using a bounded number of concurrent requests, optionally throttled to a maximum
+		number of requests per second. Transient failures are retried. The returned outcome contains the result and the
+		time taken to deploy each rule, as well as the overall throughput, which can be included in a performance report.
+
+		For example::
+
+			rules = [self.smartRulesManager.build_onMeasurementExplicitThresholdCreateAlarm(...).setEnabledSources(device) for device in devices]
+			outcome = self.smartRulesManager.deployAll(rules, maxWorkers=5)
+			self.log.info(f'Deployed smart rules at {outcome.getThroughput()} rules/sec')
+
+		:param list[SmartRule] rules: The smart rules to deploy. They must be built by this manager.
+		:param int maxWorkers: The maximum number of smart rules to deploy concurrently.
+		:param maxRate: The maximum number of smart rules to deploy per second. There is no limit if not specified.
+		:type maxRate: float, optional
+		:param bool raiseOnFailure: Raise an exception after all deployments are attempted if any rule failed to deploy.
+		:return: The outcome of deploying each rule, in the order of the rules.
+		:rtype: :class:`~apamax.eplapplications.concurrency.BulkOutcome`
+		"""
+		for rule in rules:
+			if rule.connection is not self.connection:
+				raise Exception(f'Cannot deploy {rule._getDesc()} as it belongs to a different tenant. Use SmartRulesManager.deployAllForTenants instead.')
+		return SmartRulesManager.deployAllForTenants([rules], log=self.log, maxWorkers=maxWorkers, maxRate=maxRate, raiseOnFailure=raiseOnFailure)
+
+	@staticmethod
+	def deployAllForTenants(rulesPerTenant, log=None, maxWorkers=DEFAULT_MAX_WORKERS, maxRate=None, raiseOnFailure=True):
+		"""
+		Deploy smart rules built for multiple tenants concurrently.
+
+		The rules of all tenants share the same bounded pool of concurrent requests and the same throttling, and rules
+		of different tenants are interleaved so that every tenant makes progress at the same time.
+
+		For example::
+
+			rulesPerTenant = {}
+			for tenant in tenants:
+				manager = SmartRulesManager(tenant, self.log)
+				rulesPerTenant[tenant.getTenantId()] = [manager.build_onMeasurementExplicitThresholdCreateAlarm(...) for i in range(5)]
+			outcome = SmartRulesManager.deployAllForTenants(rulesPerTenant, log=self.log, maxWorkers=20)
+
+		:param rulesPerTenant: The smart rules to deploy for each tenant, either as a dictionary of tenant ID to a list of rules, or as a list of lists of rules.
+		:type rulesPerTenant: dict[str, list[SmartRule]] or list[list[SmartRule]]
+		:param log: The logger to use for logging the outcome. Nothing is logged if not specified.
+		:param int maxWorkers: The maximum number of smart rules to deploy concurrently across all tenants.
+		:param maxRate: The maximum number of smart rules to deploy per second across all tenants. There is no limit if not specified.
+		:type maxRate: float, optional
+		:param bool raiseOnFailure: Raise an exception after all deployments are attempted if any rule failed to deploy.
+		:return: The outcome of deploying each rule. Outcomes are ordered by interleaving the rules of each tenant.
+		:rtype: :class:`~apamax.eplapplications.concurrency.BulkOutcome`
+		"""
+		ruleLists = list(rulesPerTenant.values()) if isinstance(rulesPerTenant, dict) else list(rulesPerTenant)
+		# Interleave the rules of each tenant so that no tenant waits for all rules of other tenants
+		interleaved = []
+		for i in range(max([len(l) for l in ruleLists] or [0])):
+			interleaved.extend(l[i] for l in ruleLists if i < len(l))
+
+		def deploy(rule):
+			rule.deploy()
+			return rule.getID()
+
+		outcome = runConcurrently(deploy, interleaved, description='smart rule deployments', maxWorkers=maxWorkers, maxRate=maxRate,
+			retries=3, log=log)
+		if raiseOnFailure:
+			outcome.raiseIfFailed()
+		return outcome
+
+	def reconcile(self, rules, existingRules=None, deleteUnmatchedTestRules=False, maxWorkers=DEFAULT_MAX_WORKERS, maxRate=None, raiseOnFailure=True, timeout=None):
+		"""
+		Make the smart rules deployed on Cumulocity match the specified smart rules, writing only the rules that differ.
+
+		The deployed smart rules are fetched once and compared with the specified smart rules. A specified smart rule
+		matches a deployed smart rule if it has the same ID or, if it is not yet deployed, the same name, template and
+		device or group. Matched rules are updated only if their configuration, enabled or disabled sources, name or
+		enabled flag differ. Rules that do not match any deployed rule are created. All writes are performed concurrently,
+		and transient failures are retried.
+
+		For example::
+
+			rules = [self.smartRulesManager.build_onMeasurementExplicitThresholdCreateAlarm(...).setEnabledSources(device) for device in devices]
+			# Only creates or updates the rules that are missing or changed since the previous variation,
+			# and deletes test smart rules that are no longer required.
+			self.smartRulesManager.reconcile(rules, deleteUnmatchedTestRules=True)
+
+		:param list[SmartRule] rules: The desired smart rules. They must be built by this manager.
+		:param existingRules: The smart rules currently deployed, if they have already been fetched by calling `getAllSmartRules` with local rules included. They are fetched if not specified.
+		:type existingRules: list[SmartRule], optional
+		:param bool deleteUnmatchedTestRules: Delete deployed smart rules created by the test framework that do not match any of the desired rules.
+		:param int maxWorkers: The maximum number of requests to perform concurrently.
+		:param maxRate: The maximum number of requests to perform per second. There is no limit if not specified.
+		:type maxRate: float, optional
+		:param bool raiseOnFailure: Raise an exception after all writes are attempted if any of them failed.
+		:param timeout: The time (in seconds) after which no further writes are started. There is no deadline if not specified.
+		:type timeout: float, optional
+		:return: The outcome of each write performed. Smart rules that did not need to change are not included.
+		:rtype: :class:`~apamax.eplapplications.concurrency.BulkOutcome`
+		"""
+		if existingRules is None:
+			existingRules = self.getAllSmartRules(withLocalRules=True)
+		byId = {r.getID(): r for r in existingRules}
+		byName = {}
+		for r in existingRules:
+			byName.setdefault((r.ruleName, r.ruleType, r.managedObjectId), []).append(r)
+
+		writes = []
+		changes = {}	# The fields that changed for each rule, keyed by id() of the rule. None to create the rule.
+		matched = set()
+		unchanged = 0
+		for rule in rules:
+			if rule.connection is not self.connection:
+				raise Exception(f'Cannot reconcile {rule._getDesc()} as it belongs to a different tenant.')
+			existing = byId.get(rule.getID()) if rule.getID() is not None else None
+			if existing is None and rule.getID() is None:
+				candidates = [r for r in byName.get((rule.ruleName, rule.ruleType, rule.managedObjectId), []) if r.getID() not in matched]
+				existing = candidates[0] if candidates else None
+			if existing is None:
+				writes.append(rule)
+				changes[id(rule)] = None
+				continue
+			matched.add(existing.getID())
+			rule._extractAndSaveIds({'id': existing.getID(), 'cepModuleId': existing._cepModuleId})
+			changed = rule._getChangedFields(existing)
+			if changed:
+				writes.append(rule)
+				changes[id(rule)] = changed
+			else:
+				unchanged += 1
+
+		if deleteUnmatchedTestRules:
+			for r in existingRules:
+				if r._isTestSmartRule() and r.getID() not in matched:
+					writes.append(r)
+					changes[id(r)] = 'delete'
+
+		def write(rule):
+			fields = changes[id(rule)]
+			if fields == 'delete':
+				rule.delete()
+			elif fields is None:
+				rule._createRule()
+			else:
+				# Smart rules are always updated with their full body
+				rule._updateRule()
+			return rule.getID()
+
+		kinds = [c if c in (None, 'delete') else 'update' for c in changes.values()]
+		self.log.info(f"Reconciling smart rules: {unchanged} unchanged, {kinds.count(None)} to create, {kinds.count('update')} to update, {kinds.count('delete')} to delete")
+		outcome = runConcurrently(write, writes, description='smart rule writes', maxWorkers=maxWorkers, maxRate=maxRate, timeout=timeout,
+			retries=3, log=self.log)
+		if raiseOnFailure:
+			outcome.raiseIfFailed()
+		return outcome
+
+	def generateSmartRules(self, count, buildMethod, parameterSweeps=None, localTo=None, enabledSources=None, namePattern='{name} {index}', startIndex=0):
+		"""
+		Generate a number of smart rule objects from a template, varying their parameters.
+
+		This is used to build large populations of smart rules, for example, to measure how the resource usage of the
+		microservice grows with the number of smart rules. The generated rules are not deployed; call `deployAll`
+		or `reconcile` to deploy them.
+
+		The rule with index `i` uses the `i`-th value (wrapping around) of each parameter sweep, device or group, and source list.
+
+		For example, to generate 1000 device-local threshold rules spread over 100 devices with 5 different thresholds::
+
+			rules = self.smartRulesManager.generateSmartRules(1000, 'onMeasurementExplicitThresholdCreateAlarm',
+					parameterSweeps={
+						'fragment': ['c8y_Temperature'],
+						'series': ['T'],
+						'rangeMin': [50, 60, 70, 80, 90],
+						'rangeMax': lambda i: 100 + i % 10,
+					},
+					localTo=devices)
+			self.smartRulesManager.deployAll(rules)
+
+		:param int count: The number of smart rules to generate.
+		:param buildMethod: The build method of this class to use, or its name with or without the `build_` prefix, for example, `'onGeofenceCreateAlarm'`.
+		:type buildMethod: str or callable
+		:param parameterSweeps: The values of the build method parameters, as a dictionary of parameter name to either a list of values or a function that returns the value for a rule index.
+		:type parameterSweeps: dict[str, list or callable], optional
+		:param localTo: Devices or groups (or their IDs) to make the rules local to. The rules are global if not specified.
+		:type localTo: list, optional
+		:param enabledSources: Devices or device IDs to enable global rules for. Each entry is either a single device or a list of devices.
+		:type enabledSources: list, optional
+		:param str namePattern: The pattern for the name of each rule. It may contain `{name}` for the default name of the template and `{index}` for the rule index.
+		:param int startIndex: The index of the first rule to generate, so that rules can be added to a previously generated population.
+		:return: The generated smart rule objects.
+		:rtype: list[:class:`SmartRule`]
+		"""
+		if isinstance(buildMethod, str):
+			name = buildMethod if buildMethod.startswith('build_') else f'build_{buildMethod}'
+			buildMethod = getattr(self, name, None)
+			if buildMethod is None:
+				raise Exception(f'Unknown smart rule build method: {name}')
+		parameterSweeps = parameterSweeps or {}
+		for (param, values) in parameterSweeps.items():
+			if not callable(values) and len(values) == 0:
+				raise Exception(f'No values specified for smart rule parameter {param}')
+
+		rules = []
+		for index in range(startIndex, startIndex + count):
+			params = {param: (values(index) if callable(values) else values[index % len(values)]) for (param, values) in parameterSweeps.items()}
+			rule = buildMethod(**params)
+			rule.setRuleName(namePattern.format(name=RULE_NAMES.get(rule.ruleType, rule.ruleType), index=index))
+			if localTo:
+				rule.setLocal(localTo[index % len(localTo)])
+			elif enabledSources:
+				rule.setEnabledSources(enabledSources[index % len(enabledSources)])
+			rules.append(rule)
+		return rules
 
 	def build_onMeasurementExplicitThresholdCreateAlarm(self, fragment, series, rangeMin=90, rangeMax=100, alarmType='c8y_ThresholdAlarm', alarmText='Threshold exceeded'):
 		"""
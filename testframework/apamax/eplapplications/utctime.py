@@ -0,0 +1,89 @@
+## License
+# Copyright (c) 2026-present Cumulocity GmbH, Duesseldorf, Germany and/or its affiliates and/or their licensors.
+
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software distributed under the
+# License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied.
+# See the License for the specific language governing permissions and limitations under the License.
+
+import time, math
+from datetime import datetime, timezone
+
+class UTCTimeFormatter(object):
+	"""
+	Formats epoch times as Cumulocity-compliant UTC timestamp strings, for example `2026-01-31T12:34:56.789Z`.
+
+	The date and time up to the second are formatted once per second and cached, so only the milliseconds are formatted
+	for each timestamp. This is much faster than formatting a `datetime` when many timestamps are formatted per second.
+	"""
+
+	def __init__(self):
+		self._cached = (None, None)	# The last second formatted, and its formatted prefix
+
+	def format(self, timestamp=None):
+		"""
+		Format an epoch time.
+
+		:param timestamp: The epoch time. Uses the current time if not specified.
+		:type timestamp: float, optional
+		:return: Timestamp string.
+		:rtype: str
+		"""
+		if timestamp is None:
+			timestamp = time.time()
+		second = math.floor(timestamp)
+		micros = round((timestamp - second) * 1000000)
+		if micros >= 1000000:
+			second, micros = second + 1, micros - 1000000
+		cachedSecond, prefix = self._cached
+		if second != cachedSecond:
+			prefix = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.')
+			self._cached = (second, prefix)
+		return f'{prefix}{micros // 1000:03d}Z'
+
+	def formatAll(self, timestamps):
+		"""
+		Format a batch of epoch times.
+
+		:param list[float] timestamps: The epoch times.
+		:return: The timestamp strings, in the same order.
+		:rtype: list[str]
+		"""
+		fmt = self.format
+		return [fmt(timestamp) for timestamp in timestamps]
+
+_formatter = UTCTimeFormatter()
+
+def formatUTCTime(timestamp=None):
+	"""
+	Format an epoch time as a Cumulocity-compliant UTC timestamp string using a shared :class:`UTCTimeFormatter`.
+
+	:param timestamp: The epoch time. Uses the current time if not specified.
+	:type timestamp: float, optional
+	:return: Timestamp string.
+	:rtype: str
+	"""
+	return _formatter.format(timestamp)
+
+def formatUTCTimes(timestamps):
+	"""
+	Format a batch of epoch times as Cumulocity-compliant UTC timestamp strings using a shared :class:`UTCTimeFormatter`.
+
+	:param list[float] timestamps: The epoch times.
+	:return: The timestamp strings, in the same order.
+	:rtype: list[str]
+	"""
+	return _formatter.formatAll(timestamps)
+
+def parseUTCTime(timestamp):
+	"""
+	Parse a Cumulocity timestamp string, for example `2026-01-31T12:34:56.789Z`.
+
+	:param str timestamp: The timestamp string.
+	:return: The epoch time.
+	:rtype: float
+	"""
+	return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()